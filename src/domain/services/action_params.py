@@ -0,0 +1,82 @@
+import json
+from typing import Any, Dict, List
+
+from src.domain.value_objects.obj_utils import Obj
+
+BOOLEANS = {'true': True, '1': True, 'yes': True, 'false': False, '0': False, 'no': False}
+PARAM_TYPES = {
+  'str': (str, str),
+  'int': (int, int),
+  'float': ((int, float), float),
+  'bool': (bool, lambda value: BOOLEANS[value.lower()]),
+  'list': (list, lambda value: value.split(',')),
+  'dict': (dict, json.loads),
+  'any': (object, lambda value: value),
+}
+
+
+class ParamError(ValueError):
+  '''Params of a call that do not match the ones declared by its action; `errors` lists every problem.'''
+
+  def __init__(self, errors: List[str]):
+    super().__init__('; '.join(errors))
+    self.errors = errors
+
+
+class ActionParams:
+  '''Params declared by an action: `name: <type>` or `name: {type, required, default, enum, in}`.
+
+  Text values (query string, path) are coerced to the declared type; JSON values must already have
+  it. Unknown names, missing required params and values outside `enum` are reported together.
+  Params declared `in: path` are required and become segments of the action's endpoint.
+  '''
+
+  def __init__(self, declared: dict):
+    self.specs = {name: self._spec(name, spec) for name, spec in declared.items()}
+
+  @classmethod
+  def from_actions(cls, actions: Obj) -> Dict[str, 'ActionParams']:
+    return {name: cls(action.params.to_dict()) for name, action in actions.items() if action.has('params')}
+
+  @property
+  def path_params(self) -> List[str]:
+    return [name for name, spec in self.specs.items() if spec['in'] == 'path']
+
+  def validate(self, values: dict) -> dict:
+    errors = [f"Unknown param '{name}'" for name in values if name not in self.specs]
+    params = {}
+    for name, spec in self.specs.items():
+      if name not in values:
+        if spec['required']:
+          errors.append(f"Missing required param '{name}'")
+        elif 'default' in spec:
+          params[name] = spec['default']
+        continue
+      try:
+        params[name] = self._coerce(spec['type'], values[name])
+      except (TypeError, ValueError, KeyError):
+        errors.append(f"Param '{name}' must be of type {spec['type']}")
+        continue
+      if spec['enum'] is not None and params[name] not in spec['enum']:
+        errors.append(f"Param '{name}' must be one of {spec['enum']}")
+    if errors:
+      raise ParamError(errors)
+    return params
+
+  @staticmethod
+  def _coerce(type_name: str, value: Any) -> Any:
+    accepted, parse = PARAM_TYPES[type_name]
+    if isinstance(value, str):
+      value = parse(value)
+    # bool is an int subclass, not a number param
+    if not isinstance(value, accepted) or (isinstance(value, bool) and type_name in ('int', 'float')):
+      raise TypeError(type_name)
+    return value
+
+  @staticmethod
+  def _spec(name: str, spec: Any) -> dict:
+    spec = {'type': spec} if isinstance(spec, str) else dict(spec or {})
+    spec.setdefault('type', 'any')
+    if spec['type'] not in PARAM_TYPES:
+      raise ValueError(f"Unknown type '{spec['type']}' for param '{name}'")
+    return {'required': spec.get('in') == 'path', 'enum': None, 'in': None, **spec}
@@ -0,0 +1,188 @@
+import asyncio
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Iterator, List
+
+from flask import Flask, Response, jsonify, request
+
+from src.domain.services.action_params import ActionParams, ParamError
+from src.domain.services.asgi_app import NDJSON, AsgiApp
+from src.domain.value_objects.endpoint_request import EndpointRequest
+from src.domain.value_objects.obj_utils import Obj
+
+APPS = {
+  'wsgi': lambda: Flask(__name__),
+  'asgi': AsgiApp,
+}
+
+
+class ActionServer:
+  '''Server mode of an integrator: one endpoint per action, plus a `/{action}/batch` endpoint.
+
+  Actions are served by Flask (`wsgi`, the default) or by the dependency-free AsgiApp (`asgi`), whose
+  handlers await the async action execution. Request params are validated against the ones an action
+  declares and are bound ahead of the global vars.
+  '''
+
+  def __init__(self, integrator: Any, mode: str = None):
+    if (mode or 'wsgi') not in APPS:
+      raise ValueError(f"Unknown server_mode '{mode}'")
+    self.integrator = integrator
+    self.action_params = ActionParams.from_actions(integrator.config.actions)
+    self.asgi = mode == 'asgi'
+    self.app = APPS[mode or 'wsgi']()
+    self._setup_endpoints()
+
+  def _setup_endpoints(self):
+    '''Setup Flask (or ASGI) endpoints for each action in the config'''
+    logging.info(' Registered endpoints:')
+    handler = self._handle_endpoint_async if self.asgi else self._handle_endpoint
+    batch_handler = self._handle_batch_async if self.asgi else self._handle_batch
+    for action_name, action_config in self.integrator.config.actions.items():
+      endpoint = self._endpoint_rule(action_name)
+      methods = self._get_action_methods(action_config)
+
+      # Flask passes path params as keywords, the ASGI app an EndpointRequest
+      self.app.add_url_rule(
+        endpoint,
+        action_name,  # Route name
+        lambda *args, a=action_name, **kwargs: handler(a, *args, **kwargs),
+        methods=methods
+      )
+      self.app.add_url_rule(f'/{action_name}/batch', f'{action_name}_batch',
+                            lambda *args, a=action_name: batch_handler(a, *args), methods=['POST'])
+      logging.info(f" {endpoint} [{', '.join(methods)}]")
+
+  def _endpoint_rule(self, action_name: str) -> str:
+    params = self.action_params.get(action_name)
+    return '/'.join(['', action_name, *(f'<{name}>' for name in (params.path_params if params else []))])
+
+  def _get_action_methods(self, action_config: Obj) -> List[str]:
+    '''Extract HTTP methods from action configuration'''
+    methods = set()
+
+    # Look through all performs to find HTTP methods
+    for perform in action_config.performs:
+      if isinstance(perform.perform, Obj) and perform.perform.action.startswith('http.'):
+        method = perform.perform.action.split('.')[1].upper()
+        methods.add(method)
+
+    # If no HTTP methods found, default to GET
+    return list(methods) if methods else ['GET']
+
+  def _handle_endpoint(self, action_name: str, **path_params):
+    '''Handle web requests to action endpoints'''
+    try:
+      endpoint_request = self._flask_request(path_params)
+      params = self._endpoint_params(action_name, self._request_values(endpoint_request))
+      self.integrator.perform_action(action_name, request_params=params)
+      return jsonify(self._endpoint_result(action_name))
+    except Exception as e:
+      return jsonify(self._endpoint_error(action_name, e)), self._error_status(e)
+
+  async def _handle_endpoint_async(self, action_name: str, endpoint_request: EndpointRequest):
+    '''Handle ASGI requests to action endpoints on the server loop'''
+    try:
+      params = self._endpoint_params(action_name, self._request_values(endpoint_request))
+      await self.integrator.perform_action_async(action_name, request_params=params)
+      return self._endpoint_result(action_name), 200
+    except Exception as e:
+      return self._endpoint_error(action_name, e), self._error_status(e)
+
+  def _handle_batch(self, action_name: str):
+    '''Run every param set posted to `/{action}/batch` concurrently, streaming NDJSON lines as they finish'''
+    try:
+      items = self._batch_items(self._flask_request({}))
+    except Exception as e:
+      return jsonify(self._endpoint_error(action_name, e)), self._error_status(e)
+    return Response(self._batch_lines(action_name, items), mimetype=NDJSON)
+
+  async def _handle_batch_async(self, action_name: str, endpoint_request: EndpointRequest):
+    try:
+      return self._batch_lines_async(action_name, self._batch_items(endpoint_request)), 200
+    except Exception as e:
+      return self._endpoint_error(action_name, e), self._error_status(e)
+
+  def _batch_lines(self, action_name: str, items: List[Any]) -> Iterator[str]:
+    with ThreadPoolExecutor(max_workers=min(self.integrator.max_workers, max(len(items), 1))) as pool:
+      futures = [pool.submit(self._run_batch_item, action_name, index, item) for index, item in enumerate(items)]
+      for future in as_completed(futures):
+        yield json.dumps(future.result(), default=str) + '\n'
+
+  async def _batch_lines_async(self, action_name: str, items: List[Any]):
+    slots = asyncio.Semaphore(self.integrator.max_workers)
+
+    async def run(index: int, item: Any) -> dict:
+      async with slots:
+        return await self._run_batch_item_async(action_name, index, item)
+
+    for result in asyncio.as_completed([run(index, item) for index, item in enumerate(items)]):
+      yield json.dumps(await result, default=str) + '\n'
+
+  def _run_batch_item(self, action_name: str, index: int, item: Any) -> dict:
+    try:
+      self.integrator.perform_action(action_name, request_params=self._endpoint_params(action_name, item))
+      return {'index': index, **self._endpoint_result(action_name)}
+    except Exception as e:
+      return {'index': index, **self._endpoint_error(action_name, e)}
+
+  async def _run_batch_item_async(self, action_name: str, index: int, item: Any) -> dict:
+    try:
+      await self.integrator.perform_action_async(action_name, request_params=self._endpoint_params(action_name, item))
+      return {'index': index, **self._endpoint_result(action_name)}
+    except Exception as e:
+      return {'index': index, **self._endpoint_error(action_name, e)}
+
+  @staticmethod
+  def _flask_request(path_params: dict) -> EndpointRequest:
+    return EndpointRequest(request.args.to_dict(flat=False), request.get_data(), path_params)
+
+  def _request_values(self, endpoint_request: EndpointRequest) -> dict:
+    '''Query string, then JSON body, then path params of a call'''
+    body = self._request_json(endpoint_request)
+    if body is not None and not isinstance(body, dict):
+      raise ParamError(['JSON body must be an object'])
+    return {**endpoint_request.query_params(), **(body or {}), **endpoint_request.path_params}
+
+  def _batch_items(self, endpoint_request: EndpointRequest) -> List[Any]:
+    '''Param sets of a batch call; its query string params are shared by every set'''
+    items = self._request_json(endpoint_request)
+    if not isinstance(items, list):
+      raise ParamError(['Batch body must be a JSON list of param objects'])
+    shared = endpoint_request.query_params()
+    return [{**shared, **item} if isinstance(item, dict) else item for item in items]
+
+  @staticmethod
+  def _request_json(endpoint_request: EndpointRequest) -> Any:
+    try:
+      return endpoint_request.json()
+    except ValueError as e:
+      raise ParamError([f'Invalid JSON body: {e}'])
+
+  def _endpoint_params(self, action_name: str, values: Any) -> Obj:
+    '''Params of a server-mode call, validated against the ones the action declares (if it does)'''
+    if not isinstance(values, dict):
+      raise ParamError(['Params must be a JSON object'])
+    params = self.action_params.get(action_name)
+    return Obj(params.validate(values) if params else values)
+
+  @staticmethod
+  def _error_status(error: Exception) -> int:
+    return 400 if isinstance(error, ParamError) else 500
+
+  def _endpoint_result(self, action_name: str) -> dict:
+    latest_response = self.integrator.latest_response
+    return {
+      'status': 'success',
+      'action': action_name,
+      'response': latest_response.body if latest_response else None
+    }
+
+  def _endpoint_error(self, action_name: str, error: Exception) -> dict:
+    return {
+      'status': 'error',
+      'action': action_name,
+      'error': str(error),
+      **({'errors': error.errors} if isinstance(error, ParamError) else {})
+    }
@@ -1,25 +1,53 @@
+import asyncio
 import json
 import logging
-import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
 import xml.etree.ElementTree as ET
 from pathlib import Path
-from typing import Any, List, Union
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Iterable, Iterator, List, Union
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 
 import requests
-import aiohttp
-import asyncio
-from flask import Flask, jsonify
 from snoop import snoop
 import pykwalify.core
 
+from src.domain.services.action_server import ActionServer
+from src.domain.services.async_http_transport import AsyncHttpTransport
+from src.domain.services.bulk_executor import BulkExecutor
+from src.domain.services.http_transport import HttpTransport
+from src.domain.services.paginator import Paginator
+from src.domain.services.perform_planner import plan_waves
+from src.domain.services.rate_limiter import RateLimits
+from src.domain.services.response_cache import CACHEABLE_METHODS, ResponseCache
+from src.domain.services.retry_policy import RetryPolicy
+from src.domain.services.single_flight import SingleFlight, flight_key
+from src.domain.services.response_matcher import CONDITION_BLOCKS, matcher_for, precompile_matchers
+from src.domain.services.stream_parser import iter_items
+from src.domain.services.template_engine import compile_template, precompile_templates
+from src.domain.services.workflow_scheduler import WorkflowScheduler
 from src.domain.value_objects.api_response import ApiResponse
+from src.domain.value_objects.bulk_result import BulkResult
+from src.domain.value_objects.execution_context import ExecutionContext
 from src.domain.value_objects.obj_utils import Obj
+from src.domain.value_objects.scope import Scope
+from src.domain.value_objects.streamed_body import CHUNK_SIZE, StreamedBody
+from src.domain.value_objects.workflow_result import WorkflowResult
+
+
+def _context_attribute(name: str) -> property:
+  return property(lambda self: getattr(self.context, name), lambda self, value: setattr(self.context, name, value))
 
 
 class ApiIntegrator:
-  def __init__(self, config_path: str, max_workers: int = 10, schema_path: str = None):
+  latest_response = _context_attribute('latest_response')
+  action_number = _context_attribute('action_number')
+  action_depth = _context_attribute('action_depth')
+
+  def __init__(self, config_path: str, max_workers: int = None, schema_path: str = None):
     config_path = Path(__file__).resolve().parent.parent.parent / config_path
 
     # Default schema path if not provided
@@ -34,111 +62,262 @@ class ApiIntegrator:
     #  raise ValueError(f'Invalid configuration: {e}')
 
     self.config = Obj.from_yaml(config_path)
+    precompile_templates(self.config)
+    precompile_matchers(self.config)
+    self.parallel_plans = {name: plan_waves(action.performs, self.config.actions)
+                           for name, action in self.config.actions.items() if action.get('parallel') == 'auto'}
     self.vars = self.config.vars if self.config.has('vars') else Obj({})
     self.constants = self.config.constants if self.config.has('constants') else Obj({})
+    http_config = self._load_connector_config('http')
+    self.max_workers = max_workers or http_config.get('max_workers', 10)
     self.session = requests.Session()
-    self.latest_response = None
+    servers = self.config.supplier_servers if self.config.has('supplier_servers') else []
+    self.rate_limits = RateLimits.from_servers(servers)
+    self.http_transport = HttpTransport(self.session, self._transport_defaults(http_config), servers, self.rate_limits)
+    self.async_transport = AsyncHttpTransport.from_config(self.config.get('transport.async'), self.rate_limits)
+    self.response_cache = ResponseCache.from_config(self.config.get('cache'))
+    self.single_flight = SingleFlight()
+    self.retry_policies = {}
+    self._context = ContextVar(f'execution_context_{id(self)}', default=None)
+    self._vars_lock = threading.Lock()
     self._setup_logging()
-    self.action_number = 0
-    self.action_depth = 0  # Track recursion depth
     self.app = None
-    self.max_workers = max_workers
     self.config_path = config_path  # Save config path for updates
 
     # Check if we should run as server
     if self.config.get('as_server', False):
-      self.app = Flask(__name__)
-      self._setup_endpoints()
+      self.app = ActionServer(self, self.config.get('server_mode')).app
 
     # Initialize my_app_server
     self.vars['my_app_server'] = self.config.my_app_server if self.config.has(
       'my_app_server') else 'http://localhost:8000'
 
+  def _load_connector_config(self, connector: str) -> Obj:
+    connector_config = Obj.from_yaml(Path(__file__).resolve().parents[3] / 'infrastructure/config/connector.yml')
+    return connector_config.get(f'connectors.{connector}.config') or Obj({})
+
+  def _transport_defaults(self, http_config: Obj) -> dict:
+    '''Pool and timeout defaults: connector.yml http config, overridden by the top-level transport block'''
+    timeout = http_config.get('timeout')
+    overrides = {k: v for k, v in (self.config.get('transport') or Obj({})).items() if k != 'async'}
+    return {
+      'pool_maxsize': max(self.max_workers, 10),
+      'connect_timeout': timeout,
+      'read_timeout': timeout,
+      **Obj(overrides).to_dict()
+    }
+
+  def transport_stats(self) -> dict:
+    '''Pool saturation and connection reuse counters, to size pools from real traffic.'''
+    return self.http_transport.stats()
+
+  def rate_limit_stats(self) -> dict:
+    '''Time spent waiting for tokens and throttled responses per rate-limited supplier server.'''
+    return self.rate_limits.stats()
+
+  def cache_stats(self) -> dict:
+    '''Hit/miss/revalidation counters of the response cache and the supplier time it saved.'''
+    return self.response_cache.stats()
+
+  def close(self):
+    '''Release pooled connections held by the sync and async transports.'''
+    self.async_transport.close()
+    self.session.close()
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    self.close()
+
   def _setup_logging(self):
     if not self.config.get('as_server', False):
       logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s',
                           datefmt='%Y-%m-%d %H:%M:%S')
 
-  def _setup_endpoints(self):
-    '''Setup Flask endpoints for each action in the config'''
-    logging.info(' Registered endpoints:')
-    for action_name, action_config in self.config.actions.items():
-      endpoint = f'/{action_name}'
-      methods = self._get_action_methods(action_config)
-
-      self.app.add_url_rule(
-        endpoint,
-        endpoint[1:],  # Route name
-        lambda a=action_name: self._handle_endpoint(a),
-        methods=methods
-      )
-      logging.info(f" {endpoint} [{', '.join(methods)}]")
-
-  def _get_action_methods(self, action_config: Obj) -> List[str]:
-    '''Extract HTTP methods from action configuration'''
-    methods = set()
-
-    # Look through all performs to find HTTP methods
-    for perform in action_config.performs:
-      if isinstance(perform.perform, Obj) and perform.perform.action.startswith('http.'):
-        method = perform.perform.action.split('.')[1].upper()
-        methods.add(method)
-
-    # If no HTTP methods found, default to GET
-    return list(methods) if methods else ['GET']
-
-  def _handle_endpoint(self, action_name: str):
-    '''Handle web requests to action endpoints'''
+  @property
+  def context(self) -> ExecutionContext:
+    '''Execution context of the invocation running on this thread (or task).'''
+    context = self._context.get()
+    if context is None:
+      context = ExecutionContext()
+      self._context.set(context)
+    return context
+
+  def merge_vars(self, values: dict):
+    '''Explicit, locked update of the global vars shared by every invocation.'''
+    with self._vars_lock:
+      for key, value in values.items():
+        self.vars[key] = value
+
+  def perform_action(self, action_name: str, params: Obj = None, request_params: Obj = None):
+    action, scope = self._enter_action(action_name, params, request_params)
     try:
-      self.perform_action(action_name)
-      response_data = {
-        'status': 'success',
-        'action': action_name,
-        'response': self.latest_response.body if self.latest_response else None
-      }
-      return jsonify(response_data)
-    except Exception as e:
-      return jsonify({
-        'status': 'error',
-        'action': action_name,
-        'error': str(e)
-      }), 500
+      for wave in self._perform_waves(action_name, action):
+        if len(wave) == 1:
+          self.execute_perform(wave[0], scope)
+        else:
+          self._run_parallel(wave, scope)
+    finally:
+      self._exit_action()
+
+  async def perform_action_async(self, action_name: str, params: Obj = None, request_params: Obj = None):
+    '''perform_action on the running event loop; http performs are awaited instead of blocking a thread'''
+    action, scope = self._enter_action(action_name, params, request_params)
+    try:
+      for wave in self._perform_waves(action_name, action):
+        if len(wave) == 1:
+          await self.execute_perform_async(wave[0], scope)
+        else:
+          await self._run_parallel_async(wave, scope)
+    finally:
+      self._exit_action()
 
-  def perform_action(self, action_name: str, params: Obj = None):
+  def _enter_action(self, action_name: str, params: Obj, request_params: Obj = None) -> tuple:
     action = self.config.actions.get(action_name)
     if not action:
       raise ValueError(f"Action '{action_name}' not found in config")
-    merged_params = Obj({**(params.to_dict() if params else {}), **self.vars.to_dict(), **self.constants.to_dict()})
+    if self.action_depth == 0:
+      self._context.set(ExecutionContext())
+      self.context.request_params = request_params
+    context = self.context
+    scope = Scope(self.constants, context.vars, context.writes, context.request_params, self.vars, params)
 
     # Increment depth counter
     self.action_depth += 1
     self.action_number += 1
 
-    # logging.info(f'[{self.i}] {action_name} {merged_params}')
+    # logging.info(f'[{self.i}] {action_name} {scope}')
     logging.info(f'[{self.action_number}] {action_name}')
+    return action, scope
+
+  def workflow(self, actions: List[str] = None) -> WorkflowScheduler:
+    '''DAG of the given actions (all by default) and their `depends_on`, tuned by the top-level `workflow` block'''
+    options = (self.config.get('workflow') or Obj({})).to_dict()
+    return WorkflowScheduler.from_actions(self.config.actions, actions,
+                                          concurrency=options.get('concurrency', self.max_workers),
+                                          state_path=options.get('state_path'),
+                                          fail_fast=options.get('fail_fast', False))
+
+  def run_workflow(self, actions: List[str] = None, resume: bool = False) -> WorkflowResult:
+    '''Run actions on a worker pool, each once the actions it depends on succeeded'''
+    return self.workflow(actions).run(self.perform_action, resume)
+
+  async def run_workflow_async(self, actions: List[str] = None, resume: bool = False) -> WorkflowResult:
+    return await self.workflow(actions).run_async(self.perform_action_async, resume)
+
+  def _perform_waves(self, action_name: str, action: Obj) -> List[List[Obj]]:
+    '''One perform per wave, or with `parallel: auto` the independent performs grouped by their planned wave'''
+    plan = self.parallel_plans.get(action_name)
+    if plan is None:
+      return [[perform] for perform in action.performs]
+    return [[action.performs[index] for index in wave] for wave in plan]
+
+  def _run_parallel(self, performs: List[Obj], params: Obj):
+    '''Run performs concurrently, each on a forked context and scope, then merge them in declaration order'''
+    branches = self._fork_branches(len(performs), params)
+    with ThreadPoolExecutor(max_workers=min(self.max_workers, len(performs))) as pool:
+      futures = [pool.submit(self._run_branch, context, scope, perform)
+                 for (context, scope), perform in zip(branches, performs)]
+    self._join_branches(branches, params)
+    # The first failure in declaration order wins
+    for future in futures:
+      future.result()
+
+  async def _run_parallel_async(self, performs: List[Obj], params: Obj):
+    branches = self._fork_branches(len(performs), params)
+
+    async def run(context: ExecutionContext, scope: Scope, perform: Obj):
+      self._context.set(context)
+      await self.execute_perform_async(perform, scope)
+
+    results = await asyncio.gather(*(run(context, scope, perform)
+                                     for (context, scope), perform in zip(branches, performs)), return_exceptions=True)
+    self._join_branches(branches, params)
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+      raise errors[0]
+
+  def _run_branch(self, context: ExecutionContext, scope: Scope, perform: Obj):
+    self._context.set(context)
+    self.execute_perform(perform, scope)
+
+  def _fork_branches(self, count: int, params: Obj) -> List[tuple]:
+    branches = []
+    for _ in range(count):
+      context = self.context.fork()
+      branches.append((context, Scope(self.constants, context.vars, context.writes, params)))
+    return branches
+
+  def _join_branches(self, branches: List[tuple], params: Obj):
+    for _, scope in branches:
+      for key, value in scope.locals.items():
+        params[key] = value
+    self._write_vars(self.context.join([context for context, _ in branches]))
+
+  def _exit_action(self):
+    # Decrement depth counter
+    self.action_depth -= 1
+    # Reset step counter only when exiting top level action
+    if self.action_depth == 0:
+      self.action_number = 0
+
+  def execute_perform(self, perform_info: Obj, params: Obj, attempt: int = 0):
+    if perform_info.has('parallel'):
+      self._run_parallel(perform_info.parallel, params)
+      return
+    action_str, data = self._resolve_perform(perform_info)
+    stream_handler = self._get_stream_handler(action_str, data)
+    if stream_handler:
+      stream_handler(action_str, data, params, perform_info.responses if 'responses' in perform_info else [])
+      return
+
+    self._dispatch(action_str, data, params)
+    if 'responses' in perform_info:
+      with self._responding(perform_info, attempt):
+        self._handle_responses(perform_info.responses, params)
+
+  async def execute_perform_async(self, perform_info: Obj, params: Obj, attempt: int = 0):
+    if perform_info.has('parallel'):
+      await self._run_parallel_async(perform_info.parallel, params)
+      return
+    action_str, data = self._resolve_perform(perform_info)
+    if self._thread_bound(action_str, data):
+      # Pooled engines (bulk, paginate, cache) keep running on threads, off the event loop
+      await asyncio.to_thread(self.execute_perform, perform_info, params, attempt)
+      return
+
+    await self._dispatch_async(action_str, data, params)
+    if 'responses' in perform_info:
+      with self._responding(perform_info, attempt):
+        await self._handle_responses_async(perform_info.responses, params)
 
-    try:
-      for perform in action.performs:
-        self.execute_perform(perform, merged_params)
-    finally:
-      # Decrement depth counter
-      self.action_depth -= 1
-      # Reset step counter only when exiting top level action
-      if self.action_depth == 0:
-        self.action_number = 0
-
-  def execute_perform(self, perform_info: Obj, params: Obj):
+  def _resolve_perform(self, perform_info: Obj) -> tuple:
     action = perform_info.perform
-    data = action.data if isinstance(action, Obj) and action.has('data') else Obj({})
+    data = action.data if isinstance(action, Obj) and action.has('data') else perform_info.get('data', Obj({}))
     # logging.info(f'Perform: {action}')
 
     if isinstance(action, Obj):
-      action_str = action.action
+      return action.action, data
     elif isinstance(action, str):
-      action_str = action
-    else:
-      raise ValueError(f'Invalid action type: {type(action)}')
-
+      return action, data
+    raise ValueError(f'Invalid action type: {type(action)}')
+
+  def _thread_bound(self, action_str: str, data: Obj) -> bool:
+    if self._get_stream_handler(action_str, data):
+      return True
+    return action_str.startswith('http.') and isinstance(data, Obj) and (
+      data.get('type') == 'bulk' or self._cache_options(action_str.split('.')[1].upper(), data) is not None)
+
+  async def _dispatch_async(self, action_str: str, data: Obj, params: Obj):
+    if action_str in self.config.actions:
+      return await self.perform_action_async(action_str, params)
+    handler = getattr(self, f"_handle_{action_str.split('.')[0]}_async", None) if '.' in action_str else None
+    if handler:
+      return await handler(action_str, data, params)
+    self._dispatch(action_str, data, params)
+
+  def _dispatch(self, action_str: str, data: Obj, params: Obj):
     action_parts = action_str.split('.')
     if len(action_parts) > 1:
       handler_name = f'_handle_{action_parts[0]}'
@@ -158,76 +337,190 @@ class ApiIntegrator:
         else:
           raise ValueError(f'Unknown action: {action_str}')
 
-    if 'responses' in perform_info:
-      self._handle_responses(perform_info.responses, params)
+  @contextmanager
+  def _responding(self, perform_info: Obj, attempt: int):
+    # `this.*` performs in the responses act on the perform that produced them
+    performs = self._responding_performs()
+    performs.append((perform_info, attempt))
+    try:
+      yield
+    finally:
+      performs.pop()
+
+  def _responding_performs(self) -> list:
+    return self.context.performs
 
-  async def _async_http_request(self, method: str, url: str, headers: dict = None,
-                                data: str = None, params: dict = None) -> ApiResponse:
-    '''Async HTTP request method using aiohttp'''
-    async with aiohttp.ClientSession() as session:
+  def _handle_this(self, command: str, data: Obj, params: Obj):
+    self._this_handler(command, {'retry': self._retry_this})(data, params)
+
+  async def _handle_this_async(self, command: str, data: Obj, params: Obj):
+    await self._this_handler(command, {'retry': self._retry_this_async})(data, params)
+
+  @staticmethod
+  def _this_handler(command: str, handlers: dict) -> Callable:
+    operation = command.split('.')[1]
+    if operation not in handlers:
+      raise ValueError(f'Unknown this operation: {operation}')
+    return handlers[operation]
+
+  def _retry_this(self, data: Obj, params: Obj):
+    '''Run the perform whose responses are being handled again after a backoff, until its trials run out'''
+    retry = self._next_attempt(data, params)
+    if retry:
+      perform_info, attempt, delay = retry
+      time.sleep(delay)
+      self.execute_perform(perform_info, params, attempt)
+
+  async def _retry_this_async(self, data: Obj, params: Obj):
+    retry = self._next_attempt(data, params)
+    if retry:
+      perform_info, attempt, delay = retry
+      await asyncio.sleep(delay)
+      await self.execute_perform_async(perform_info, params, attempt)
+
+  def _next_attempt(self, data: Obj, params: Obj) -> Union[tuple, None]:
+    performs = self._responding_performs()
+    if not performs:
+      raise ValueError('this.retry can only be used in the responses of a perform')
+    perform_info, attempt = performs[-1]
+    options = self.render_template(data, params)
+    policy = RetryPolicy.from_config(options.to_dict() if isinstance(options, Obj) else options or {})
+    if attempt + 1 >= policy.attempts:
+      logging.warning(f'Giving up on {perform_info.perform} after {attempt + 1} attempts')
+      return None
+    return perform_info, attempt + 1, policy.delay(attempt)
+
+  def _retry_policy(self, data: Obj) -> Union[RetryPolicy, None]:
+    '''`retry: <attempts>` or `retry: {attempts, backoff, ...}`; performs with the same block share one retry budget'''
+    retry = data.get('retry')
+    if not retry:
+      return None
+    options = retry.to_dict() if isinstance(retry, Obj) else retry
+    key = json.dumps(options, sort_keys=True, default=str)
+    return self.retry_policies.get(key) or self.retry_policies.setdefault(key, RetryPolicy.from_config(options))
+
+  async def _async_http_request(self, method: str, url: str, headers: dict = None, data: str = None,
+                                params: dict = None, stream: dict = None, coalesce: bool = False,
+                                retry: RetryPolicy = None) -> ApiResponse:
+    '''Async HTTP request through the persistent aiohttp transport'''
+    async def send() -> ApiResponse:
       logging.info(f'Async Request: 🔹{method}🔹 {url} {headers} {params} {data}')
-      async with session.request(method, url, headers=headers, data=data, params=params) as response:
-        body = await response.text()
-        response_obj = requests.Response()
-        response_obj.status_code = response.status
-        response_obj.url = str(response.url)
-        response_obj.headers = dict(response.headers)
-        response_obj._content = body.encode('utf-8')
-        api_response = ApiResponse(response_obj)
-        logging.info(f'Async Response [{response.status}] {body[:200]}')
-        return api_response
-
-  def _threaded_bulk_request(self, method: str, url: str, items: List[Any],
-                             headers: dict = None, wrapper: str = '') -> List[ApiResponse]:
-    '''Perform bulk requests using ThreadPoolExecutor'''
-
-    def single_request(item):
-      wrapped_item = {wrapper: item} if wrapper else item
-      body = json.dumps(wrapped_item)
-      headers_copy = headers.copy() if headers else {}
-      headers_copy['Content-Type'] = 'application/json'
-
-      response = self.session.request(method, url, headers=headers_copy, data=body)
-      return ApiResponse(response)
-
-    with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-      futures = [executor.submit(single_request, item) for item in items]
-      return [future.result() for future in as_completed(futures)]
-
-  async def _async_bulk_request(self, method: str, url: str, items: List[Any],
-                                headers: dict = None, wrapper: str = '') -> tuple[Any]:
-    '''Async bulk request method'''
-
-    async def single_request(item):
-      wrapped_item = {wrapper: item} if wrapper else item
-      body = json.dumps(wrapped_item)
-      headers_copy = headers.copy() if headers else {}
-      headers_copy['Content-Type'] = 'application/json'
-
-      async with aiohttp.ClientSession() as session:
-        async with session.request(method, url, headers=headers_copy, data=body) as response:
-          body_text = await response.text()
-          response_obj = requests.Response()
-          response_obj.status_code = response.status
-          response_obj.url = str(response.url)
-          response_obj.headers = dict(response.headers)
-          response_obj._content = body_text.encode('utf-8')
-          return ApiResponse(response_obj)
-
-    tasks = [single_request(item) for item in items]
-    return await asyncio.gather(*tasks)
+      api_response = await self.async_transport.request(method, url, headers=headers, data=data, params=params,
+                                                        timeout=self.http_transport.timeout_for(url), stream=stream)
+      logging.info(f'Async Response [{api_response.status_code}] {api_response.preview()}')
+      return api_response
+
+    key = flight_key(method, url, params, headers, data) if coalesce and stream is None else None
+    return await self.single_flight.do_async(key, (lambda: retry.run_async(send)) if retry else send)
+
+  def _get_stream_handler(self, action_str: str, data: Obj):
+    '''Performs that hand each response to their `responses` handlers as it arrives'''
+    if not (action_str.startswith('http.') and isinstance(data, Obj)):
+      return None
+    if data.has('paginate'):
+      return self._handle_paginate
+    return self._handle_bulk_stream if data.get('type') == 'bulk_stream' else None
+
+  def _handle_paginate(self, command: str, data: Obj, params: Obj, responses: List[Obj]):
+    method = command.split('.')[1].upper()
+    url = self._prepare_url(data, params)
+    headers_dict = self._prepare_headers(data, params)
+    body = self._render_body(data.get('body', Obj({})), data, params)
+    options = data.get('paginate')
+    cache = self._cache_options(method, data)
+    # Pages are not coalesced: each caller sets its own `each` iterator on the page response
+    paginator = Paginator(options.to_dict() if isinstance(options, Obj) else {}, lambda page_url, query: (
+      self._execute_single_request(method, page_url, headers_dict, body, query, data.get('async', False), cache=cache,
+                                   retry=self._retry_policy(data))))
+
+    pages = 0
+    for pages, response in enumerate(paginator.pages(url, self._prepare_query(data, params)), 1):
+      items = paginator.page_items(response)
+      if items is not None:
+        response.each = iter(items)
+      params['page'] = pages
+      self._bind_response(response, params)
+      if responses:
+        self._handle_responses(responses, params)
+    logging.info(f'Paginated 🔹{method}🔹 {url} {pages} pages')
+
+  def _handle_bulk_stream(self, command: str, data: Obj, params: Obj, responses: List[Obj]):
+    method = command.split('.')[1].upper()
+    url = self._prepare_url(data, params)
+
+    def on_response(index: int, item: Any, response: ApiResponse):
+      params['item'] = item
+      self._bind_response(response, params)
+      if responses:
+        self._handle_responses(responses, params)
+
+    result = self._run_bulk(method, url, self._prepare_headers(data, params), self._resolve_bulk_items(data, params),
+                            data, params, on_response)
+    self._bind_vars({'bulk_responses': result})
+    logging.info(f'Bulk stream 🔹{method}🔹 {url} {result}')
+
+  def _run_bulk(self, method: str, url: str, headers_dict: dict, items: Iterable[Any], data: Obj, params: Obj,
+                on_response: Callable[[int, Any, ApiResponse], None]) -> BulkResult:
+    '''Send every item once, on the thread pool or the async transport, within a bounded window'''
+    headers_dict = {**headers_dict, 'Content-Type': 'application/json'}
+    coalesce = self._coalesce_option(method, data)
+    retry = self._retry_policy(data)
+    window = data.get('window', self.max_workers * 2)
+    wrapper = data.get('wrapper', '')
+    executor = BulkExecutor(window, data.get('item_id'), data.get('batch_size'), wrapper)
+
+    def body_for(unit: Any) -> str:
+      if executor.batch_size:
+        return self._bulk_item_body([self._render_bulk_item(item, data, params) for item in unit], wrapper)
+      return self._bulk_item_body(self._render_bulk_item(unit, data, params), wrapper)
+
+    if data.get('async', False):
+      return executor.run(items, lambda item: self.async_transport.submit(
+        self._async_http_request(method, url, headers_dict, body_for(item), None, None, coalesce, retry)), on_response)
+    with ThreadPoolExecutor(max_workers=min(self.max_workers, window)) as pool:
+      def submit(item: Any):
+        send = partial(pool.submit, self._send_bulk_body, method, url, headers_dict, body_for(item), coalesce)
+        # Retries wait on the scheduler, not in a pool worker
+        return retry.submit(send) if retry else send()
+
+      return executor.run(items, submit, on_response)
+
+  def _resolve_bulk_items(self, data: Obj, params: Obj) -> Iterable[Any]:
+    '''Items come lazily from a var/param named by `items`, or from the rendered body list'''
+    if not data.has('items'):
+      return self.render_structure(data.get('body', []), params)
+    items = self.get_value(data.get('items'), params)
+    if isinstance(items, (str, Obj)):
+      raise ValueError(f"Bulk items '{data.get('items')}' must resolve to an iterable of items")
+    return items
+
+  def _render_bulk_item(self, item: Any, data: Obj, params: Obj) -> Any:
+    if not (data.has('items') and data.has('body')):
+      return item
+    params['item'] = item
+    return self.render_structure(data.get('body'), params)
+
+  def _send_bulk_body(self, method: str, url: str, headers: dict, body: str, coalesce: bool = False) -> ApiResponse:
+    def send() -> ApiResponse:
+      self._log_request(method, url, headers, body)
+      response = ApiResponse(self.http_transport.request(method, url, headers=headers, data=body))
+      self._log_response(response)
+      return response
+
+    return self.single_flight.do(flight_key(method, url, None, headers, body) if coalesce else None, send)
 
   def _update_config_with_response(self, action_name: str, response: ApiResponse):
     """Update configuration file with the error response."""
     if self.config.get('enhance_conf_with_responses', False):
       logging.info(f'Updating config with error response for {action_name}')
-      if not self.config.actions[action_name].has('sample_responses'):
-        self.config.actions[action_name].sample_responses = Obj([])
+      action = self.config.actions[action_name]
+      if not action.has('sample_responses'):
+        action['sample_responses'] = []
 
       # Add the new error response to the sample_responses list
-      self.config.actions[action_name].sample_responses.append({
+      action.get('sample_responses').append({
         'status_code': response.status_code,
-        'body': response.body[:200]  # Limit body to 200 chars for readability
+        'body': response.preview()  # Limit body to 200 chars for readability
       })
       self.config.save(self.config_path)
 
@@ -256,67 +549,128 @@ class ApiIntegrator:
     return {k: v for k, v in query.to_dict().items() if v is not None}
 
   def _handle_bulk_request(self, method: str, url: str, body_data: Obj, headers_dict: dict, data: Obj, params: Obj):
-    wrapper = data.get('wrapper', '')
-    items = self.render_template(body_data, params)
+    last = {}
 
-    # Prefer async if available, fallback to threading
-    responses = self._execute_bulk_request(method, url, items, headers_dict, wrapper, data.get('async', False))
+    def keep_last(index: int, item: Any, response: ApiResponse):
+      if index >= last.get('index', -1):
+        last.update(index=index, response=response)
 
-    # Store responses in vars for further processing
-    self.vars['bulk_responses'] = responses
-    self.latest_response = responses[-1] if responses else None
-
-    # Perform individual request logging and processing
-    for item in items:
-      wrapped_item = {wrapper: item} if wrapper else item
-      body = json.dumps(wrapped_item)
-      self._log_and_process_request(method, url, headers_dict, body, params)
+    items = self._resolve_bulk_items(data, params)
+    # Compact, position-indexed results instead of every response
+    self._bind_vars({'bulk_responses': self._run_bulk(method, url, headers_dict, items, data, params, keep_last)})
+    if last:
+      self._bind_response(last['response'], params)
 
   def _handle_single_request(self, method: str, url: str, body_data: Obj, headers_dict: dict, query_dict: dict,
                              data: Obj, params: Obj):
-    body = self.render_template(json.dumps(body_data.to_dict()), params)
+    body = self._render_body(body_data, data, params)
 
     # Check for async request
-    response = self._execute_single_request(method, url, headers_dict, body, query_dict, data.get('async', False))
-
-    params['response'] = response
-    self.latest_response = response
-    self.vars['response'] = response
+    response = self._execute_single_request(method, url, headers_dict, body, query_dict, data.get('async', False),
+                                            self._stream_options(data), self._cache_options(method, data),
+                                            self._coalesce_option(method, data), self._retry_policy(data))
+    self._bind_single_response(response, data, params)
 
-    # Log and process the request
-    self._log_and_process_request(method, url, headers_dict, body, params, query_dict)
+  async def _handle_http_async(self, command: str, data: Obj, params: Obj):
+    '''Single http performs awaited on the async transport, whatever their `async` flag'''
+    method = command.split('.')[1].upper()
+    url = self._prepare_url(data, params)
+    body = self._render_body(data.get('body', Obj({})), data, params)
+    request = self._async_http_request(method, url, self._prepare_headers(data, params), body,
+                                       self._prepare_query(data, params), self._stream_options(data),
+                                       self._coalesce_option(method, data), self._retry_policy(data))
+    self._bind_single_response(await self.async_transport.run_async(request), data, params)
 
-  def _execute_bulk_request(self, method: str, url: str, items: List, headers_dict: dict, wrapper: str,
-                            is_async: bool) -> List[ApiResponse]:
-    try:
-      if is_async:
-        return asyncio.run(self._async_bulk_request(method, url, items, headers_dict, wrapper))
-    except Exception as e:
-      logging.error(f'Async bulk request failed: {e}')
+  def _bind_single_response(self, response: ApiResponse, data: Obj, params: Obj):
+    if data.has('parse'):
+      response.each = iter_items(response.iter_content(), data.get('parse'), response.encoding)
 
-    return self._threaded_bulk_request(method, url, items, headers_dict, wrapper)
+    self._bind_response(response, params)
 
   def _execute_single_request(self, method: str, url: str, headers_dict: dict, body: str, query_dict: dict,
-                              is_async: bool) -> ApiResponse:
-    try:
-      if is_async:
-        return asyncio.run(self._async_http_request(method, url, headers_dict, body, query_dict))
-    except Exception as e:
-      logging.error(f'Async request failed: {e}')
-
-    response = self.session.request(method, url, headers=headers_dict, data=body, params=query_dict)
-    return ApiResponse(response)
-
-  def _log_and_process_request(self, method: str, url: str, headers: dict, body: str, params: Obj,
-                               query_dict: dict = None):
-    query_dict = query_dict or {}
-    logging.info(f'Request: 🔹{method}🔹 {url} {headers} {query_dict} {body}')
-    response = self.session.request(method, url, headers=headers, data=body, params=query_dict)
-    api_response = ApiResponse(response)
-    params['response'] = api_response
-    self.latest_response = api_response
-    self.vars['response'] = api_response
-    logging.info(f'Response [{response.status_code}] {response.text[:200]}')
+                              is_async: bool, stream: dict = None, cache: dict = None, coalesce: bool = False,
+                              retry: RetryPolicy = None) -> ApiResponse:
+    if is_async:
+      return self.async_transport.run(self._async_http_request(method, url, headers_dict, body, query_dict, stream,
+                                                               coalesce, retry))
+    key = flight_key(method, url, query_dict, headers_dict, body) if coalesce and stream is None else None
+    send = lambda: self._send_request(method, url, headers_dict, body, query_dict, stream, cache)
+    return self.single_flight.do(key, (lambda: retry.run(send)) if retry else send)
+
+  def _send_request(self, method: str, url: str, headers_dict: dict, body: str, query_dict: dict, stream: dict,
+                    cache: dict) -> ApiResponse:
+    self._log_request(method, url, headers_dict, body, query_dict)
+    send = lambda validators: self.http_transport.request(method, url, headers={**headers_dict, **validators},
+                                                          data=body, params=query_dict, stream=stream is not None)
+    raw = self.response_cache.fetch(method, url, query_dict, headers_dict, cache, send) if cache is not None \
+      else send({})
+    response = ApiResponse(raw, self._streamed_body(raw, stream) if stream else None)
+    self._log_response(response)
+    return response
+
+  def _coalesce_option(self, method: str, data: Obj) -> bool:
+    '''Identical in-flight requests share one upstream call: GET/HEAD by default, other methods with `coalesce: true`'''
+    coalesce = data.get('coalesce')
+    return method in CACHEABLE_METHODS if coalesce is None else bool(coalesce)
+
+  def _stream_options(self, data: Obj) -> Union[dict, None]:
+    '''`stream: true` or `stream: {chunk_size, spool}`; spool is the in-memory size before rolling to disk'''
+    stream = data.get('stream')
+    if not stream and not data.has('parse'):
+      return None
+    options = stream.to_dict() if isinstance(stream, Obj) else {}
+    return {'chunk_size': options.get('chunk_size', CHUNK_SIZE), 'spool': options.get('spool')}
+
+  def _cache_options(self, method: str, data: Obj) -> Union[dict, None]:
+    '''`cache: true`, `cache: <ttl seconds>` or `cache: {ttl, vary}`; only GET/HEAD performs without stream/parse'''
+    cache = data.get('cache')
+    if not cache or method not in CACHEABLE_METHODS or self._stream_options(data):
+      return None
+    if isinstance(cache, Obj):
+      return cache.to_dict()
+    return {} if cache is True else {'ttl': cache}
+
+  def _streamed_body(self, raw: requests.Response, stream: dict) -> StreamedBody:
+    body = StreamedBody(raw.iter_content(stream['chunk_size']), chunk_size=stream['chunk_size'], on_close=raw.close)
+    return body.spool(stream['spool']) if stream['spool'] else body
+
+  def _render_body(self, body_data: Any, data: Obj, params: Obj) -> str:
+    '''Typed JSON body; `render: text` keeps the legacy dump-then-substitute rendering'''
+    if data.get('render') == 'text':
+      return self.render_template(json.dumps(body_data.to_dict()), params)
+    body = self.render_structure(body_data, params)
+    # Strings and file-like bodies (such as a streamed response) are sent as they are
+    return body if isinstance(body, str) or hasattr(body, 'read') else json.dumps(body, default=str)
+
+  def _bulk_item_body(self, item: Any, wrapper: str) -> str:
+    plain = lambda value: value.to_dict() if isinstance(value, Obj) else value
+    item = [plain(value) for value in item] if isinstance(item, list) else plain(item)
+    return json.dumps({wrapper: item} if wrapper else item, default=str)
+
+  def _bind_response(self, response: ApiResponse, params: Obj):
+    '''Expose the response that came back to templates, conditions and later performs.'''
+    params['response'] = response
+    self.latest_response = response
+    self._bind_vars({'response': response})
+
+  def _bind_vars(self, values: dict):
+    '''Invocation vars: read back from this invocation's context, merged into the global vars for later callers'''
+    self.context.bind(values)
+    self._write_vars(values)
+
+  def _write_vars(self, values: dict):
+    '''Global var writes; a parallel branch holds them until its group is merged'''
+    writes = self.context.writes
+    if writes is None:
+      self.merge_vars(values)
+    else:
+      writes.update(values)
+
+  def _log_request(self, method: str, url: str, headers: dict, body: str, query_dict: dict = None):
+    logging.info(f'Request: 🔹{method}🔹 {url} {headers} {query_dict or {}} {body}')
+
+  def _log_response(self, response: ApiResponse):
+    logging.info(f'Response [{response.status_code}] {response.preview()}')
 
   def _handle_log(self, command: str, data: Obj, params: Obj):
     level = command.split('.')[1]
@@ -329,6 +683,9 @@ class ApiIntegrator:
     action_name = command.split('.')[1]
     self.perform_action(action_name, params)
 
+  async def _handle_action_async(self, command: str, data: Obj, params: Obj):
+    await self.perform_action_async(command.split('.')[1], params)
+
   def _handle_vars(self, command: str, data: Obj, params: Obj):
     operation = command.split('.')[1]
     if operation == 'set':
@@ -337,7 +694,7 @@ class ApiIntegrator:
         rendered_value = self.render_template(value, params)
         # Only update and log if the value actually changed
         if rendered_value != value:
-          self.vars[key] = rendered_value
+          self._write_vars({key: rendered_value})
           logging.info(f'Updated var {key}={rendered_value}')
     elif operation == 'get':
       for key in data:
@@ -347,51 +704,50 @@ class ApiIntegrator:
 
   def _handle_responses(self, responses: List[Obj], params: Obj):
     '''Handle response conditions and execute corresponding performs.'''
+    matched = self._matching_response(responses)
+    if matched is None:
+      return False
+    self._execute_response_performs(matched.get('performs', []), params)
+    return True
+
+  async def _handle_responses_async(self, responses: List[Obj], params: Obj):
+    matched = self._matching_response(responses)
+    if matched is None:
+      return False
+    for perform in self._response_performs(matched.get('performs', [])):
+      await self.execute_perform_async(perform, params)
+    return True
+
+  def _matching_response(self, responses: List[Obj]) -> Union[Obj, None]:
     for response in responses:
-      # Check both success and error conditions
-      for condition_type in ['is_success', 'is_error']:
-        if not response.has(condition_type):
-          continue
-
-        if self._check_response_conditions(response[condition_type]):
-          self._execute_response_performs(response.get('performs', []), params)
-          return True
+      # Raw blocks, so the matchers precompile_matchers attached to them are used as they are
+      blocks = dict(iter(response)) if isinstance(response, Obj) else response
+      for condition_type in CONDITION_BLOCKS:
+        if condition_type in blocks and self._check_response_conditions(blocks[condition_type]):
+          return response
 
     logging.warning('No matching response conditions found')
-    return False
+    return None
 
   def _execute_response_performs(self, performs: List[Union[Obj, dict]], params: Obj):
     '''Execute a list of perform actions for a matching response.'''
+    for perform in self._response_performs(performs):
+      self.execute_perform(perform, params)
+
+  def _response_performs(self, performs: List[Union[Obj, dict]]) -> Iterator[Obj]:
     for perform in performs:
       if isinstance(perform, (Obj, dict)):
         # Convert dict to Obj if needed
         perform_obj = perform if isinstance(perform, Obj) else Obj(perform)
-        if perform_obj.has('perform'):
-          self.execute_perform(perform_obj, params)
+        if perform_obj.has('perform') or perform_obj.has('parallel'):
+          yield perform_obj
         else:
           logging.warning(f'Missing perform key in object: {perform}')
       else:
         logging.warning(f'Invalid perform object type: {type(perform)}')
 
-  def _check_response_conditions(self, conditions: Obj) -> bool:
-    response = self.latest_response
-    condition_checks = {
-      'code': lambda v: response.status_code == v,
-      'contains': lambda v: v in response.text,
-      'has_value': lambda v: bool(response.text) == v,
-      'matches': lambda v: re.search(v, response.text) is not None,
-      'has_key': lambda v: v in response.json(),
-      'has_keys': lambda v: all(key in response.json() for key in v),
-      'is_empty': lambda v: len(response.text) == 0 if v else len(response.text) > 0,
-      'is_null': lambda v: response.text == 'null' if v else response.text != 'null',
-      'is_type': lambda v: isinstance(response.json(), eval(v)),
-      'length': lambda v: len(response.text) == v,
-      'length_gt': lambda v: len(response.text) > v,
-      'length_lt': lambda v: len(response.text) < v,
-      'length_gte': lambda v: len(response.text) >= v,
-      'length_lte': lambda v: len(response.text) <= v,
-    }
-    return all(condition_checks.get(condition, lambda v: False)(value) for condition, value in conditions.items())
+  def _check_response_conditions(self, conditions: Union[Obj, dict]) -> bool:
+    return matcher_for(conditions).matches(self.latest_response)
 
   def _get_response_value(self, key: str) -> Any:
     '''Get a value from the latest response using dot notation.'''
@@ -399,62 +755,12 @@ class ApiIntegrator:
       logging.warning(f'No response available for key: {key}')
       return f'{{{{ {key} }}}}'
 
-    response_key = key[9:]  # Remove 'response.' prefix
-
-    # Handle direct response attributes first
-    if hasattr(self.latest_response, response_key):
-      return getattr(self.latest_response, response_key)
-
-    # For body/json access, try to parse JSON first
     try:
-      json_data = self._parse_response_json()
-      if not json_data:
-        return None
-
-      # Return full JSON for body/json keys
-      if response_key in ['json', 'body']:
-        return json_data
-
-      # Navigate nested structure
-      return self._get_nested_value(json_data, response_key)
-
+      return self.latest_response.resolve(key[9:])  # Remove 'response.' prefix
     except Exception as e:
       logging.warning(f'Error accessing response value: {e}')
       return None
 
-  def _parse_response_json(self) -> Union[dict, list, None]:
-    '''Parse the response body as JSON.'''
-    try:
-      return json.loads(self.latest_response.body)
-    except json.JSONDecodeError:
-      logging.warning('Response body is not valid JSON')
-      return None
-
-  def _get_nested_value(self, data: Union[dict, list], key_path: str) -> Any:
-    '''Get a nested value using dot notation.'''
-    # Remove 'body' from path if present
-    nested_keys = [k for k in key_path.split('.') if k != 'body']
-
-    value = data
-    for key in nested_keys:
-      if isinstance(value, dict):
-        if key in value:
-          value = value[key]
-        else:
-          logging.warning(f'Key {key} not found in response')
-          return None
-      elif isinstance(value, list) and key.isdigit():
-        index = int(key)
-        if 0 <= index < len(value):
-          value = value[index]
-        else:
-          logging.warning(f'Array index {key} out of range')
-          return None
-      else:
-        logging.warning(f'Cannot access {key} in {type(value)}')
-        return None
-    return value
-
   def _get_supplier_server_url(self, params: Obj) -> str:
     supplier_server = (
         params.get('supplier_server') or
@@ -478,9 +784,8 @@ class ApiIntegrator:
 
   def render_template(self, template: Union[str, Obj, List], params: Obj) -> Any:
     if isinstance(template, str):
-      # First render any template variables
-      result = re.sub(r'\{\{(.+?)\}\}', lambda m: self.render_value(m.group(1).strip(), params), template)
-      logging.debug(f'Rendered template: {template} -> {result}')
+      result = compile_template(template).render(lambda key: self.render_value(key, params))
+      logging.debug('Rendered template: %s -> %s', template, result)
       return result
     elif isinstance(template, Obj):
       return Obj({k: self.render_template(v, params) for k, v in template.items()})
@@ -488,19 +793,42 @@ class ApiIntegrator:
       return [self.render_template(item, params) for item in template]
     return template
 
-  def render_value(self, key: str, params: Obj) -> str:
+  def render_structure(self, template: Any, params: Obj) -> Any:
+    '''Render a body structure keeping native values for whole-value placeholders'''
+    if isinstance(template, str):
+      compiled = compile_template(template)
+      if compiled.whole_key is not None:
+        return self._to_native(self.resolve_value(compiled.whole_key, params))
+      return compiled.render(lambda key: self.render_value(key, params))
+    elif isinstance(template, (Obj, dict)):
+      return {k: self.render_structure(v, params) for k, v in template.items()}
+    elif isinstance(template, list):
+      return [self.render_structure(item, params) for item in template]
+    return template
+
+  def _to_native(self, value: Any) -> Any:
+    if isinstance(value, Obj):
+      return value.to_dict()
+    elif isinstance(value, ET.Element):
+      return ET.tostring(value, encoding='unicode')
+    return value
+
+  def resolve_value(self, key: str, params: Obj) -> Any:
     # First check if it's a response path
     if key.startswith('response.'):
       response_value = self._get_response_value(key)
       if response_value is not None:
-        return str(response_value)
+        return response_value
 
     # Then try normal value lookup
     value = self.get_value(key, params)
-    if value == f'{{{{ {key} }}}}':  # If not found in params/vars/constants
+    if value == f'{{{{ {key} }}}}' and key in self.vars:  # If not found in params/vars/constants
       # Try getting from vars directly for log messages
-      if key in self.vars:
-        return str(self.vars[key])
+      return self.vars.get(key)
+    return value
+
+  def render_value(self, key: str, params: Obj) -> str:
+    value = self.resolve_value(key, params)
 
     # Format the value appropriately
     if isinstance(value, dict):
@@ -529,10 +857,9 @@ class ApiIntegrator:
 def main():
   config_relative_path = 'infrastructure/specs/api_integrator/cva_ai.yaml'
   integrator = ApiIntegrator(config_relative_path)
-  for action_name, action_body in integrator.config.actions.items():
-    for perform in action_body.performs:
-      if perform.perform.action == 'http.get':
-        integrator.perform_action(action_name)
+  actions = [action_name for action_name, action_body in integrator.config.actions.items()
+             if any(perform.get('perform.action') == 'http.get' for perform in action_body.performs)]
+  integrator.run_workflow(actions, resume=True).raise_for_failures()
 
 
 if __name__ == '__main__':
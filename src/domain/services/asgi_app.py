@@ -0,0 +1,132 @@
+import json
+import re
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+from src.domain.value_objects.endpoint_request import EndpointRequest
+
+View = Callable[[EndpointRequest], Awaitable[Tuple[Any, int]]]
+LIFESPAN_REPLIES = {
+  'lifespan.startup': 'lifespan.startup.complete',
+  'lifespan.shutdown': 'lifespan.shutdown.complete',
+}
+NDJSON = 'application/x-ndjson'
+
+
+class AsgiApp:
+  '''Minimal ASGI 3 application routing paths to coroutine views that return (payload, status).
+
+  Routes are registered with the same `add_url_rule` call as Flask; `<name>` segments are passed in
+  the view's EndpointRequest. A payload that is an async iterator of lines is streamed as NDJSON.
+  Serve it with any ASGI server (`uvicorn module:integrator.app`), or with `to_aiohttp()` on the
+  aiohttp server shipped with the async transport. Every request runs as a task on the server loop,
+  so no thread waits on a supplier.
+  '''
+
+  def __init__(self):
+    self.routes: Dict[str, Tuple[List[str], View]] = {}
+    self._patterns: List[Tuple[re.Pattern, str]] = []
+
+  def add_url_rule(self, rule: str, endpoint: str, view_func: View, methods: List[str]):
+    self.routes[rule] = (methods, view_func)
+    if '<' in rule:
+      self._patterns.append((re.compile('^' + re.sub(r'<(\w+)>', r'(?P<\1>[^/]+)', rule) + '$'), rule))
+
+  async def __call__(self, scope: dict, receive: Callable, send: Callable):
+    handlers = {'http': self._http, 'lifespan': self._lifespan}
+    if scope['type'] not in handlers:
+      raise ValueError(f"Unsupported ASGI scope type '{scope['type']}'")
+    await handlers[scope['type']](scope, receive, send)
+
+  async def _http(self, scope: dict, receive: Callable, send: Callable):
+    payload, status = await self._dispatch(scope, await self._read_body(receive))
+    if hasattr(payload, '__aiter__'):
+      await self._stream(payload, status, send)
+      return
+    body = json.dumps(payload, default=str).encode('utf-8')
+    await send({'type': 'http.response.start', 'status': status,
+                'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())]})
+    await send({'type': 'http.response.body', 'body': body})
+
+  async def _dispatch(self, scope: dict, body: bytes) -> Tuple[Any, int]:
+    path = scope['path'].rstrip('/') or '/'
+    method = scope['method']
+    route, path_params = self._match(path)
+    if route is None:
+      return {'status': 'error', 'error': f'Not found: {path}'}, 404
+    methods, view = route
+    if method not in methods and not (method == 'HEAD' and 'GET' in methods):
+      return {'status': 'error', 'error': f'Method {method} not allowed for {path}'}, 405
+    return await view(EndpointRequest.from_query_string(scope.get('query_string', b''), body, path_params))
+
+  def _match(self, path: str) -> Tuple[Optional[tuple], dict]:
+    if path in self.routes:
+      return self.routes[path], {}
+    for pattern, rule in self._patterns:
+      match = pattern.match(path)
+      if match:
+        return self.routes[rule], match.groupdict()
+    return None, {}
+
+  @staticmethod
+  async def _read_body(receive: Callable) -> bytes:
+    body = b''
+    while True:
+      message = await receive()
+      body += message.get('body', b'')
+      if message['type'] != 'http.request' or not message.get('more_body'):
+        return body
+
+  @staticmethod
+  async def _stream(lines: AsyncIterator[str], status: int, send: Callable):
+    await send({'type': 'http.response.start', 'status': status, 'headers': [(b'content-type', NDJSON.encode())]})
+    async for line in lines:
+      await send({'type': 'http.response.body', 'body': line.encode('utf-8'), 'more_body': True})
+    await send({'type': 'http.response.body', 'body': b''})
+
+  async def _lifespan(self, scope: dict, receive: Callable, send: Callable):
+    while True:
+      message = await receive()
+      await send({'type': LIFESPAN_REPLIES[message['type']]})
+      if message['type'] == 'lifespan.shutdown':
+        return
+
+  def to_aiohttp(self) -> web.Application:
+    '''aiohttp application forwarding every request to this ASGI app, streaming its response.'''
+    async def handle(request: web.Request) -> web.StreamResponse:
+      received = [{'type': 'http.request', 'body': await request.read(), 'more_body': False}]
+      response = web.StreamResponse()
+
+      async def receive() -> dict:
+        return received.pop() if received else {'type': 'http.disconnect'}
+
+      async def send(message: dict):
+        if message['type'] == 'http.response.start':
+          response.set_status(message['status'])
+          response.headers.extend((k.decode(), v.decode()) for k, v in message.get('headers', []))
+          await response.prepare(request)
+        else:
+          await response.write(message.get('body', b''))
+
+      await self(self._scope(request), receive, send)
+      await response.write_eof()
+      return response
+
+    app = web.Application()
+    app.router.add_route('*', '/{tail:.*}', handle)
+    return app
+
+  @staticmethod
+  def _scope(request: web.Request) -> dict:
+    return {
+      'type': 'http',
+      'asgi': {'version': '3.0'},
+      'http_version': f'{request.version.major}.{request.version.minor}',
+      'method': request.method,
+      'scheme': request.scheme,
+      'path': request.path,
+      'raw_path': request.rel_url.raw_path.encode(),
+      'query_string': request.query_string.encode(),
+      'headers': [(k.lower(), v) for k, v in request.raw_headers],
+    }
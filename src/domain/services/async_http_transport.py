@@ -0,0 +1,139 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from datetime import timedelta
+from tempfile import SpooledTemporaryFile
+from typing import Any, Coroutine, Tuple
+
+import aiohttp
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from src.domain.services.rate_limiter import RateLimits
+from src.domain.value_objects.api_response import ApiResponse
+from src.domain.value_objects.streamed_body import CHUNK_SIZE, SPOOL_THRESHOLD, StreamedBody
+
+
+class AsyncHttpTransport:
+  '''Long-lived aiohttp client running on its own event loop thread.
+
+  Every async request made by the integrator goes through one pooled ClientSession,
+  so keep-alive connections, DNS cache entries and TLS sessions survive across calls.
+  `rate_limits` are shared with the sync transport, so both draw from the same buckets.
+  '''
+
+  def __init__(self, limit: int = 100, limit_per_host: int = 10, keepalive_timeout: float = 30,
+               ttl_dns_cache: int = 300, rate_limits: RateLimits = None):
+    self.connector_options = {
+      'limit': limit,
+      'limit_per_host': limit_per_host,
+      'keepalive_timeout': keepalive_timeout,
+      'ttl_dns_cache': ttl_dns_cache,
+    }
+    self.rate_limits = rate_limits or RateLimits()
+    self._loop = None
+    self._thread = None
+    self._session = None
+    self._lock = threading.Lock()
+
+  @classmethod
+  def from_config(cls, config, rate_limits: RateLimits = None) -> 'AsyncHttpTransport':
+    return cls(**{k: v for k, v in (config or {}).items() if k in ('limit', 'limit_per_host', 'keepalive_timeout',
+                                                                     'ttl_dns_cache')}, rate_limits=rate_limits)
+
+  def run(self, coro: Coroutine) -> Any:
+    '''Run a coroutine on the transport loop from synchronous code and wait for its result.'''
+    if threading.current_thread() is self._thread:
+      coro.close()
+      raise RuntimeError('Blocking on the transport loop from its own thread; await run_async() instead')
+    return self.submit(coro).result()
+
+  async def run_async(self, coro: Coroutine) -> Any:
+    '''Await a coroutine on the transport loop from any running event loop without blocking it.'''
+    loop = self._ensure_loop()
+    if asyncio.get_running_loop() is loop:
+      return await coro
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+  def submit(self, coro: Coroutine) -> Future:
+    '''Schedule a coroutine on the transport loop without waiting for it.'''
+    return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+  async def request(self, method: str, url: str, headers: dict = None, data: Any = None,
+                    params: dict = None, timeout: Tuple[float, float] = None, stream: dict = None) -> ApiResponse:
+    '''Send a request through the shared session. Must be awaited on the transport loop.
+
+    With `stream` ({chunk_size, spool}) the body is spooled chunk by chunk instead of read whole.
+    '''
+    limiter = self.rate_limits.for_url(url) if self.rate_limits else None
+    if limiter is None:
+      return await self._send(method, url, headers, data, params, timeout, stream)
+    await limiter.acquire_async()
+    try:
+      response = await self._send(method, url, headers, data, params, timeout, stream)
+      limiter.observe(response.status_code, response.headers)
+    finally:
+      limiter.release()
+    return response
+
+  async def _send(self, method: str, url: str, headers: dict, data: Any, params: dict,
+                  timeout: Tuple[float, float], stream: dict) -> ApiResponse:
+    session = await self._get_session()
+    started = time.perf_counter()
+    # Without a configured timeout the session's default ClientTimeout applies
+    timeouts = {'timeout': aiohttp.ClientTimeout(sock_connect=timeout[0], sock_read=timeout[1])} if timeout else {}
+    async with session.request(method, url, headers=headers, data=data, params=params, **timeouts) as response:
+      if stream is not None:
+        return await self._spool_response(response, stream, started)
+      content = await response.read()
+      elapsed = timedelta(seconds=time.perf_counter() - started)
+      return ApiResponse(self._to_requests_response(response, content, elapsed))
+
+  async def _spool_response(self, response: aiohttp.ClientResponse, stream: dict, started: float) -> ApiResponse:
+    chunk_size = stream.get('chunk_size') or CHUNK_SIZE
+    file = SpooledTemporaryFile(max_size=stream.get('spool') or SPOOL_THRESHOLD)
+    async for chunk in response.content.iter_chunked(chunk_size):
+      file.write(chunk)
+    elapsed = timedelta(seconds=time.perf_counter() - started)
+    return ApiResponse(self._to_requests_response(response, False, elapsed), StreamedBody.from_file(file, chunk_size))
+
+  def close(self):
+    with self._lock:
+      loop, thread, self._loop, self._thread = self._loop, self._thread, None, None
+    if not loop:
+      return
+    asyncio.run_coroutine_threadsafe(self._close_session(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+  def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+    with self._lock:
+      if self._loop is None:
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='async-http-transport', daemon=True)
+        self._thread.start()
+      return self._loop
+
+  async def _get_session(self) -> aiohttp.ClientSession:
+    if self._session is None or self._session.closed:
+      self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(**self.connector_options))
+    return self._session
+
+  async def _close_session(self):
+    if self._session is not None:
+      await self._session.close()
+      self._session = None
+
+  @staticmethod
+  def _to_requests_response(response: aiohttp.ClientResponse, content: bytes, elapsed: timedelta) -> requests.Response:
+    response_obj = requests.Response()
+    response_obj.status_code = response.status
+    response_obj.url = str(response.url)
+    response_obj.headers = CaseInsensitiveDict(response.headers)
+    response_obj.encoding = response.charset or 'utf-8'
+    response_obj.reason = response.reason
+    response_obj._content = content
+    response_obj.elapsed = elapsed
+    return response_obj
@@ -0,0 +1,59 @@
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, Tuple
+
+from src.domain.value_objects.batch_item_response import BatchItemResponse
+from src.domain.value_objects.bulk_result import BulkResult
+
+
+class BulkExecutor:
+  '''Runs a lazy iterable of items with a bounded in-flight window.
+
+  `submit` turns an item (or a list of items when `batch_size` is set) into a concurrent Future
+  (a thread pool task or a coroutine scheduled on the async transport loop). Items are only pulled
+  from the iterable when a slot frees up, and `on_response` runs on the calling thread for every
+  item as its request completes.
+  '''
+
+  def __init__(self, window: int, id_field: str = None, batch_size: int = None, wrapper: str = ''):
+    self.window = max(int(window), 1)
+    self.id_field = id_field
+    self.batch_size = int(batch_size) if batch_size else None
+    self.wrapper = wrapper
+
+  def run(self, items: Iterable[Any], submit: Callable[[Any], Future],
+          on_response: Callable[[int, Any, Any], None]) -> BulkResult:
+    result = BulkResult(self.id_field)
+    pending = {}
+    for index, unit in self._units(items):
+      if len(pending) >= self.window:
+        self._drain(pending, result, on_response)
+      pending[submit(unit)] = (index, unit)
+    while pending:
+      self._drain(pending, result, on_response)
+    return result
+
+  def _units(self, items: Iterable[Any]) -> Iterator[Tuple[int, Any]]:
+    if not self.batch_size:
+      yield from enumerate(items)
+      return
+    iterator, index = iter(items), 0
+    while batch := list(islice(iterator, self.batch_size)):
+      yield index, batch
+      index += len(batch)
+
+  def _drain(self, pending: dict, result: BulkResult, on_response: Callable):
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    for future in done:
+      index, unit = pending.pop(future)
+      error = future.exception()
+      response = None if error else future.result()
+      for offset, (item, item_response) in enumerate(self._split(unit, response)):
+        result.record(index + offset, item, item_response, error)
+        if item_response is not None:
+          on_response(index + offset, item, item_response)
+
+  def _split(self, unit: Any, response: Any) -> Iterable[Tuple[Any, Any]]:
+    if not self.batch_size:
+      return [(unit, response)]
+    return zip(unit, BatchItemResponse.split(response, len(unit), self.wrapper))
@@ -3,14 +3,18 @@ import logging
 from pathlib import Path
 from typing import Dict, List, Any
 from src.domain.services.config_loader import ConfigLoader
-from src.domain.services.template_engine import TemplateEngine
+from src.domain.services.template_engine import TemplateEngine, precompile_templates
 from src.domain.services.response_handler import ResponseHandler
+from src.domain.services.response_matcher import CONDITION_BLOCKS, precompile_matchers
 from src.domain.value_objects.obj_utils import Obj
+from src.domain.value_objects.scope import Scope
 
 class Connector:
     def __init__(self, config_path: str):
         # Initialize core components
         self.config = ConfigLoader(config_path).load()
+        precompile_templates(self.config)
+        precompile_matchers(self.config)
         self.response_handler = ResponseHandler()
         
         # Load connector configuration
@@ -107,20 +111,17 @@ class Connector:
                 
         return connectors
 
-    def _merge_params(self, params: Obj = None) -> Obj:
-        """Merge provided params with vars and constants"""
-        return Obj({
-            **(params.to_dict() if params else {}),
-            **self.vars.to_dict(),
-            **self.constants.to_dict()
-        })
+    def _merge_params(self, params: Obj = None) -> Scope:
+        """Layer provided params under vars and constants without copying them"""
+        return Scope(self.constants, self.vars, params)
         
     def _handle_responses(self, responses: List[Obj], params: Obj):
         """Process response conditions and execute corresponding actions"""
         for response in responses:
-            for condition_type in ['is_success', 'is_error']:
-                if response.has(condition_type) and \
-                   self.response_handler.check_conditions(response[condition_type]):
+            blocks = dict(iter(response))
+            for condition_type in CONDITION_BLOCKS:
+                if condition_type in blocks and \
+                   self.response_handler.check_conditions(blocks[condition_type]):
                     self._execute_response_performs(response.get('performs', []), params)
                     return
                     
@@ -0,0 +1,99 @@
+import threading
+from typing import Any, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.domain.services.rate_limiter import RateLimits
+
+POOL_OPTIONS = ('pool_connections', 'pool_maxsize', 'pool_block')
+TIMEOUT_OPTIONS = ('connect_timeout', 'read_timeout')
+
+
+class PoolStatsAdapter(HTTPAdapter):
+  '''HTTPAdapter that records in-flight pressure and connection reuse of its pools'''
+
+  def __init__(self, pool_connections: int = 10, pool_maxsize: int = 10, pool_block: bool = False):
+    self.pool_maxsize = pool_maxsize
+    self.in_flight = 0
+    self.peak_in_flight = 0
+    self.saturated = 0
+    self._stats_lock = threading.Lock()
+    super().__init__(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+
+  def send(self, request, **kwargs):
+    with self._stats_lock:
+      self.in_flight += 1
+      self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+      if self.in_flight > self.pool_maxsize:
+        self.saturated += 1
+    try:
+      return super().send(request, **kwargs)
+    finally:
+      with self._stats_lock:
+        self.in_flight -= 1
+
+  def stats(self) -> dict:
+    pools = self.poolmanager.pools
+    connection_pools = [pools[key] for key in list(pools.keys()) if key in pools]
+    requests_sent = sum(pool.num_requests for pool in connection_pools)
+    connections = sum(pool.num_connections for pool in connection_pools)
+    return {
+      'pool_maxsize': self.pool_maxsize,
+      'in_flight': self.in_flight,
+      'peak_in_flight': self.peak_in_flight,
+      'saturated': self.saturated,
+      'requests': requests_sent,
+      'connections': connections,
+      'reused': max(requests_sent - connections, 0),
+    }
+
+
+class HttpTransport:
+  '''Pooled requests.Session transport tuned globally and per supplier server.
+
+  Options (pool_connections, pool_maxsize, pool_block, connect_timeout, read_timeout) come from
+  the top-level `transport` block and can be overridden by a `transport` block on any
+  `supplier_servers` entry, which then gets its own adapter mounted on the server url.
+  Requests to a server with a `rate_limit` block wait for its limiter.
+  '''
+
+  def __init__(self, session: requests.Session, defaults: dict, servers: List[Any] = None,
+               rate_limits: RateLimits = None):
+    self.session = session
+    self.defaults = defaults
+    self.rate_limits = rate_limits if rate_limits is not None else RateLimits.from_servers(servers)
+    self.adapters = {}
+    self._timeouts = []
+    self._mount(('http://', 'https://'), defaults)
+    for server in servers or []:
+      overrides = server.get('transport')
+      if overrides:
+        self._mount((server.url.rstrip('/'),), {**defaults, **overrides.to_dict()})
+
+  def request(self, method: str, url: str, **kwargs) -> requests.Response:
+    kwargs.setdefault('timeout', self.timeout_for(url))
+    limiter = self.rate_limits.for_url(url) if self.rate_limits else None
+    if limiter is None:
+      return self.session.request(method, url, **kwargs)
+    with limiter:
+      response = self.session.request(method, url, **kwargs)
+      limiter.observe(response.status_code, response.headers)
+    return response
+
+  def timeout_for(self, url: str) -> Optional[Tuple[float, float]]:
+    return next((timeout for prefix, timeout in self._timeouts if url.lower().startswith(prefix)), None)
+
+  def stats(self) -> dict:
+    '''Pool saturation and connection reuse counters per mounted prefix'''
+    return {prefix: adapter.stats() for prefix, adapter in self.adapters.items()}
+
+  def _mount(self, prefixes: Tuple[str, ...], options: dict):
+    adapter = PoolStatsAdapter(**{k: options[k] for k in POOL_OPTIONS if k in options})
+    timeout = tuple(options.get(k) for k in TIMEOUT_OPTIONS)
+    timeout = timeout if any(timeout) else None
+    for prefix in prefixes:
+      self.session.mount(prefix, adapter)
+      self.adapters[prefix] = adapter
+      self._timeouts.append((prefix.lower(), timeout))
+    self._timeouts.sort(key=lambda entry: len(entry[0]), reverse=True)
@@ -3,6 +3,16 @@ from typing import Union
 
 from src.domain.value_objects.obj_utils import Obj
 
+CONTENT_TYPES = {
+  'application/json': 'json',
+  'application/xml': 'xml',
+  'text/xml': 'xml',
+}
+PARSE_SELECTORS = {
+  'json': lambda schema: 'json[]',
+  'xml': lambda schema: schema.get('items.xml.name'),
+}
+
 
 class OasToApiIntegratorSpecificationMapper:
   def __init__(self, full_path: str):
@@ -73,6 +83,7 @@ class OasToApiIntegratorSpecificationMapper:
     return actions
 
   def _map_operation_to_action(self, path: str, method: str, operation: Obj) -> dict:
+    stream = self._map_sample_stream(operation)
     return {
       'tags': operation.get('tags', []),
       'description': operation.get('description', ''),
@@ -84,14 +95,30 @@ class OasToApiIntegratorSpecificationMapper:
               'path': f"{{{{supplier_server.url}}}}{path}",
               **({'headers': self._map_headers(operation)} if self._map_headers(operation) else {}),
               **({'query': self._map_query_params(operation)} if self._map_query_params(operation) else {}),
-              **({'body': self._map_request_body(operation)} if self._map_request_body(operation) else {})
+              **({'body': self._map_request_body(operation)} if self._map_request_body(operation) else {}),
+              **({'parse': stream['parse']} if stream else {})
             }
           },
-          'responses': self._map_responses(operation)
+          'responses': self._map_responses(operation, stream)
         }
       ]
     }
 
+  def _map_sample_stream(self, operation: Obj) -> dict:
+    """ Parse selector of the first success response holding an array of objects, its status, and the performs pushing its items. """
+    for status_code, response_data in operation.get('responses', {}).items():
+      content = response_data.get('content') if str(status_code).startswith('2') else None
+      for media_type, media in (content.items() if content else []):
+        content_type = CONTENT_TYPES.get(media_type)
+        schema = media.get('schema', Obj({})) if isinstance(media, Obj) else Obj({})
+        if content_type is None or schema.get('type') != 'array':
+          continue
+        selector = PARSE_SELECTORS[content_type](schema)
+        performs = self._create_sample_response_performs(schema, content_type)
+        if selector and len(performs) > 1:
+          return {'parse': selector, 'status': status_code, 'performs': performs}
+    return {}
+
   def _map_headers(self, operation: Obj) -> Obj:
     headers = Obj({})
     if operation.has('parameters'):
@@ -133,31 +160,36 @@ class OasToApiIntegratorSpecificationMapper:
       }
     return {}
 
-  def _map_responses(self, operation: Obj) -> list:
+  def _map_responses(self, operation: Obj, stream: dict = None) -> list:
     responses = []
     for status_code, response_data in operation.get('responses', {}).items():
-      responses.append(self._map_single_response(status_code, response_data))
+      responses.append(self._map_single_response(status_code, response_data, stream or {}))
     return responses
 
-  def _map_single_response(self, status_code: str, response_data: Obj) -> dict:
+  def _map_single_response(self, status_code: str, response_data: Obj, stream: dict = None) -> dict:
+    stream = stream or {}
+    # A parsed (streamed) success body is left unread for the push, which only runs on the streamed status
+    unread = bool(stream) and str(status_code).startswith('2')
     response = {
       'is_success' if str(status_code).startswith('2') else 'is_error': {
         'code': int(status_code)
       },
       'performs': [
-        self._create_log_perform(status_code)
+        self._create_log_perform(status_code, unread)
       ]
     }
-    vars_set_perform = self._create_vars_set_perform(response_data)
+    vars_set_perform = None if unread else self._create_vars_set_perform(response_data)
     if vars_set_perform is not None:
       response['performs'].append(vars_set_perform)
+    if status_code == stream.get('status'):
+      response['performs'].extend(stream['performs'])
     return response
 
-  def _create_log_perform(self, status_code: str) -> dict:
+  def _create_log_perform(self, status_code: str, unread: bool = False) -> dict:
     return {
       'perform': {
         'action': 'log.info' if str(status_code).startswith('2') else 'log.error',
-        'data': f"Response: {{{{response.body}}}}"
+        'data': f"Response: {status_code}" if unread else f"Response: {{{{response.body}}}}"
       }
     }
 
@@ -196,6 +228,7 @@ class OasToApiIntegratorSpecificationMapper:
       vars_set_data[parent_key] = f"{{{{{assigned_key}}}}}"
 
   def _create_sample_response_performs(self, schema: Obj, content_type: str) -> list:
+    """ Array responses are pushed item by item as the fetching perform parses them (`parse: json[]` or a tag). """
     performs = []
     # Log the sample response
     performs.append({
@@ -208,12 +241,13 @@ class OasToApiIntegratorSpecificationMapper:
     # Create a perform action to send the sample response to my_app_server
     sample_response_body = self._create_sample_response_body(schema, content_type)
     if sample_response_body:
+      delivery = {'type': 'bulk_stream', 'items': 'response.each', 'wrapper': 'item'} \
+        if schema.get('type') == 'array' else {}
       performs.append({
         'perform': {
           'action': 'http.post',
-          'type': 'bulk',
-          'wrapper': 'item',
           'data': {
+            **delivery,
             'url': '{{my_app_server.url}}/items',
             'headers': {
             },
@@ -225,29 +259,18 @@ class OasToApiIntegratorSpecificationMapper:
     return performs
 
   def _create_sample_response_body(self, schema: Obj, content_type: str) -> Union[dict, str]:
-    if content_type == 'json':
-      return self._create_json_response_body(schema)
-    elif content_type == 'xml':
-      return self._create_xml_response_body(schema)
+    if content_type in ('json', 'xml'):
+      return self._create_typed_response_body(schema, content_type)
     else:
       return {}
 
-  def _create_json_response_body(self, schema: Obj) -> dict:
-    if schema.get('type') == 'object':
-      return {prop: f'{{{{response.json.{prop}}}}}' for prop in schema.get('properties', {}).keys()}
-    elif schema.get('type') == 'array':
-      items_schema = schema.get('items', {})
-      if items_schema.get('type') == 'object':
-        return [{prop: f'{{{{response.json[].{prop}}}}}' for prop in items_schema.get('properties', {}).keys()}]
-    return {}
-
-  def _create_xml_response_body(self, schema: Obj) -> dict:
+  def _create_typed_response_body(self, schema: Obj, content_type: str) -> dict:
     if schema.get('type') == 'object':
-      return {prop: f'{{{{response.xml.{prop}}}}}' for prop in schema.get('properties', {}).keys()}
+      return {prop: f'{{{{response.{content_type}.{prop}}}}}' for prop in schema.get('properties', {}).keys()}
     elif schema.get('type') == 'array':
       items_schema = schema.get('items', {})
       if items_schema.get('type') == 'object':
-        return [{prop: f'{{{{response.xml[].{prop}}}}}' for prop in items_schema.get('properties', {}).keys()}]
+        return {prop: f'{{{{item.{prop}}}}}' for prop in items_schema.get('properties', {}).keys()}
     return {}
 
 
@@ -0,0 +1,98 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterator, Optional, Tuple
+from urllib.parse import urljoin
+
+Request = Tuple[str, dict]
+
+DEFAULT_PARAMS = {'page': 'page', 'offset': 'offset', 'cursor': 'cursor', 'link': None}
+DEFAULT_STARTS = {'page': 1, 'offset': 0, 'cursor': None, 'link': None}
+
+
+class Paginator:
+  '''Walks the pages of a list endpoint as one sequence of responses.
+
+  `style` picks how the next request is derived: `page` counts the `param` query value up from `start`,
+  `offset` advances it by the number of `items` on the page (or `size`), `cursor` sends the value found
+  at the response path `next`, and `link` follows the `rel="next"` URL of the Link header. With `prefetch`
+  the next page is already downloading while the current one is handled. The walk stops after an error
+  status, an empty or short (`size`) page of `items`, the response's `total_pages`, or `max_pages`.
+  '''
+
+  def __init__(self, options: dict, fetch: Callable[[str, dict], Any]):
+    self.style = options.get('style', 'page')
+    if self.style not in DEFAULT_PARAMS:
+      raise ValueError(f"Unknown pagination style '{self.style}'")
+    self.fetch = fetch
+    self.param = options.get('param', DEFAULT_PARAMS[self.style])
+    self.start = options.get('start', DEFAULT_STARTS[self.style])
+    self.size = int(options['size']) if options.get('size') else None
+    self.size_param = options.get('size_param')
+    self.items = options.get('items')
+    self.next = options.get('next', 'next_cursor')
+    self.total_pages = options.get('total_pages')
+    self.max_pages = options.get('max_pages')
+    self.prefetch = bool(options.get('prefetch', False))
+    if self.style in ('page', 'offset') and not (self.items or self.total_pages or self.max_pages):
+      raise ValueError(f"Pagination style '{self.style}' needs `items`, `total_pages` or `max_pages` to stop")
+    if self.style == 'offset' and not (self.items or self.size):
+      raise ValueError("Pagination style 'offset' needs `items` or `size` to advance")
+    self._advance = {
+      'page': lambda response, url, query, page_items: self._step(url, query, 1),
+      'offset': lambda response, url, query, page_items: self._step(
+        url, query, len(page_items) if page_items is not None else self.size),
+      'cursor': lambda response, url, query, page_items: self._cursor(response, url, query),
+      'link': lambda response, url, query, page_items: self._link(response),
+    }[self.style]
+
+  def pages(self, url: str, query: dict) -> Iterator[Any]:
+    request = self._first(url, query)
+    number = 0
+    with ThreadPoolExecutor(max_workers=1) as pool:
+      pending = pool.submit(self.fetch, *request)
+      while pending is not None:
+        response = pending.result()
+        number += 1
+        page_items = self.page_items(response)
+        request = self._following(response, request, page_items, number)
+        pending = pool.submit(self.fetch, *request) if request and self.prefetch else None
+        # The empty page that marks the end of a listing is not handed out
+        if number == 1 or page_items != []:
+          yield response
+        if request and pending is None:
+          pending = pool.submit(self.fetch, *request)
+
+  def page_items(self, response: Any) -> Optional[list]:
+    if not self.items:
+      return None
+    items = response.document.resolve(self.items)
+    return items if isinstance(items, list) else None
+
+  def _first(self, url: str, query: dict) -> Request:
+    query = {**query, **({self.size_param: self.size} if self.size_param and self.size else {})}
+    if self.param and self.start is not None:
+      query[self.param] = self.start
+    return url, query
+
+  def _following(self, response: Any, request: Request, page_items: Optional[list], number: int) -> Optional[Request]:
+    if self._is_last(response, page_items, number):
+      return None
+    return self._advance(response, *request, page_items)
+
+  def _is_last(self, response: Any, page_items: Optional[list], number: int) -> bool:
+    if response.status_code >= 400 or (self.max_pages and number >= int(self.max_pages)):
+      return True
+    if page_items is not None and (not page_items or (self.size and len(page_items) < self.size)):
+      return True
+    total = response.document.resolve(self.total_pages) if self.total_pages else None
+    return total is not None and number >= int(total)
+
+  def _step(self, url: str, query: dict, by: int) -> Request:
+    return url, {**query, self.param: int(query.get(self.param, self.start)) + by}
+
+  def _cursor(self, response: Any, url: str, query: dict) -> Optional[Request]:
+    cursor = response.document.resolve(self.next)
+    return (url, {**query, self.param: cursor}) if cursor else None
+
+  def _link(self, response: Any) -> Optional[Request]:
+    link = response.links.get('next', {}).get('url')
+    return (urljoin(response.url, link), {}) if link else None
@@ -0,0 +1,86 @@
+from typing import Any, List, NamedTuple
+
+from src.domain.services.template_engine import compile_template
+from src.domain.value_objects.obj_utils import Obj
+
+# Bound per perform and merged in declaration order, so performs writing them do not conflict
+BOUND_KEYS = frozenset({'response', 'bulk_responses', 'item', 'page'})
+LOOP_KEYS = frozenset({'item', 'page'})
+BARRIER_KINDS = frozenset({'action', 'this', 'log'})
+NESTED_BARRIER_KINDS = frozenset({'action'})
+WRITES = {
+  'http': lambda data: BOUND_KEYS,
+  'vars': lambda data: frozenset(data.keys() if isinstance(data, Obj) else data or []),
+}
+# Options naming a key without braces, resolved with get_value
+BARE_READS = {
+  'http': lambda data: bare_keys(data, ('items',)),
+}
+
+
+class Footprint(NamedTuple):
+  reads: frozenset
+  writes: frozenset
+  barrier: bool
+
+
+def key_head(key: str) -> str:
+  return key.split('.', 1)[0].split('[', 1)[0]
+
+
+def template_keys(data: Any) -> frozenset:
+  '''First segments of the {{keys}} read anywhere in a perform's data'''
+  if isinstance(data, Obj):
+    data = data.to_dict()
+  if isinstance(data, str):
+    return frozenset(key_head(key) for key in compile_template(data).keys)
+  values = data.values() if isinstance(data, dict) else data if isinstance(data, list) else []
+  return frozenset().union(*(template_keys(value) for value in values))
+
+
+def bare_keys(data: Any, options: tuple) -> frozenset:
+  values = [data.get(option) for option in options] if isinstance(data, (Obj, dict)) else []
+  return frozenset(key_head(value) for value in values if isinstance(value, str) and '{{' not in value)
+
+
+def footprint(perform_info: Obj, actions: Obj, nested: bool = False) -> Footprint:
+  '''Keys a perform (with its response performs) reads and writes; barriers cannot move past other performs.
+
+  Log, `this.*` and action calls are barriers at the top level, so logs keep their place and nested
+  actions, whose keys are not followed, never overlap with other performs.
+  '''
+  if perform_info.has('parallel'):
+    return _union([footprint(member, actions, nested) for member in perform_info.parallel])
+  action = perform_info.perform
+  action_str = action.action if isinstance(action, Obj) else action
+  data = action.data if isinstance(action, Obj) and action.has('data') else perform_info.get('data')
+  kind = action_str.split('.')[0]
+  reads = template_keys(data) | BARE_READS.get(kind, lambda _: frozenset())(data)
+  own = Footprint(reads - LOOP_KEYS, WRITES.get(kind, lambda _: frozenset())(data),
+                  kind in (NESTED_BARRIER_KINDS if nested else BARRIER_KINDS) or action_str in actions)
+  handlers = [footprint(Obj(member) if isinstance(member, dict) else member, actions, True)
+              for response in (perform_info.responses if 'responses' in perform_info else [])
+              for member in (response.performs if response.has('performs') else [])]
+  # Response performs read the response their own perform bound
+  return _union([own, *(handler._replace(reads=handler.reads - BOUND_KEYS) for handler in handlers)])
+
+
+def depends(earlier: Footprint, later: Footprint) -> bool:
+  if earlier.barrier or later.barrier:
+    return True
+  return bool(earlier.writes & later.reads or later.writes & earlier.reads
+              or (earlier.writes & later.writes) - BOUND_KEYS)
+
+
+def plan_waves(performs: List[Obj], actions: Obj) -> List[List[int]]:
+  '''Perform indices grouped into waves; each perform runs in the wave after the last one it depends on'''
+  prints = [footprint(perform, actions) for perform in performs]
+  levels = []
+  for index, later in enumerate(prints):
+    levels.append(max((levels[i] + 1 for i in range(index) if depends(prints[i], later)), default=0))
+  return [[i for i, level in enumerate(levels) if level == wave] for wave in range(max(levels, default=-1) + 1)]
+
+
+def _union(prints: List[Footprint]) -> Footprint:
+  return Footprint(frozenset().union(*(p.reads for p in prints)), frozenset().union(*(p.writes for p in prints)),
+                   any(p.barrier for p in prints))
@@ -0,0 +1,184 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Any, List, Optional
+
+THROTTLED_STATUSES = (429, 503)
+DEFAULT_PENALTY = 1.0
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+  '''Seconds to wait from a Retry-After header, given as delay-seconds or an HTTP date.'''
+  if not value:
+    return None
+  try:
+    return max(float(value), 0.0)
+  except ValueError:
+    pass
+  try:
+    return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+  except (TypeError, ValueError):
+    return None
+
+
+class RateLimiter:
+  '''Token bucket plus concurrency cap for one supplier server, shared by threads and the async loop.
+
+  `rps` tokens are added per second up to `burst`; each request takes one, waiting for it when the
+  bucket is empty. `max_concurrency` caps the requests in flight. A throttled response pauses every
+  caller until its Retry-After has passed.
+  '''
+
+  def __init__(self, rps: float = None, burst: int = None, max_concurrency: int = None):
+    self.rps = float(rps) if rps else None
+    self.burst = float(burst or max(self.rps or 1, 1))
+    self.max_concurrency = int(max_concurrency) if max_concurrency else None
+    self.tokens = self.burst
+    self.updated = time.monotonic()
+    self.blocked_until = 0.0
+    self.in_flight = 0
+    self.waited = 0.0
+    self.throttled = 0
+    self._waiters = deque()
+    self._lock = threading.Lock()
+
+  @classmethod
+  def from_config(cls, config: Any) -> 'RateLimiter':
+    options = config.to_dict() if hasattr(config, 'to_dict') else dict(config)
+    return cls(options.get('rps'), options.get('burst'), options.get('max_concurrency'))
+
+  def acquire(self):
+    self._pause()
+    waiter = threading.Event()
+    if not self._enter(waiter):
+      waiter.wait()
+      # A throttled response may have arrived while queued for the slot
+      while (wait := self._blocked_for()) > 0:
+        time.sleep(wait)
+
+  async def acquire_async(self):
+    await self._pause_async()
+    loop = asyncio.get_running_loop()
+    waiter = (loop, loop.create_future())
+    if self._enter(waiter):
+      return
+    try:
+      await waiter[1]
+      while (wait := self._blocked_for()) > 0:
+        await asyncio.sleep(wait)
+    except asyncio.CancelledError:
+      with self._lock:
+        queued = waiter in self._waiters
+        if queued:
+          self._waiters.remove(waiter)
+      # A slot handed over before the cancellation is passed on
+      if not queued and waiter[1].done() and not waiter[1].cancelled():
+        self.release()
+      raise
+
+  def release(self):
+    if self.max_concurrency is None:
+      return
+    with self._lock:
+      waiter = self._waiters.popleft() if self._waiters else None
+      if waiter is None:
+        self.in_flight -= 1
+        return
+    # The slot passes straight to the next waiter
+    if isinstance(waiter, threading.Event):
+      waiter.set()
+    else:
+      loop, future = waiter
+      loop.call_soon_threadsafe(self._wake, future)
+
+  def observe(self, status_code: int, headers: Any):
+    '''Pause the bucket when the server says it is throttling us.'''
+    if status_code not in THROTTLED_STATUSES:
+      return
+    delay = retry_after_seconds(headers.get('Retry-After'))
+    if delay is None and status_code != 429:
+      return
+    with self._lock:
+      self.throttled += 1
+      self.blocked_until = max(self.blocked_until, time.monotonic() + (DEFAULT_PENALTY if delay is None else delay))
+
+  def stats(self) -> dict:
+    return {'rps': self.rps, 'burst': self.burst, 'max_concurrency': self.max_concurrency,
+            'in_flight': self.in_flight, 'waited': self.waited, 'throttled': self.throttled}
+
+  def __enter__(self):
+    self.acquire()
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    self.release()
+
+  def _reserve(self) -> float:
+    '''Take a token now or book the next one; returns how long to wait for it.'''
+    with self._lock:
+      now = time.monotonic()
+      if self.rps is None:
+        wait = 0.0
+      else:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rps)
+        self.updated = now
+        self.tokens -= 1
+        wait = max(-self.tokens / self.rps, 0.0)
+      wait = max(wait, self.blocked_until - now)
+      self.waited += wait
+      return wait
+
+  def _blocked_for(self) -> float:
+    return self.blocked_until - time.monotonic()
+
+  def _pause(self):
+    wait = self._reserve()
+    while wait > 0:
+      time.sleep(wait)
+      wait = self._blocked_for()
+
+  async def _pause_async(self):
+    wait = self._reserve()
+    while wait > 0:
+      await asyncio.sleep(wait)
+      wait = self._blocked_for()
+
+  def _enter(self, waiter: Any) -> bool:
+    if self.max_concurrency is None:
+      return True
+    with self._lock:
+      if self.in_flight < self.max_concurrency and not self._waiters:
+        self.in_flight += 1
+        return True
+      self._waiters.append(waiter)
+      return False
+
+  def _wake(self, future: asyncio.Future):
+    if future.cancelled():
+      self.release()
+    else:
+      future.set_result(None)
+
+
+class RateLimits:
+  '''Rate limiters of the `supplier_servers` entries declaring a `rate_limit` block, matched by url prefix.'''
+
+  def __init__(self, limiters: List[tuple] = None):
+    self.limiters = sorted(limiters or [], key=lambda entry: len(entry[0]), reverse=True)
+
+  @classmethod
+  def from_servers(cls, servers: List[Any]) -> 'RateLimits':
+    return cls([(server.url.rstrip('/').lower(), RateLimiter.from_config(server.rate_limit))
+                for server in servers or [] if server.get('rate_limit')])
+
+  def for_url(self, url: str) -> Optional[RateLimiter]:
+    url = url.lower()
+    return next((limiter for prefix, limiter in self.limiters if url.startswith(prefix)), None)
+
+  def stats(self) -> dict:
+    return {prefix: limiter.stats() for prefix, limiter in self.limiters}
+
+  def __bool__(self) -> bool:
+    return bool(self.limiters)
@@ -0,0 +1,197 @@
+import base64
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+DEFAULT_TTL = 60
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+CACHEABLE_METHODS = ('GET', 'HEAD')
+# Always part of the key, so one caller's credentials never serve another's response
+CREDENTIAL_HEADERS = ('Authorization', 'Cookie')
+
+
+class CachedResponse:
+  '''A stored response with its expiry and the validators used to revalidate it once stale.'''
+
+  __slots__ = ('status_code', 'headers', 'content', 'url', 'encoding', 'elapsed', 'expires_at')
+  STORED = ('status_code', 'headers', 'url', 'encoding', 'elapsed', 'expires_at')
+
+  def __init__(self, response: requests.Response, ttl: float):
+    self.status_code = response.status_code
+    self.headers = dict(response.headers)
+    self.content = response.content
+    self.url = response.url
+    self.encoding = response.encoding
+    self.elapsed = response.elapsed.total_seconds() if response.elapsed else 0.0
+    self.expires_at = time.time() + ttl
+
+  @classmethod
+  def from_dict(cls, data: dict) -> 'CachedResponse':
+    entry = cls.__new__(cls)
+    for name in cls.STORED:
+      setattr(entry, name, data[name])
+    entry.content = base64.b64decode(data['content'])
+    return entry
+
+  def to_dict(self) -> dict:
+    '''JSON-safe form written to disk; the body is base64 encoded'''
+    return {**{name: getattr(self, name) for name in self.STORED},
+            'content': base64.b64encode(self.content or b'').decode('ascii')}
+
+  @property
+  def size(self) -> int:
+    return len(self.content or b'')
+
+  def is_fresh(self) -> bool:
+    return time.time() < self.expires_at
+
+  def validators(self) -> dict:
+    headers = CaseInsensitiveDict(self.headers)
+    return {name: headers[source] for name, source in (('If-None-Match', 'ETag'),
+                                                       ('If-Modified-Since', 'Last-Modified')) if source in headers}
+
+  def refresh(self, ttl: float, headers: Any):
+    self.expires_at = time.time() + ttl
+    self.headers.update({k: v for k, v in headers.items() if k.lower() in ('etag', 'last-modified', 'date')})
+
+  def to_response(self, state: str) -> requests.Response:
+    response = requests.Response()
+    response.status_code = self.status_code
+    response.headers = CaseInsensitiveDict({**self.headers, 'X-Cache': state})
+    response._content = self.content
+    response._content_consumed = True
+    response.url = self.url
+    response.encoding = self.encoding
+    return response
+
+
+class ResponseCache:
+  '''Opt-in cache of GET responses keyed on method, rendered url, query, credentials and the `vary` headers.
+
+  Entries live in an in-memory LRU capped at `max_bytes` of bodies and, with `path`, are also written
+  to disk so a later run starts warm. A stale entry carrying an ETag or Last-Modified is revalidated
+  with a conditional request; a 304 refreshes it without downloading the body again.
+  '''
+
+  def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, ttl: float = DEFAULT_TTL, path: str = None):
+    self.max_bytes = int(max_bytes)
+    self.ttl = ttl
+    self.path = Path(path) if path else None
+    self.entries = OrderedDict()
+    self.bytes = 0
+    self.counters = dict.fromkeys(('hits', 'misses', 'revalidated', 'stores', 'evictions'), 0)
+    self.saved_seconds = 0.0
+    self._lock = threading.Lock()
+    if self.path:
+      self.path.mkdir(parents=True, exist_ok=True)
+
+  @classmethod
+  def from_config(cls, config: Any) -> 'ResponseCache':
+    options = config.to_dict() if hasattr(config, 'to_dict') else {}
+    return cls(options.get('max_bytes', DEFAULT_MAX_BYTES), options.get('ttl', DEFAULT_TTL), options.get('path'))
+
+  def fetch(self, method: str, url: str, query: dict, headers: dict, options: dict,
+            send: Callable[[dict], requests.Response]) -> requests.Response:
+    '''Serve a fresh entry, revalidate a stale one, or `send` (given extra request headers) and store the result.'''
+    key = self.key(method, url, query, headers, options.get('vary', ()))
+    ttl = options.get('ttl', self.ttl)
+    entry = self._lookup(key)
+    if entry is not None and entry.is_fresh():
+      return self._serve(entry, 'HIT')
+    response = send(entry.validators() if entry is not None else {})
+    if entry is not None and response.status_code == 304:
+      entry.refresh(ttl, response.headers)
+      self._persist(key, entry)
+      self._count('revalidated')
+      return self._serve(entry, 'REVALIDATED')
+    self._count('misses')
+    if self._storable(response):
+      self.store(key, CachedResponse(response, ttl))
+    return response
+
+  def key(self, method: str, url: str, query: dict, headers: dict, vary: Iterable[str] = ()) -> str:
+    headers = CaseInsensitiveDict(headers or {})
+    names = sorted({name.lower() for name in (*vary, *CREDENTIAL_HEADERS)})
+    parts = [method.upper(), url, *sorted(f'{k}={v}' for k, v in (query or {}).items()),
+             *(f'{name}:{headers.get(name, "")}' for name in names)]
+    return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()
+
+  def store(self, key: str, entry: CachedResponse):
+    if entry.size > self.max_bytes:
+      return
+    self._remember(key, entry)
+    self._count('stores')
+    self._persist(key, entry)
+
+  def stats(self) -> dict:
+    lookups = self.counters['hits'] + self.counters['misses'] + self.counters['revalidated']
+    return {
+      **self.counters,
+      'hit_ratio': (self.counters['hits'] + self.counters['revalidated']) / lookups if lookups else 0.0,
+      'saved_seconds': self.saved_seconds,
+      'entries': len(self.entries),
+      'bytes': self.bytes,
+    }
+
+  def _lookup(self, key: str) -> Optional[CachedResponse]:
+    with self._lock:
+      entry = self.entries.get(key)
+      if entry is not None:
+        self.entries.move_to_end(key)
+        return entry
+    entry = self._load(key)
+    if entry is not None and entry.size <= self.max_bytes:
+      self._remember(key, entry)
+    return entry
+
+  def _remember(self, key: str, entry: CachedResponse):
+    with self._lock:
+      previous = self.entries.pop(key, None)
+      self.bytes += entry.size - (previous.size if previous else 0)
+      self.entries[key] = entry
+      while self.bytes > self.max_bytes:
+        _, evicted = self.entries.popitem(last=False)
+        self.bytes -= evicted.size
+        self.counters['evictions'] += 1
+
+  def _serve(self, entry: CachedResponse, state: str) -> requests.Response:
+    if state == 'HIT':
+      with self._lock:
+        self.counters['hits'] += 1
+        self.saved_seconds += entry.elapsed
+    logging.info(f'Cache {state} {entry.url}')
+    return entry.to_response(state)
+
+  def _storable(self, response: requests.Response) -> bool:
+    return response.status_code == 200 and 'no-store' not in response.headers.get('Cache-Control', '')
+
+  def _count(self, counter: str):
+    with self._lock:
+      self.counters[counter] += 1
+
+  def _file(self, key: str) -> Path:
+    return self.path / f'{key}.json'
+
+  def _persist(self, key: str, entry: CachedResponse):
+    if not self.path:
+      return
+    temporary = self._file(key).with_suffix(f'.{threading.get_ident()}.tmp')
+    temporary.write_text(json.dumps(entry.to_dict()), encoding='utf-8')
+    os.replace(temporary, self._file(key))
+
+  def _load(self, key: str) -> Optional[CachedResponse]:
+    if not self.path or not self._file(key).exists():
+      return None
+    try:
+      return CachedResponse.from_dict(json.loads(self._file(key).read_text(encoding='utf-8')))
+    except (OSError, ValueError, KeyError, TypeError):
+      return None
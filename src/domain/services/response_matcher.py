@@ -0,0 +1,106 @@
+import builtins
+import re
+from functools import lru_cache
+from typing import Any, Callable, Tuple, Union
+
+from src.domain.value_objects.obj_utils import Obj
+
+Check = Callable[[Any], bool]
+
+
+def _search(pattern: re.Pattern) -> Check:
+  return lambda r: pattern.search(r.body) is not None
+
+
+def _is_type(kind: Union[type, Tuple[type, ...]]) -> Check:
+  return lambda r: isinstance(r.document.data, kind)
+
+# Cost tiers: status line, decoded body size, body scans, parsed document
+CONDITIONS = {
+  'code': (0, lambda v: lambda r: r.status_code == v),
+  'has_value': (1, lambda v: lambda r: bool(r.body) == v),
+  'is_empty': (1, lambda v: (lambda r: len(r.body) == 0) if v else (lambda r: len(r.body) > 0)),
+  'is_null': (1, lambda v: (lambda r: r.body == 'null') if v else (lambda r: r.body != 'null')),
+  'length': (1, lambda v: lambda r: len(r.body) == v),
+  'length_gt': (1, lambda v: lambda r: len(r.body) > v),
+  'length_lt': (1, lambda v: lambda r: len(r.body) < v),
+  'length_gte': (1, lambda v: lambda r: len(r.body) >= v),
+  'length_lte': (1, lambda v: lambda r: len(r.body) <= v),
+  'contains': (2, lambda v: lambda r: v in r.body),
+  'matches': (3, lambda v: _search(re.compile(v))),
+  'has_key': (4, lambda v: lambda r: v in r.document.data),
+  'has_keys': (4, lambda v: lambda r: all(key in r.document.data for key in v)),
+  'is_type': (4, lambda v: _is_type(resolve_type(v))),
+}
+UNKNOWN_CONDITION = (0, lambda v: lambda r: False)
+CONDITION_BLOCKS = ('is_success', 'is_error')
+
+
+def resolve_type(name: Union[str, list, tuple]) -> Union[type, Tuple[type, ...]]:
+  '''Maps an `is_type` value ('dict', 'list', ['int', 'float'], ...) to builtin type objects.'''
+  if isinstance(name, (list, tuple)):
+    return tuple(resolve_type(item) for item in name)
+  kind = type(None) if name in ('None', 'NoneType') else getattr(builtins, str(name), None)
+  if not isinstance(kind, type):
+    raise ValueError(f'Unknown response type: {name}')
+  return kind
+
+
+class ResponseMatcher:
+  '''A response condition block compiled into checks ordered cheapest first.
+
+  `matches` short-circuits, so a failing status code decides without the body being decoded.
+  '''
+  __slots__ = ('checks',)
+
+  def __init__(self, conditions: Tuple[Tuple[str, Any], ...]):
+    compiled = [(CONDITIONS.get(name, UNKNOWN_CONDITION), value) for name, value in conditions]
+    self.checks = tuple(factory(value) for (_, factory), value in sorted(compiled, key=lambda item: item[0][0]))
+
+  def matches(self, response: Any) -> bool:
+    return all(check(response) for check in self.checks)
+
+
+def _freeze(value: Any) -> Any:
+  if isinstance(value, Obj):
+    value = value.to_dict()
+  if isinstance(value, list):
+    return tuple(_freeze(item) for item in value)
+  if isinstance(value, dict):
+    return tuple((key, _freeze(item)) for key, item in value.items())
+  return value
+
+
+@lru_cache(maxsize=4096)
+def _compile(conditions: Tuple[Tuple[str, Any], ...]) -> ResponseMatcher:
+  return ResponseMatcher(conditions)
+
+
+class ConditionBlock(dict):
+  '''An is_success/is_error block of a loaded configuration, carrying its compiled matcher'''
+  __slots__ = ('matcher',)
+
+  def __init__(self, conditions: dict):
+    super().__init__(conditions)
+    self.matcher = compile_matcher(conditions)
+
+
+def compile_matcher(conditions: Union[Obj, dict]) -> ResponseMatcher:
+  return _compile(_freeze(conditions))
+
+
+def matcher_for(conditions: Union[Obj, dict]) -> ResponseMatcher:
+  '''The matcher precompile_matchers attached to a block; blocks built at runtime are compiled here'''
+  return conditions.matcher if isinstance(conditions, ConditionBlock) else compile_matcher(conditions)
+
+
+def precompile_matchers(data: Any):
+  '''Swap every is_success/is_error block of a loaded configuration, in place, for its ConditionBlock'''
+  pairs = iter(data) if isinstance(data, Obj) else data.items() if isinstance(data, dict) else ()
+  for key, value in list(pairs):
+    if key in CONDITION_BLOCKS and isinstance(value, dict) and not isinstance(value, ConditionBlock):
+      data[key] = ConditionBlock(value)
+    else:
+      precompile_matchers(value)
+  for value in data if isinstance(data, list) else ():
+    precompile_matchers(value)
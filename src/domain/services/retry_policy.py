@@ -0,0 +1,208 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Optional
+
+import aiohttp
+import requests
+
+from src.domain.services.rate_limiter import retry_after_seconds
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_EXCEPTIONS = {
+  'connection': (requests.ConnectionError, aiohttp.ClientConnectionError, ConnectionError),
+  'timeout': (requests.Timeout, asyncio.TimeoutError, TimeoutError),
+  'any': (Exception,),
+}
+JITTERS = {
+  'full': lambda delay: random.uniform(0, delay),
+  'equal': lambda delay: delay / 2 + random.uniform(0, delay / 2),
+  'none': lambda delay: delay,
+}
+
+
+class RetryBudget:
+  '''Caps retries to `ratio` of the requests made (plus `minimum`), so a failing supplier is not hammered.'''
+
+  def __init__(self, ratio: float = None, minimum: int = 10):
+    self.ratio = ratio
+    self.minimum = minimum
+    self.requests = 0
+    self.retries = 0
+    self._lock = threading.Lock()
+
+  def deposit(self):
+    with self._lock:
+      self.requests += 1
+
+  def withdraw(self) -> bool:
+    with self._lock:
+      if self.ratio is not None and self.retries >= self.minimum + self.ratio * self.requests:
+        return False
+      self.retries += 1
+      return True
+
+
+class RetryScheduler:
+  '''One daemon thread running delayed calls, so a retry waiting for its backoff holds no pool worker.'''
+
+  def __init__(self):
+    self._queue = []
+    self._order = itertools.count()
+    self._condition = threading.Condition()
+    self._thread = None
+
+  def call_later(self, delay: float, call: Callable[[], None]):
+    with self._condition:
+      heapq.heappush(self._queue, (time.monotonic() + delay, next(self._order), call))
+      if self._thread is None:
+        self._thread = threading.Thread(target=self._run, name='retry-scheduler', daemon=True)
+        self._thread.start()
+      self._condition.notify()
+
+  def _run(self):
+    while True:
+      with self._condition:
+        while not self._queue or self._queue[0][0] > time.monotonic():
+          self._condition.wait(self._queue[0][0] - time.monotonic() if self._queue else None)
+        _, _, call = heapq.heappop(self._queue)
+      try:
+        call()
+      except Exception:
+        logging.exception('Scheduled retry failed')
+
+
+SCHEDULER = RetryScheduler()
+
+
+class RetryPolicy:
+  '''Exponential backoff with jitter for requests failing with a retryable status or exception.
+
+  `attempts` counts the first try; the n-th retry waits `backoff * multiplier ** n` seconds (capped
+  at `max_delay`, jittered), or the response's Retry-After when that is longer. `run` retries in
+  the calling thread, `run_async` on the event loop, and `submit` reschedules pool work from a
+  timer thread instead of sleeping in a worker.
+  '''
+
+  def __init__(self, attempts: int = 3, backoff: float = 0.5, multiplier: float = 2, max_delay: float = 30,
+               jitter: str = 'full', on_status: Any = RETRY_STATUSES, on_exception: Any = ('connection', 'timeout'),
+               budget: float = None):
+    if jitter not in JITTERS:
+      raise ValueError(f"Unknown retry jitter '{jitter}'")
+    self.attempts = max(int(attempts), 1)
+    self.backoff = float(backoff)
+    self.multiplier = float(multiplier)
+    self.max_delay = float(max_delay)
+    self.jitter = JITTERS[jitter]
+    self.on_status = frozenset(int(status) for status in on_status)
+    self.on_exception = tuple(error for name in on_exception for error in self._exceptions(name))
+    self.budget = RetryBudget(float(budget) if budget is not None else None)
+
+  @classmethod
+  def from_config(cls, config: Any) -> 'RetryPolicy':
+    '''`retry: <attempts>` or a block of the constructor's options; `trials` (retries) and `delay` also read.
+
+    `delay` is a fixed wait: no growth or jitter unless `multiplier` or `jitter` are given as well.
+    '''
+    if config is True:
+      return cls()
+    if not isinstance(config, dict):
+      return cls(attempts=int(config))
+    options = dict(config)
+    if 'trials' in options:
+      options['attempts'] = int(options.pop('trials')) + 1
+    if 'delay' in options:
+      options = {'multiplier': 1, 'jitter': 'none', **options}
+      options['backoff'] = options.pop('delay')
+    return cls(**options)
+
+  def should_retry(self, attempt: int, response: Any = None, error: BaseException = None) -> bool:
+    if attempt + 1 >= self.attempts:
+      return False
+    retryable = isinstance(error, self.on_exception) if error is not None else response.status_code in self.on_status
+    return retryable and self.budget.withdraw()
+
+  def delay(self, attempt: int, response: Any = None) -> float:
+    delay = self.jitter(min(self.backoff * self.multiplier ** attempt, self.max_delay))
+    retry_after = retry_after_seconds(response.headers.get('Retry-After')) if response is not None else None
+    return max(delay, retry_after or 0.0)
+
+  def run(self, call: Callable[[], Any]) -> Any:
+    self.budget.deposit()
+    for attempt in itertools.count():
+      response, error = self._outcome(call)
+      if not self.should_retry(attempt, response, error):
+        return self._result(response, error)
+      self._discard(response, error, attempt)
+      time.sleep(self.delay(attempt, response))
+
+  async def run_async(self, call: Callable[[], Awaitable[Any]]) -> Any:
+    self.budget.deposit()
+    for attempt in itertools.count():
+      try:
+        response, error = await call(), None
+      except Exception as exc:
+        response, error = None, exc
+      if not self.should_retry(attempt, response, error):
+        return self._result(response, error)
+      self._discard(response, error, attempt)
+      await asyncio.sleep(self.delay(attempt, response))
+
+  def submit(self, submit_once: Callable[[], Future], scheduler: RetryScheduler = SCHEDULER) -> Future:
+    '''Future of the final outcome; each retry is resubmitted by the scheduler once its delay has passed.'''
+    outcome = Future()
+    self.budget.deposit()
+
+    def attempt(number: int):
+      try:
+        submit_once().add_done_callback(lambda future: completed(future, number))
+      except Exception as error:
+        outcome.set_exception(error)
+
+    def completed(future: Future, number: int):
+      error = future.exception()
+      response = None if error else future.result()
+      if not self.should_retry(number, response, error):
+        if error is not None:
+          outcome.set_exception(error)
+        else:
+          outcome.set_result(response)
+        return
+      self._discard(response, error, number)
+      scheduler.call_later(self.delay(number, response), lambda: attempt(number + 1))
+
+    attempt(0)
+    return outcome
+
+  @staticmethod
+  def _exceptions(name: str) -> tuple:
+    if name not in RETRY_EXCEPTIONS:
+      raise ValueError(f"Unknown retry exception class '{name}'")
+    return RETRY_EXCEPTIONS[name]
+
+  @staticmethod
+  def _outcome(call: Callable[[], Any]) -> tuple:
+    try:
+      return call(), None
+    except Exception as error:
+      return None, error
+
+  @staticmethod
+  def _result(response: Any, error: Optional[BaseException]) -> Any:
+    if error is not None:
+      raise error
+    return response
+
+  @staticmethod
+  def _discard(response: Any, error: Optional[BaseException], attempt: int):
+    reason = f'[{response.status_code}]' if response is not None else repr(error)
+    logging.warning(f'Retrying after {reason} (attempt {attempt + 1})')
+    # An unread streamed body still holds its connection
+    stream = getattr(response, 'stream', None)
+    if stream is not None:
+      stream.close()
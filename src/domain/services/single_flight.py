@@ -0,0 +1,68 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+
+def flight_key(method: str, url: str, query: dict = None, headers: dict = None, body: Any = None) -> Optional[tuple]:
+  '''Identity of a request for coalescing; None for bodies that can only be sent once (files, streams).'''
+  if body is not None and not isinstance(body, (str, bytes)):
+    return None
+  return (method.upper(), url, tuple(sorted((k, str(v)) for k, v in (query or {}).items())),
+          tuple(sorted((k, str(v)) for k, v in (headers or {}).items())), body)
+
+
+class SingleFlight:
+  '''Shares one in-flight call among the concurrent callers asking for the same key.
+
+  The first caller (the leader) runs the call; callers arriving while it is in flight wait for it
+  and receive the same result or exception. Nothing is kept once the call completes, so a later
+  caller always triggers a new call. `do` serves threads, `do_async` coroutines on one event loop.
+  '''
+
+  def __init__(self):
+    self.calls = 0
+    self.coalesced = 0
+    self._flights = {}
+    self._tasks = {}
+    self._lock = threading.Lock()
+
+  def do(self, key: Optional[Hashable], call: Callable[[], Any]) -> Any:
+    if key is None:
+      return call()
+    with self._lock:
+      flight = self._flights.get(key)
+      leader = flight is None
+      if leader:
+        flight = self._flights[key] = Future()
+        self.calls += 1
+      else:
+        self.coalesced += 1
+    if not leader:
+      return flight.result()
+    try:
+      result = call()
+      flight.set_result(result)
+      return result
+    except BaseException as error:
+      flight.set_exception(error)
+      raise
+    finally:
+      with self._lock:
+        del self._flights[key]
+
+  async def do_async(self, key: Optional[Hashable], call: Callable[[], Awaitable[Any]]) -> Any:
+    if key is None:
+      return await call()
+    task = self._tasks.get(key)
+    if task is None:
+      task = self._tasks[key] = asyncio.ensure_future(call())
+      task.add_done_callback(lambda _: self._tasks.pop(key, None))
+      self.calls += 1
+    else:
+      self.coalesced += 1
+    # A cancelled waiter must not cancel the call the others are waiting on
+    return await asyncio.shield(task)
+
+  def stats(self) -> dict:
+    return {'calls': self.calls, 'coalesced': self.coalesced, 'in_flight': len(self._flights) + len(self._tasks)}
@@ -0,0 +1,134 @@
+import codecs
+import json
+import re
+import xml.etree.ElementTree as ET
+from typing import Any, Iterable, Iterator, List, Optional
+
+from src.domain.value_objects.api_response import element_to_dict
+
+_SEPARATORS = re.compile(r'[\s,]*')
+_WHITESPACE = re.compile(r'\s*')
+_DECODER = json.JSONDecoder()
+_DELIMITERS = frozenset(',]} \t\r\n')
+
+
+def iter_items(chunks: Iterable[bytes], selector: str, encoding: str = None) -> Iterator[Any]:
+  '''Elements of a response body, parsed as the chunks arrive.
+
+  A selector ending in `[]` (`json[]`, `data[]`, `json.data.items[]`) yields the elements of that JSON
+  array; any other selector (`Producto`, `xml.Producto`) yields every XML element with that tag.
+  '''
+  if selector.endswith('[]'):
+    return iter_json_items(chunks, selector, encoding)
+  return iter_xml_elements(chunks, selector)
+
+
+def iter_json_items(chunks: Iterable[bytes], path: str, encoding: str = None) -> Iterator[Any]:
+  scanner = _JsonScanner(chunks, encoding or 'utf-8-sig')
+  if scanner.seek(_json_path(path)):
+    yield from scanner.items()
+
+
+def iter_xml_elements(chunks: Iterable[bytes], tag: str) -> Iterator[Any]:
+  local = tag.removeprefix('xml.').split(':')[-1]
+  parser = ET.XMLPullParser(events=('start-ns', 'start', 'end'))
+  prefixes, parents = {}, []
+
+  def drain():
+    for event, payload in parser.read_events():
+      if event == 'start-ns':
+        prefixes.setdefault(payload[1], payload[0])
+      elif event == 'start':
+        parents.append(payload)
+      else:
+        parents.pop()
+        if payload.tag.rsplit('}', 1)[-1] == local:
+          yield element_to_dict(payload, prefixes)
+          # Matched elements are dropped as they are consumed, so the tree never grows
+          if parents:
+            parents[-1].remove(payload)
+
+  for chunk in chunks:
+    parser.feed(chunk)
+    yield from drain()
+  parser.close()
+  yield from drain()
+
+
+def _json_path(path: str) -> List[str]:
+  keys = [key for key in path[:-2].split('.') if key]
+  return keys[1:] if keys and keys[0] in ('json', 'body') else keys
+
+
+class _JsonScanner:
+  '''Walks a JSON text chunk by chunk up to one array, then decodes its elements one at a time.'''
+
+  def __init__(self, chunks: Iterable[bytes], encoding: str):
+    self._chunks = iter(chunks)
+    self._decoder = codecs.getincrementaldecoder(encoding)()
+    self.buffer = ''
+    self.pos = 0
+    self.eof = False
+
+  def more(self) -> bool:
+    if self.eof:
+      return False
+    chunk = next(self._chunks, None)
+    text = self._decoder.decode(b'' if chunk is None else chunk, final=chunk is None)
+    self.eof = chunk is None
+    self.buffer, self.pos = self.buffer[self.pos:] + text, 0
+    return True
+
+  def peek(self, skip: re.Pattern = _WHITESPACE) -> Optional[str]:
+    while True:
+      self.pos = skip.match(self.buffer, self.pos).end()
+      if self.pos < len(self.buffer):
+        return self.buffer[self.pos]
+      if not self.more():
+        return None
+
+  def seek(self, target: List[str]) -> bool:
+    # One entry per open container: [opening char, current key, expecting a key]
+    stack = []
+    while (char := self.peek()) is not None:
+      self.pos += 1
+      if char == '"':
+        text = self._string()
+        if stack and stack[-1][0] == '{' and stack[-1][2]:
+          stack[-1][1:] = [text, False]
+      elif char in '{[':
+        if char == '[' and all(kind == '{' for kind, _, _ in stack) and [key for _, key, _ in stack] == target:
+          return True
+        stack.append([char, None, char == '{'])
+      elif char in '}]':
+        stack.pop()
+      elif char == ',' and stack and stack[-1][0] == '{':
+        stack[-1][2] = True
+    return False
+
+  def items(self) -> Iterator[Any]:
+    while (char := self.peek(_SEPARATORS)) != ']':
+      if char is None:
+        raise ValueError('Unterminated JSON array in response')
+      try:
+        value, end = _DECODER.raw_decode(self.buffer, self.pos)
+      except json.JSONDecodeError:
+        if not self.more():
+          raise
+        continue
+      # A value ending with the buffer may be a truncated number or literal, and a number not followed by a
+      # delimiter may continue in the next chunk (`12.` then `5`)
+      truncated = end == len(self.buffer) or (type(value) in (int, float) and self.buffer[end] not in _DELIMITERS)
+      if truncated and self.more():
+        continue
+      self.pos = end
+      yield value
+
+  def _string(self) -> str:
+    while True:
+      try:
+        text, self.pos = json.decoder.scanstring(self.buffer, self.pos)
+        return text
+      except json.JSONDecodeError:
+        if not self.more():
+          raise
@@ -1,8 +1,57 @@
 import re
 import json
-from typing import Any, Union
+from functools import lru_cache
+from typing import Any, Callable, Union
 from src.domain.value_objects.obj_utils import Obj
 
+TEMPLATE_PATTERN = re.compile(r'\{\{(.+?)\}\}')
+
+
+class CompiledTemplate:
+    """A template string split once into literal segments and placeholder keys"""
+    __slots__ = ('source', 'literals', 'keys', 'whole_key')
+
+    def __init__(self, source: str):
+        parts = TEMPLATE_PATTERN.split(source)
+        self.source = source
+        self.literals = tuple(parts[0::2])
+        self.keys = tuple(key.strip() for key in parts[1::2])
+        # Set when the whole template is a single placeholder, so it can render to a native value
+        self.whole_key = self.keys[0] if len(self.keys) == 1 and self.literals == ('', '') else None
+
+    def render(self, lookup: Callable[[str], str]) -> str:
+        keys, literals = self.keys, self.literals
+        if not keys:
+            return self.source
+        if len(keys) == 1:
+            return literals[0] + lookup(keys[0]) + literals[1]
+        segments = [literals[0]]
+        for key, literal in zip(keys, literals[1:]):
+            segments.append(lookup(key))
+            segments.append(literal)
+        return ''.join(segments)
+
+
+@lru_cache(maxsize=8192)
+def compile_template(source: str) -> CompiledTemplate:
+    return CompiledTemplate(source)
+
+
+def precompile_templates(data: Any):
+    """Compile every template string of a loaded configuration ahead of rendering"""
+    if isinstance(data, Obj):
+        data = data.to_dict()
+    if isinstance(data, str):
+        if '{{' in data:
+            compile_template(data)
+    elif isinstance(data, dict):
+        for value in data.values():
+            precompile_templates(value)
+    elif isinstance(data, list):
+        for value in data:
+            precompile_templates(value)
+
+
 class TemplateEngine:
     def __init__(self, vars_connector, response_handler):
         self.vars_connector = vars_connector
@@ -18,11 +67,7 @@ class TemplateEngine:
         return template
         
     def _render_string(self, template: str, params: Obj) -> str:
-        return re.sub(
-            r'\{\{(.+?)\}\}',
-            lambda m: self._get_value(m.group(1).strip(), params),
-            template
-        )
+        return compile_template(template).render(lambda key: self._get_value(key, params))
         
     def _get_value(self, key: str, params: Obj) -> str:
         if key.startswith('response.'):
@@ -0,0 +1,211 @@
+import asyncio
+import heapq
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Set
+
+from src.domain.value_objects.obj_utils import Obj
+from src.domain.value_objects.workflow_result import WorkflowResult
+
+
+class WorkflowScheduler:
+  '''Runs named nodes (actions) of a dependency DAG, each as soon as everything it depends on succeeded.
+
+  At most `concurrency` nodes run at once, on a thread pool (`run`) or as tasks (`run_async`). When
+  more nodes are ready than slots, the ones heading the longest chain go first, so the run tracks the
+  critical path. A failed node skips its dependents while independent branches carry on, unless
+  `fail_fast` stops scheduling; `cancel()` does the same from outside. With `state_path` completed
+  nodes are recorded as they finish, and a run with `resume` skips them.
+  '''
+
+  def __init__(self, dependencies: Dict[str, List[str]], concurrency: int = 4, state_path: str = None,
+               fail_fast: bool = False):
+    self.dependencies = {name: list(dict.fromkeys(deps)) for name, deps in dependencies.items()}
+    self.concurrency = max(int(concurrency), 1)
+    self.state_path = Path(state_path) if state_path else None
+    self.fail_fast = fail_fast
+    self.order = list(self.dependencies)
+    self.positions = {name: index for index, name in enumerate(self.order)}
+    self.dependents = self._dependents()
+    self.heights = self._heights()
+    self._cancelled = threading.Event()
+
+  @classmethod
+  def from_actions(cls, actions: Obj, names: List[str] = None, **options) -> 'WorkflowScheduler':
+    '''DAG of the named actions (all by default) and the actions they transitively `depends_on`'''
+    dependencies = {}
+    pending = list(names if names is not None else actions.keys())
+    while pending:
+      name = pending.pop(0)
+      if name in dependencies:
+        continue
+      if name not in actions:
+        raise ValueError(f"Workflow action '{name}' not found in config")
+      depends_on = actions[name].get('depends_on') or []
+      dependencies[name] = [depends_on] if isinstance(depends_on, str) else list(depends_on)
+      pending.extend(dependencies[name])
+    return cls(dependencies, **options)
+
+  def run(self, run_node: Callable[[str], Any], resume: bool = False) -> WorkflowResult:
+    result, remaining, ready = self._start(resume)
+    started = time.perf_counter()
+    running = {}
+    with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='workflow') as pool:
+      try:
+        while ready or running:
+          while ready and len(running) < self.concurrency and not self._cancelled.is_set():
+            name = heapq.heappop(ready)[2]
+            running[pool.submit(self._timed, run_node, name)] = name
+          if not running:
+            break
+          done, _ = wait(running, return_when=FIRST_COMPLETED)
+          for future in done:
+            self._settle(running.pop(future), future, result, remaining, ready)
+      except BaseException:
+        self.cancel()
+        for future in running:
+          future.cancel()
+        raise
+    return self._finish(result, started)
+
+  async def run_async(self, run_node: Callable[[str], Awaitable[Any]], resume: bool = False) -> WorkflowResult:
+    result, remaining, ready = self._start(resume)
+    started = time.perf_counter()
+    running = {}
+    try:
+      while ready or running:
+        while ready and len(running) < self.concurrency and not self._cancelled.is_set():
+          name = heapq.heappop(ready)[2]
+          running[asyncio.ensure_future(self._timed_async(run_node, name))] = name
+        if not running:
+          break
+        done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+          self._settle(running.pop(task), task, result, remaining, ready)
+    except asyncio.CancelledError:
+      self.cancel()
+      for task in running:
+        task.cancel()
+      await asyncio.gather(*running, return_exceptions=True)
+      for name in running.values():
+        result.record(name, 'cancelled')
+      raise
+    return self._finish(result, started)
+
+  def cancel(self):
+    '''Start no further nodes; nodes already running finish (threads) or are cancelled (tasks).'''
+    self._cancelled.set()
+
+  def critical_path(self, durations: Dict[str, float]) -> tuple:
+    '''Longest chain by the given durations, as (seconds, [names])'''
+    longest = {}
+    for name in self._topological():
+      seconds, path = max((longest[dep] for dep in self.dependencies[name]), default=(0.0, []))
+      longest[name] = (seconds + durations.get(name, 0.0), [*path, name])
+    return max(longest.values(), default=(0.0, []))
+
+  def _start(self, resume: bool) -> tuple:
+    self._cancelled.clear()
+    result = WorkflowResult(self.order)
+    completed = self._load() if resume else set()
+    for name in completed:
+      result.record(name, 'resumed')
+    if not resume:
+      self._persist(set())
+    remaining = {name: sum(dep not in completed for dep in deps) for name, deps in self.dependencies.items()}
+    ready = [self._entry(name) for name in self.order if remaining[name] == 0 and name not in completed]
+    heapq.heapify(ready)
+    return result, remaining, ready
+
+  def _settle(self, name: str, future: Any, result: WorkflowResult, remaining: Dict[str, int], ready: list):
+    if future.cancelled():
+      result.record(name, 'cancelled')
+      return
+    error = future.exception()
+    if error is not None:
+      logging.error(f'Workflow node {name} failed: {error}')
+      result.record(name, 'failed', error=error)
+      if self.fail_fast:
+        self.cancel()
+      return
+    result.record(name, 'succeeded', future.result())
+    self._persist(set(result.names('succeeded')) | set(result.names('resumed')))
+    for dependent in self.dependents[name]:
+      remaining[dependent] -= 1
+      if remaining[dependent] == 0:
+        heapq.heappush(ready, self._entry(dependent))
+
+  def _finish(self, result: WorkflowResult, started: float) -> WorkflowResult:
+    for name in self._topological():
+      if result.statuses[name] is None:
+        blocked = any(result.statuses[dep] in ('failed', 'skipped') for dep in self.dependencies[name])
+        result.record(name, 'skipped' if blocked else 'cancelled')
+    result.elapsed = time.perf_counter() - started
+    if result.succeeded and self.state_path and self.state_path.exists():
+      self.state_path.unlink()
+    logging.info(f'Workflow {result}')
+    return result
+
+  def _entry(self, name: str) -> tuple:
+    return -self.heights[name], self.positions[name], name
+
+  @staticmethod
+  def _timed(run_node: Callable[[str], Any], name: str) -> float:
+    started = time.perf_counter()
+    run_node(name)
+    return time.perf_counter() - started
+
+  @staticmethod
+  async def _timed_async(run_node: Callable[[str], Awaitable[Any]], name: str) -> float:
+    started = time.perf_counter()
+    await run_node(name)
+    return time.perf_counter() - started
+
+  def _dependents(self) -> Dict[str, List[str]]:
+    dependents = {name: [] for name in self.order}
+    for name, deps in self.dependencies.items():
+      for dep in deps:
+        if dep not in dependents:
+          raise ValueError(f"Workflow node '{name}' depends on unknown '{dep}'")
+        dependents[dep].append(name)
+    return dependents
+
+  def _topological(self) -> List[str]:
+    remaining = {name: len(deps) for name, deps in self.dependencies.items()}
+    queue = [name for name in self.order if remaining[name] == 0]
+    for name in queue:
+      for dependent in self.dependents[name]:
+        remaining[dependent] -= 1
+        if remaining[dependent] == 0:
+          queue.append(dependent)
+    if len(queue) != len(self.order):
+      raise ValueError(f"Workflow has a dependency cycle among {[n for n in self.order if remaining[n] > 0]}")
+    return queue
+
+  def _heights(self) -> Dict[str, int]:
+    heights = {}
+    for name in reversed(self._topological()):
+      heights[name] = 1 + max((heights[dependent] for dependent in self.dependents[name]), default=0)
+    return heights
+
+  def _load(self) -> Set[str]:
+    if not self.state_path or not self.state_path.exists():
+      return set()
+    try:
+      completed = json.loads(self.state_path.read_text())['completed']
+    except (OSError, ValueError, KeyError):
+      return set()
+    return {name for name in completed if name in self.dependencies}
+
+  def _persist(self, completed: Set[str]):
+    if not self.state_path:
+      return
+    self.state_path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = self.state_path.with_suffix(f'.{threading.get_ident()}.tmp')
+    temporary.write_text(json.dumps({'completed': sorted(completed)}))
+    os.replace(temporary, self.state_path)
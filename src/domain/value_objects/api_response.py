@@ -1,39 +1,172 @@
 import json
+import logging
+import re
 import xml.etree.ElementTree as ET
+from typing import Any, Dict, Iterator, Optional
 
 import requests
-import xmltodict
+
+from src.domain.value_objects.response_document import ResponseDocument
+from src.domain.value_objects.streamed_body import StreamedBody
+
+_UNSET = object()
+_NAMESPACE_DECLARATION = re.compile(rb'xmlns(?::([\w.-]+))?\s*=\s*["\']([^"\']*)["\']')
+
+
+def qualified_name(tag: str, prefixes: Dict[str, str]) -> str:
+  if not tag.startswith('{'):
+    return tag
+  uri, local = tag[1:].split('}', 1)
+  prefix = prefixes.get(uri)
+  return f'{prefix}:{local}' if prefix else local
+
+
+def element_to_dict(element: ET.Element, prefixes: Dict[str, str]) -> Any:
+  '''xmltodict layout of one element: @attributes, #text and repeated child tags as lists.'''
+  item = {f'@{qualified_name(key, prefixes)}': value for key, value in element.attrib.items()}
+  for child in element:
+    key, value = qualified_name(child.tag, prefixes), element_to_dict(child, prefixes)
+    if key not in item:
+      item[key] = value
+    elif isinstance(item[key], list):
+      item[key].append(value)
+    else:
+      item[key] = [item[key], value]
+  text = ''.join([element.text or '', *(child.tail or '' for child in element)]).strip()
+  if not item:
+    return text or None
+  if text:
+    item['#text'] = text
+  return item
+
+
+def _xml_to_dict(root: ET.Element, content: bytes) -> dict:
+  '''Derives the xmltodict layout from a parsed tree.
+
+  Prefixed tag names are restored from the document's declarations; the declarations themselves
+  are not repeated as @xmlns attributes.
+  '''
+  prefixes = {}
+  for prefix, uri in _NAMESPACE_DECLARATION.findall(content):
+    prefixes.setdefault(uri.decode(), prefix.decode())
+  return {qualified_name(root.tag, prefixes): element_to_dict(root, prefixes)}
 
 
 class ApiResponse:
-  def __init__(self, response: requests.Response):
+  '''Wraps a requests.Response, decoding and parsing the body on first access only.
+
+  `body`, `json` and `xml` are cached. An XML body is parsed once into an ElementTree; its
+  xmltodict-style `json` view is derived from that tree when asked for. A streamed response
+  (`stream`) keeps its body unread until one of those views is used; `each` is set when the
+  perform asked for its items to be parsed incrementally.
+  '''
+
+  __slots__ = ('response', 'stream', 'each', 'status_code', 'headers', 'url', 'request', 'encoding', 'cookies',
+               '_content_type', '_body', '_json', '_xml', '_document')
+
+  def __init__(self, response: requests.Response, stream: StreamedBody = None):
     self.response = response
+    self.stream = stream
     self.status_code = response.status_code
     self.headers = response.headers
     self.url = response.url
     self.request = response.request
     self.encoding = response.encoding
     self.cookies = response.cookies
-    self.body = response.text
-    self.json = None
-    self.xml = None
-    self._parse_content()
-
-  def _parse_content(self):
-    content_type = self.headers.get('Content-Type', '').lower()
-    if 'application/json' in content_type:
-      try:
-        self.json = self.response.json()
-      except json.JSONDecodeError:
-        pass
-    elif 'application/xml' in content_type or 'text/xml' in content_type:
+    self._content_type = self.headers.get('Content-Type', '').lower()
+    self._body = _UNSET
+    self._json = _UNSET
+    self._xml = _UNSET
+    self._document = None
+
+  @property
+  def body(self) -> str:
+    if self._body is _UNSET:
+      self._content()
+      self._body = self.response.text
+    return self._body
+
+  @property
+  def json(self) -> Any:
+    if self._json is _UNSET:
+      self._json = self._parse_json()
+    return self._json
+
+  @property
+  def xml(self) -> Optional[ET.Element]:
+    if self._xml is _UNSET:
+      self._xml = self._parse_xml()
+    return self._xml
+
+  @property
+  def document(self) -> ResponseDocument:
+    if self._document is None:
+      self._document = ResponseDocument(self._parse_document())
+    return self._document
+
+  def resolve(self, path: str) -> Any:
+    '''Value of `{{response.<path>}}`: a response attribute, else a memoised lookup in the parsed body.'''
+    if '.' not in path and hasattr(self, path):
+      return getattr(self, path)
+    return self.document.resolve(path)
+
+  def iter_content(self) -> Iterator[bytes]:
+    '''Body chunks: read from the stream while it is unread, else the loaded content.'''
+    if self.stream is not None and self.response._content is False:
+      yield from self.stream
+    else:
+      yield self._content()
+
+  def is_json(self) -> bool:
+    return 'application/json' in self._content_type
+
+  def is_xml(self) -> bool:
+    return 'application/xml' in self._content_type or 'text/xml' in self._content_type
+
+  def preview(self, limit: int = 200) -> str:
+    if self._body is not _UNSET:
+      return self._body[:limit]
+    if self.stream is not None and self.response._content is False:
+      return repr(self.stream)
+    return self._content()[:limit].decode(self.encoding or 'utf-8', errors='replace')
+
+  def _parse_json(self) -> Any:
+    if self.is_json():
       try:
-        self.xml = ET.fromstring(self.body)
-        self.json = xmltodict.parse(self.body)
-      except ET.ParseError:
-        pass
+        self._content()
+        return self.response.json()
+      except ValueError:
+        return None
+    if self.is_xml() and self.xml is not None:
+      return _xml_to_dict(self.xml, self._content())
+    return None
+
+  def _content(self) -> bytes:
+    if self.stream is not None and self.response._content is False:
+      self.response._content = self.stream.getvalue()
+      self.response._content_consumed = True
+    return self.response.content
+
+  def _parse_document(self) -> Any:
+    if self.json is not None:
+      return self.json
+    try:
+      return json.loads(self.body)
+    except ValueError:
+      logging.warning('Response body is not valid JSON')
+      return None
+
+  def _parse_xml(self) -> Optional[ET.Element]:
+    if not self.is_xml():
+      return None
+    try:
+      return ET.fromstring(self._content())
+    except ET.ParseError:
+      return None
 
   def __getattr__(self, name: str):
+    if name in ApiResponse.__slots__:
+      raise AttributeError(name)
     return getattr(self.response, name)
 
   def __str__(self) -> str:
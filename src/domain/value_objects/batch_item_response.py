@@ -0,0 +1,39 @@
+import json
+from typing import Any, List
+
+from src.domain.value_objects.response_document import ResponseDocument
+
+HTTP_STATUSES = range(100, 600)
+
+
+class BatchItemResponse:
+  '''Per-item view of one element of a batch endpoint's array response'''
+
+  def __init__(self, batch_response: Any, element: Any):
+    self.batch_response = batch_response
+    self.json = element
+    self.body = json.dumps(element)
+    status = element.get('status_code', element.get('status')) if isinstance(element, dict) else None
+    # Domain fields such as `status: 1` are not HTTP statuses
+    self.status_code = status if type(status) is int and status in HTTP_STATUSES else batch_response.status_code
+    self.document = ResponseDocument(element)
+
+  @classmethod
+  def split(cls, response: Any, count: int, wrapper: str = '') -> List[Any]:
+    '''One response per batched item: array elements when the endpoint echoes the batch, else the batch response'''
+    if response is None:
+      return [None] * count
+    elements = response.json
+    if wrapper and isinstance(elements, dict):
+      elements = elements.get(wrapper)
+    if isinstance(elements, list) and len(elements) == count:
+      return [cls(response, element) for element in elements]
+    return [response] * count
+
+  def resolve(self, path: str) -> Any:
+    if '.' not in path and hasattr(self, path):
+      return getattr(self, path)
+    return self.document.resolve(path)
+
+  def __getattr__(self, name: str):
+    return getattr(self.batch_response, name)
@@ -0,0 +1,82 @@
+import math
+from array import array
+from typing import Any, Dict, List, Optional
+
+
+class BulkResult:
+  '''Compact, order-preserving outcome of a bulk run.
+
+  Results are indexed by the item's original position: parallel arrays hold the status code
+  (0 when the request raised) and latency of every item, `ids` holds the optional item id,
+  and only failures keep a body.
+  '''
+
+  def __init__(self, id_field: str = None):
+    self.id_field = id_field
+    self.status_codes = array('H')
+    self.latencies = array('d')
+    self.ids: List[Any] = []
+    self.failures: Dict[int, dict] = {}
+    self.succeeded = 0
+    self.failed = 0
+    self._positions = None
+
+  @property
+  def total(self) -> int:
+    return self.succeeded + self.failed
+
+  def record(self, index: int, item: Any = None, response: Any = None, error: Exception = None):
+    self._reserve(index)
+    item_id = self._item_id(item)
+    if self.id_field:
+      self.ids[index] = item_id
+      self._positions = None
+    if response is not None:
+      self.status_codes[index] = response.status_code
+      elapsed = getattr(response, 'elapsed', None)
+      self.latencies[index] = elapsed.total_seconds() if elapsed is not None else math.nan
+    if error is None and response is not None and response.status_code < 400:
+      self.succeeded += 1
+      return
+    self.failed += 1
+    failure = {'error': str(error)} if error is not None else {'status_code': response.status_code, 'body': response.body}
+    self.failures[index] = {**failure, 'id': item_id} if self.id_field else failure
+
+  def __len__(self) -> int:
+    return len(self.status_codes)
+
+  def __getitem__(self, index: int) -> dict:
+    return {
+      'index': index,
+      'id': self.ids[index] if self.id_field else None,
+      'status_code': self.status_codes[index],
+      'latency': self.latencies[index],
+      'failure': self.failures.get(index),
+    }
+
+  def by_id(self, item_id: Any) -> Optional[dict]:
+    if self._positions is None:
+      self._positions = {value: index for index, value in enumerate(self.ids)}
+    index = self._positions.get(item_id)
+    return None if index is None else self[index]
+
+  def to_dict(self) -> dict:
+    return {'total': self.total, 'succeeded': self.succeeded, 'failed': self.failed, 'failures': self.failures}
+
+  def _reserve(self, index: int):
+    missing = index + 1 - len(self.status_codes)
+    if missing > 0:
+      self.status_codes.extend([0] * missing)
+      self.latencies.extend([math.nan] * missing)
+      if self.id_field:
+        self.ids.extend([None] * missing)
+
+  def _item_id(self, item: Any) -> Any:
+    if not self.id_field or item is None or not hasattr(item, 'get'):
+      return None
+    return item.get(self.id_field)
+
+  def __str__(self) -> str:
+    return f'BulkResult(total={self.total}, succeeded={self.succeeded}, failed={self.failed})'
+
+  __repr__ = __str__
@@ -0,0 +1,28 @@
+import json
+from typing import Any, Dict, List
+from urllib.parse import parse_qs
+
+
+class EndpointRequest:
+  '''Query string, body and path params of a call to a server-mode endpoint, whichever server got it.'''
+
+  __slots__ = ('query', 'body', 'path_params')
+
+  def __init__(self, query: Dict[str, List[str]] = None, body: bytes = b'', path_params: dict = None):
+    self.query = query or {}
+    self.body = body or b''
+    self.path_params = path_params or {}
+
+  @classmethod
+  def from_query_string(cls, query_string: bytes, body: bytes = b'', path_params: dict = None) -> 'EndpointRequest':
+    return cls(parse_qs(query_string.decode('latin-1'), keep_blank_values=True), body, path_params)
+
+  def query_params(self) -> dict:
+    '''Single values as text, repeated names as lists'''
+    return {name: values[0] if len(values) == 1 else values for name, values in self.query.items()}
+
+  def json(self) -> Any:
+    return json.loads(self.body) if self.body.strip() else None
+
+  def __repr__(self) -> str:
+    return f'EndpointRequest(query={self.query}, path_params={self.path_params}, body={len(self.body)} bytes)'
@@ -0,0 +1,59 @@
+from typing import Any, List
+
+from src.domain.value_objects.obj_utils import Obj
+
+
+class ExecutionContext:
+  '''State of one top-level action invocation and the nested actions it runs.
+
+  Concurrent invocations (server requests on different threads) each get their own context, so the
+  latest response, step counter, depth and invocation vars (`response`, `bulk_responses`) of one never
+  leak into another. Global `vars` stay on the integrator and are only changed through its locked merge.
+  A parallel branch runs on a fork, which also holds its global var writes until the branches are joined.
+  `request_params` are the params of a server-mode call, which take precedence over global vars.
+  '''
+
+  __slots__ = ('latest_response', 'action_number', 'action_depth', 'vars', 'performs', 'bound', 'writes',
+               'request_params')
+
+  def __init__(self):
+    self.latest_response: Any = None
+    self.action_number = 0
+    self.action_depth = 0
+    self.vars = Obj({})
+    self.performs: List[tuple] = []
+    self.bound = None
+    self.writes = None
+    self.request_params = None
+
+  def bind(self, values: dict):
+    self.vars.update(values)
+    if self.bound is not None:
+      self.bound.update(values)
+
+  def fork(self) -> 'ExecutionContext':
+    branch = ExecutionContext()
+    branch.latest_response = self.latest_response
+    branch.action_number = self.action_number
+    branch.action_depth = self.action_depth
+    branch.vars = Obj(dict(self.vars.to_dict()))
+    branch.performs = list(self.performs)
+    branch.bound = {}
+    branch.writes = {}
+    branch.request_params = self.request_params
+    return branch
+
+  def join(self, branches: List['ExecutionContext']) -> dict:
+    '''Merge finished forks in declaration order; returns their global var writes merged the same way.'''
+    base_response, base_number = self.latest_response, self.action_number
+    writes = {}
+    for branch in branches:
+      if branch.latest_response is not base_response:
+        self.latest_response = branch.latest_response
+      self.action_number += branch.action_number - base_number
+      self.bind(branch.bound)
+      writes.update(branch.writes)
+    return writes
+
+  def __repr__(self) -> str:
+    return f'ExecutionContext(depth={self.action_depth}, step={self.action_number}, vars={list(self.vars.keys())})'
@@ -1,4 +1,5 @@
 import logging
+from functools import lru_cache
 from pathlib import Path
 
 import yaml
@@ -7,9 +8,28 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=4096)
+def _split_path(key):
+  return tuple(key.replace('[', '.').replace(']', '').split('.'))
+
+
+_SLOTS = frozenset(('_data', '_children', '_lists'))
+
+
 class Obj:
+  '''Attribute view over parsed YAML/JSON data.
+
+  Child dicts are wrapped lazily and cached, so repeated traversal returns the same wrapper as long
+  as the underlying value is the same object. `to_dict()` always returns a plain copy, so callers
+  can change it without touching the wrapped data.
+  '''
+
+  __slots__ = tuple(_SLOTS)
+
   def __init__(self, data):
     self._data = data
+    self._children = {}
+    self._lists = {}
 
   def to_dict(self):
     return self._recursive_to_dict(self._data)
@@ -24,16 +44,36 @@ class Obj:
     else:
       return data
 
+  def _child(self, key, value):
+    if not isinstance(value, dict):
+      return value
+    child = self._children.get(key)
+    if child is not None and child._data is value:
+      return child
+    self._children[key] = Obj(value)
+    return self._children[key]
+
+  def _child_list(self, key, value):
+    cached = self._lists.get(key)
+    if cached is None or cached[0] is not value or not self._same_items(cached[1], value):
+      cached = self._lists[key] = (value, [self._child((key, i), item) for i, item in enumerate(value)])
+    return cached[1]
+
+  @staticmethod
+  def _same_items(children, items):
+    return len(children) == len(items) and all(
+      child is item or isinstance(child, Obj) and child._data is item for child, item in zip(children, items))
+
+  def _forget(self, key):
+    self._children.pop(key, None)
+    self._lists.pop(key, None)
+
   def __getattr__(self, key):
+    if key in _SLOTS:
+      raise AttributeError(key)
     if key in self._data:
       value = self._data[key]
-      if isinstance(value, dict):
-        return Obj(value)
-      elif isinstance(value, list):
-        obj_list = [Obj(item) if isinstance(item, dict) else item for item in value]
-        return obj_list
-      else:
-        return value
+      return self._child_list(key, value) if isinstance(value, list) else self._child(key, value)
     else:
       raise AttributeError(f'In:\n {self._data}\n{self.keys()} has no key {key}')
 
@@ -44,19 +84,22 @@ class Obj:
     return bool(self._data)
 
   def get(self, key, default=None):
-    keys = key.replace('[', '.').replace(']', '').split('.')
-    value = self._data
+    value, node = self._data, self
     try:
-      for k in keys:
+      for k in _split_path(key):
         if isinstance(value, dict):
           value = value[k]
+          node = node._child(k, value) if node is not None else None
         elif isinstance(value, list) and k.isdigit():
           value = value[int(k)]
+          node = None
         else:
           return default
-      return Obj(value) if isinstance(value, dict) else value
     except (KeyError, IndexError, TypeError):
       return default
+    if isinstance(value, dict):
+      return node if node is not None else Obj(value)
+    return value
 
   def has(self, key):
     keys = key.split('.')
@@ -78,10 +121,10 @@ class Obj:
     return self._data.keys()
 
   def values(self):
-    return [Obj(value) if isinstance(value, dict) else value for value in self._data.values()]
+    return [value for _, value in self.items()]
 
   def items(self):
-    return [(key, Obj(value) if isinstance(value, dict) else value) for key, value in self._data.items()]
+    return [(key, self._child(key, value)) for key, value in self._data.items()]
 
   def __len__(self):
     return len(self._data)
@@ -98,26 +141,25 @@ class Obj:
   def __setitem__(self, key, value):
     if isinstance(self._data, dict):
       self._data[key] = value
+      self._forget(key)
     else:
       raise TypeError("This Obj does not support item assignment")
 
   def __getitem__(self, key):
-    if isinstance(self._data, dict):
-      value = self._data[key]
-      return Obj(value) if isinstance(value, dict) else value
-    elif isinstance(self._data, list):
-      return Obj(self._data[key]) if isinstance(self._data[key], dict) else self._data[key]
+    if isinstance(self._data, (dict, list)):
+      return self._child(key, self._data[key])
     else:
       raise TypeError("This Obj does not support item access")
 
   def update(self, other):
     if isinstance(self._data, dict):
-      if isinstance(other, dict):
-        self._data.update(other)
-      elif isinstance(other, Obj):
-        self._data.update(other.to_dict())
-      else:
+      if isinstance(other, Obj):
+        other = other.to_dict()
+      elif not isinstance(other, dict):
         raise TypeError("Update only supports dict or Obj")
+      self._data.update(other)
+      for key in other:
+        self._forget(key)
     else:
       raise TypeError("This Obj does not support update")
 
@@ -0,0 +1,51 @@
+import logging
+from typing import Any, List
+
+
+class ResponseDocument:
+  '''Parsed response body with memoised `{{response.<path>}}` lookups.
+
+  A template with N response placeholders costs one parse plus N dictionary hits once the paths
+  have been resolved. `body` segments are skipped and a leading `json`/`xml` segment addresses the
+  document root unless the document has a key with that name.
+  '''
+
+  __slots__ = ('data', '_paths')
+
+  def __init__(self, data: Any):
+    self.data = data
+    self._paths = {}
+
+  def resolve(self, path: str) -> Any:
+    try:
+      return self._paths[path]
+    except KeyError:
+      value = self._paths[path] = self._lookup(self._keys(path))
+      return value
+
+  def _keys(self, path: str) -> List[str]:
+    keys = [k for k in path.replace('[', '.').replace(']', '').split('.') if k and k != 'body']
+    if keys and keys[0] in ('json', 'xml') and not (isinstance(self.data, dict) and keys[0] in self.data):
+      keys = keys[1:]
+    return keys
+
+  def _lookup(self, keys: List[str]) -> Any:
+    if not self.data:
+      return None
+    value = self.data
+    for key in keys:
+      if isinstance(value, dict):
+        if key not in value:
+          logging.warning(f'Key {key} not found in response')
+          return None
+        value = value[key]
+      elif isinstance(value, list) and key.isdigit():
+        index = int(key)
+        if index >= len(value):
+          logging.warning(f'Array index {key} out of range')
+          return None
+        value = value[index]
+      else:
+        logging.warning(f'Cannot access {key} in {type(value)}')
+        return None
+    return value
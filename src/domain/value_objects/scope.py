@@ -0,0 +1,81 @@
+from typing import Any, Optional, Union
+
+from src.domain.value_objects.obj_utils import Obj
+
+
+class Scope:
+  '''Copy-free, layered params of a running action.
+
+  Values assigned on the scope (response, item, vars.get results) go to its own `locals`; lookups
+  then fall through `layers` in order. Only the first path segment is matched per layer, which keeps
+  the precedence of the former `{**params, **vars, **constants}` merge while vars and constants are
+  read live. A nested action gets a thin scope whose last layer is its caller's scope.
+  '''
+
+  __slots__ = ('locals', 'layers')
+
+  def __init__(self, *layers: Union['Scope', Obj, dict, None]):
+    self.locals = Obj({})
+    self.layers = (self.locals, *(Obj(layer) if isinstance(layer, dict) else layer
+                                  for layer in layers if layer is not None))
+
+  def _owner(self, name: str) -> Optional[Obj]:
+    for layer in self.layers:
+      if isinstance(layer, Scope):
+        owner = layer._owner(name)
+        if owner is not None:
+          return owner
+      elif isinstance(layer._data, dict) and name in layer._data:
+        return layer
+    return None
+
+  @staticmethod
+  def _head(key: str) -> str:
+    return key.split('.', 1)[0].split('[', 1)[0]
+
+  def get(self, key: str, default: Any = None) -> Any:
+    owner = self._owner(self._head(key))
+    return default if owner is None else owner.get(key, default)
+
+  def has(self, key: str) -> bool:
+    owner = self._owner(self._head(key))
+    return owner is not None and owner.has(key)
+
+  def keys(self):
+    return self.to_dict().keys()
+
+  def items(self):
+    return [(key, self[key]) for key in self.keys()]
+
+  def to_dict(self) -> dict:
+    merged = {}
+    for layer in reversed(self.layers):
+      merged.update(layer.to_dict())
+    return merged
+
+  def __contains__(self, key: str) -> bool:
+    return self.has(key)
+
+  def __getitem__(self, key: str) -> Any:
+    owner = self._owner(key)
+    if owner is None:
+      raise KeyError(key)
+    return owner[key]
+
+  def __setitem__(self, key: str, value: Any):
+    self.locals[key] = value
+
+  def __iter__(self):
+    return iter(self.to_dict().items())
+
+  def __len__(self) -> int:
+    return len(self.to_dict())
+
+  def __bool__(self) -> bool:
+    return any(self.layers)
+
+  def __str__(self) -> str:
+    return str(self.to_dict())
+
+  def __repr__(self) -> str:
+    return f'Scope({self.to_dict()})'
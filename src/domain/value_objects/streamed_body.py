@@ -0,0 +1,117 @@
+import shutil
+from tempfile import SpooledTemporaryFile
+from typing import IO, Callable, Iterator, Optional
+
+CHUNK_SIZE = 64 * 1024
+SPOOL_THRESHOLD = 8 * 1024 * 1024
+
+
+class StreamedBody:
+  '''A response body consumed incrementally, as an iterator of byte chunks or as a file.
+
+  A live body reads from the connection and can be consumed once. `spool` copies it into a
+  SpooledTemporaryFile that stays in memory up to a threshold and rolls over to disk beyond it,
+  releasing the connection and making the body replayable through `rewind`.
+  '''
+
+  def __init__(self, chunks: Iterator[bytes] = None, file: IO[bytes] = None, chunk_size: int = CHUNK_SIZE,
+               on_close: Callable[[], None] = None):
+    self._chunks = chunks
+    self._file = file
+    self._buffer = b''
+    self.chunk_size = chunk_size
+    self._on_close = on_close
+
+  @classmethod
+  def from_file(cls, file: IO[bytes], chunk_size: int = CHUNK_SIZE) -> 'StreamedBody':
+    file.seek(0)
+    return cls(file=file, chunk_size=chunk_size)
+
+  @property
+  def spooled(self) -> bool:
+    return self._file is not None
+
+  @property
+  def file(self) -> Optional[IO[bytes]]:
+    return self._file
+
+  def spool(self, threshold: int = SPOOL_THRESHOLD) -> 'StreamedBody':
+    if self._file is None:
+      file = SpooledTemporaryFile(max_size=threshold)
+      for chunk in self:
+        file.write(chunk)
+      file.seek(0)
+      self._release()
+      self._file, self._chunks = file, None
+    return self
+
+  def rewind(self):
+    if self._file is None:
+      raise ValueError('A live stream cannot be replayed; spool it first')
+    self._file.seek(0)
+
+  def read(self, size: int = -1) -> bytes:
+    if self._file is not None:
+      return self._file.read(size)
+    while size < 0 or len(self._buffer) < size:
+      chunk = next(self._chunks, None) if self._chunks is not None else None
+      if chunk is None:
+        break
+      self._buffer += chunk
+    data, self._buffer = (self._buffer, b'') if size < 0 else (self._buffer[:size], self._buffer[size:])
+    return data
+
+  def getvalue(self) -> bytes:
+    '''The whole body in memory; a spooled body stays replayable afterwards.'''
+    if self._file is None:
+      return self.read()
+    self._file.seek(0)
+    data = self._file.read()
+    self._file.seek(0)
+    return data
+
+  def copy_to(self, target: IO[bytes]):
+    shutil.copyfileobj(self, target, self.chunk_size)
+
+  def readable(self) -> bool:
+    return True
+
+  def __iter__(self) -> Iterator[bytes]:
+    if self._buffer:
+      chunk, self._buffer = self._buffer, b''
+      yield chunk
+    if self._file is not None:
+      while chunk := self._file.read(self.chunk_size):
+        yield chunk
+    elif self._chunks is not None:
+      for chunk in self._chunks:
+        if chunk:
+          yield chunk
+
+  def __aiter__(self):
+    return self._aiter()
+
+  async def _aiter(self):
+    for chunk in self:
+      yield chunk
+
+  def close(self):
+    self._release()
+    if self._file is not None:
+      self._file.close()
+
+  def _release(self):
+    if self._on_close is not None:
+      self._on_close()
+      self._on_close = None
+
+  def __enter__(self) -> 'StreamedBody':
+    return self
+
+  def __exit__(self, *exc_info):
+    self.close()
+
+  def __repr__(self) -> str:
+    return f'StreamedBody(spooled={self.spooled})'
+
+  __str__ = __repr__
@@ -0,0 +1,41 @@
+from typing import Dict, Iterable, List, Optional
+
+COMPLETED = ('succeeded', 'resumed')
+
+
+class WorkflowResult:
+  '''Outcome of a workflow run: the status, duration and error of every node, in declaration order.
+
+  A node `succeeded`, was `resumed` (done by an earlier run), `failed`, was `skipped` because a
+  dependency did not complete, or was `cancelled` before it could start or finish.
+  '''
+
+  def __init__(self, names: Iterable[str]):
+    self.statuses: Dict[str, Optional[str]] = dict.fromkeys(names)
+    self.durations: Dict[str, float] = {}
+    self.errors: Dict[str, BaseException] = {}
+    self.elapsed = 0.0
+
+  @property
+  def succeeded(self) -> bool:
+    return all(status in COMPLETED for status in self.statuses.values())
+
+  def record(self, name: str, status: str, duration: float = None, error: BaseException = None):
+    self.statuses[name] = status
+    if duration is not None:
+      self.durations[name] = duration
+    if error is not None:
+      self.errors[name] = error
+
+  def names(self, status: str) -> List[str]:
+    return [name for name, value in self.statuses.items() if value == status]
+
+  def raise_for_failures(self):
+    '''Re-raise the error of the first failed node, in declaration order.'''
+    for name in self.statuses:
+      if name in self.errors:
+        raise self.errors[name]
+
+  def __repr__(self) -> str:
+    counts = {status: len(self.names(status)) for status in dict.fromkeys(self.statuses.values()) if status}
+    return f'WorkflowResult({counts}, elapsed={self.elapsed:.3f}s)'
@@ -0,0 +1,78 @@
+import asyncio
+import threading
+import time
+
+import aiohttp
+import requests
+from aiohttp import web
+
+from src.domain.services.async_http_transport import AsyncHttpTransport
+from src.domain.value_objects.api_response import ApiResponse
+
+REQUESTS = 300
+BULK_SIZE = 50
+
+
+def start_server():
+  loop = asyncio.new_event_loop()
+  threading.Thread(target=loop.run_forever, daemon=True).start()
+
+  async def handle(request):
+    return web.json_response({'id': request.path})
+
+  async def start():
+    app = web.Application()
+    app.router.add_get('/{tail:.*}', handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    return site._server.sockets[0].getsockname()[1]
+
+  port = asyncio.run_coroutine_threadsafe(start(), loop).result()
+  return f'http://127.0.0.1:{port}'
+
+
+async def per_call_session_request(method: str, url: str) -> ApiResponse:
+  '''The pre-transport behaviour: one ClientSession per request'''
+  async with aiohttp.ClientSession() as session:
+    async with session.request(method, url) as response:
+      body = await response.text()
+      response_obj = requests.Response()
+      response_obj.status_code = response.status
+      response_obj.url = str(response.url)
+      response_obj.headers = dict(response.headers)
+      response_obj._content = body.encode('utf-8')
+      return ApiResponse(response_obj)
+
+
+def measure(label: str, count: int, fn):
+  start = time.perf_counter()
+  fn()
+  elapsed = time.perf_counter() - start
+  print(f'{label:<40} {count / elapsed:>10.1f} req/s')
+
+
+def main():
+  base_url = start_server()
+  transport = AsyncHttpTransport()
+
+  measure('single, session per call (before)', REQUESTS,
+          lambda: [asyncio.run(per_call_session_request('GET', f'{base_url}/{i}')) for i in range(REQUESTS)])
+  measure('single, persistent transport (after)', REQUESTS,
+          lambda: [transport.run(transport.request('GET', f'{base_url}/{i}')) for i in range(REQUESTS)])
+
+  async def bulk_before():
+    return await asyncio.gather(*(per_call_session_request('GET', f'{base_url}/{i}') for i in range(BULK_SIZE)))
+
+  async def bulk_after():
+    return await asyncio.gather(*(transport.request('GET', f'{base_url}/{i}') for i in range(BULK_SIZE)))
+
+  rounds = REQUESTS // BULK_SIZE
+  measure('bulk, session per call (before)', REQUESTS, lambda: [asyncio.run(bulk_before()) for _ in range(rounds)])
+  measure('bulk, persistent transport (after)', REQUESTS, lambda: [transport.run(bulk_after()) for _ in range(rounds)])
+  transport.close()
+
+
+if __name__ == '__main__':
+  main()
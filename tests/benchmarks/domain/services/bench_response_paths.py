@@ -0,0 +1,59 @@
+import json
+import logging
+import timeit
+
+import requests
+
+from src.domain.services.api_integrator import ApiIntegrator
+from src.domain.value_objects.api_response import ApiResponse
+from src.domain.value_objects.obj_utils import Obj
+
+CONFIG = 'infrastructure/config/reqres_in.yml'
+ITEMS = 10000
+FIELDS = 30
+ROUNDS = 5
+
+
+def large_response() -> requests.Response:
+  response = requests.Response()
+  response.status_code = 200
+  response.headers['Content-Type'] = 'application/json'
+  record = {f'field_{i}': f'value-{i}' for i in range(FIELDS)}
+  response._content = json.dumps({'data': [record] * ITEMS, 'total': ITEMS}).encode('utf-8')
+  return response
+
+
+def legacy_response_value(integrator: ApiIntegrator):
+  '''The pre-cache behaviour: json.loads of the body for every {{response.x}} placeholder'''
+  def lookup(key: str):
+    value = json.loads(integrator.latest_response.body)
+    for part in [k for k in key[9:].split('.') if k != 'body']:
+      value = value[int(part)] if isinstance(value, list) else value[part]
+    return value
+  return lookup
+
+
+def wide_vars_set(integrator: ApiIntegrator, raw: requests.Response, params: Obj, data: Obj):
+  integrator.latest_response = ApiResponse(raw)
+  integrator._handle_vars('vars.set', data, params)
+
+
+def main():
+  logging.disable(logging.WARNING)
+  integrator = ApiIntegrator(CONFIG)
+  raw = large_response()
+  params = Obj({})
+  data = Obj({f'field_{i}': f'{{{{response.data.0.field_{i}}}}}' for i in range(FIELDS)})
+
+  after = min(timeit.repeat(lambda: wide_vars_set(integrator, raw, params, data), number=ROUNDS, repeat=3)) / ROUNDS
+  integrator._get_response_value = legacy_response_value(integrator)
+  before = min(timeit.repeat(lambda: wide_vars_set(integrator, raw, params, data), number=ROUNDS, repeat=3)) / ROUNDS
+
+  size = len(raw.content) / 1e6
+  print(f'vars.set with {FIELDS} response fields over a {size:.1f} MB body')
+  print(f'  parse per lookup {before * 1000:>8.1f} ms  parse once {after * 1000:>8.1f} ms  x{before / after:.1f}')
+  integrator.close()
+
+
+if __name__ == '__main__':
+  main()
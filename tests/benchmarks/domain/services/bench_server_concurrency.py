@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+from aiohttp import web
+from werkzeug.serving import make_server
+
+from src.domain.services.api_integrator import ApiIntegrator
+
+UPSTREAM_LATENCY = 0.05
+REQUESTS_PER_CLIENT = 20
+CLIENTS = [1, 2, 4, 8, 16, 32, 64]
+MODES = ['wsgi', 'asgi']
+
+CONFIG = '''
+api_integrator: 0.0.1
+as_server: true
+server_mode: {mode}
+supplier_servers:
+  - id: prod
+    url: {upstream}
+transport:
+  pool_maxsize: {pool_size}
+  async:
+    limit_per_host: {pool_size}
+actions:
+  get_item:
+    performs:
+      - perform:
+          action: http.get
+          data:
+            path: '{{{{supplier_server.url}}}}/items'
+            coalesce: false
+vars:
+  supplier_server:
+    id: prod
+'''
+
+
+class SlowUpstream(BaseHTTPRequestHandler):
+  protocol_version = 'HTTP/1.1'
+
+  def do_GET(self):
+    time.sleep(UPSTREAM_LATENCY)
+    body = b'{"sku": "A1"}'
+    self.send_response(200)
+    self.send_header('Content-Type', 'application/json')
+    self.send_header('Content-Length', str(len(body)))
+    self.end_headers()
+    self.wfile.write(body)
+
+  def log_message(self, *args):
+    pass
+
+
+class PeakThreads:
+  def __init__(self):
+    self.peak = threading.active_count()
+    self._stop = threading.Event()
+    self._thread = threading.Thread(target=self._sample, daemon=True)
+
+  def _sample(self):
+    while not self._stop.wait(0.005):
+      self.peak = max(self.peak, threading.active_count())
+
+  def __enter__(self):
+    self._thread.start()
+    return self
+
+  def __exit__(self, *args):
+    self._stop.set()
+    self._thread.join()
+
+
+def serve(server) -> str:
+  threading.Thread(target=server.serve_forever, daemon=True).start()
+  return f'http://127.0.0.1:{server.server_port}'
+
+
+def serve_wsgi(integrator: ApiIntegrator):
+  server = make_server('127.0.0.1', 0, integrator.app, threaded=True)
+  return serve(server), server.shutdown
+
+
+def serve_asgi(integrator: ApiIntegrator):
+  loop = asyncio.new_event_loop()
+  threading.Thread(target=loop.run_forever, daemon=True).start()
+
+  async def start():
+    runner = web.AppRunner(integrator.app.to_aiohttp())
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    return runner, site._server.sockets[0].getsockname()[1]
+
+  runner, port = asyncio.run_coroutine_threadsafe(start(), loop).result()
+  return f'http://127.0.0.1:{port}', lambda: asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result()
+
+
+def client(url: str) -> int:
+  with requests.Session() as session:
+    return sum(session.get(url).status_code == 200 for _ in range(REQUESTS_PER_CLIENT))
+
+
+def bench(mode: str, upstream: str, pool_size: int):
+  config_path = Path(tempfile.mkdtemp()) / 'server_conf.yml'
+  config_path.write_text(CONFIG.format(mode=mode, upstream=upstream, pool_size=pool_size))
+  integrator = ApiIntegrator(str(config_path), max_workers=pool_size)
+  url, stop = {'wsgi': serve_wsgi, 'asgi': serve_asgi}[mode](integrator)
+  client(url + '/get_item')
+
+  baseline = None
+  for clients in CLIENTS:
+    started = time.perf_counter()
+    with PeakThreads() as threads, ThreadPoolExecutor(max_workers=clients) as pool:
+      ok = sum(pool.map(client, [url + '/get_item'] * clients))
+    throughput = ok / (time.perf_counter() - started)
+    baseline = baseline or throughput
+    # Client threads are subtracted; the rest are server, transport and upstream threads
+    print(f'{mode} {clients:>3} clients {throughput:>8.1f} req/s  x{throughput / baseline:>5.2f}'
+          f'  threads {threads.peak - clients:>3}')
+  stop()
+  integrator.close()
+
+
+def main():
+  upstream = serve(ThreadingHTTPServer(('127.0.0.1', 0), SlowUpstream))
+  pool_size = max(CLIENTS) // 2
+  logging.disable(logging.WARNING)
+  print(f'upstream latency {UPSTREAM_LATENCY * 1000:.0f} ms, upstream pool size {pool_size}')
+  for mode in MODES:
+    bench(mode, upstream, pool_size)
+
+
+if __name__ == '__main__':
+  main()
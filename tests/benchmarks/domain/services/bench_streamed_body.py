@@ -0,0 +1,98 @@
+import asyncio
+import logging
+import tempfile
+import threading
+import tracemalloc
+from pathlib import Path
+
+from aiohttp import web
+
+from src.domain.services.api_integrator import ApiIntegrator
+
+SIZES_MB = [8, 32]
+BLOCK = 64 * 1024
+
+CONFIG = '''
+api_integrator: 0.0.1
+actions:
+  forward_buffered:
+    performs:
+      - perform:
+          action: http.get
+          data:
+            path: '{{server}}/export/{{size}}'
+      - perform:
+          action: http.post
+          data:
+            path: '{{server}}/upload'
+            body: '{{response.body}}'
+  forward_streamed:
+    performs:
+      - perform:
+          action: http.get
+          data:
+            path: '{{server}}/export/{{size}}'
+            stream: true
+      - perform:
+          action: http.post
+          data:
+            path: '{{server}}/upload'
+            body: '{{response.stream}}'
+'''
+
+
+def start_server() -> str:
+  loop = asyncio.new_event_loop()
+  threading.Thread(target=loop.run_forever, daemon=True).start()
+
+  async def export(request):
+    response = web.StreamResponse(headers={'Content-Type': 'text/plain'})
+    await response.prepare(request)
+    for _ in range(int(request.match_info['size']) * 1024 * 1024 // BLOCK):
+      await response.write(b'x' * BLOCK)
+    await response.write_eof()
+    return response
+
+  async def upload(request):
+    async for _ in request.content.iter_any():
+      pass
+    return web.json_response({})
+
+  async def start():
+    app = web.Application()
+    app.router.add_get('/export/{size}', export)
+    app.router.add_post('/upload', upload)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    return site._server.sockets[0].getsockname()[1]
+
+  port = asyncio.run_coroutine_threadsafe(start(), loop).result()
+  return f'http://127.0.0.1:{port}'
+
+
+def peak_mb(integrator: ApiIntegrator, action: str) -> float:
+  tracemalloc.start()
+  integrator.perform_action(action)
+  peak = tracemalloc.get_traced_memory()[1]
+  tracemalloc.stop()
+  return peak / 1e6
+
+
+def main():
+  logging.disable(logging.WARNING)
+  with tempfile.TemporaryDirectory() as directory:
+    config_path = Path(directory) / 'stream_conf.yml'
+    config_path.write_text(CONFIG)
+    integrator = ApiIntegrator(str(config_path))
+  integrator.vars['server'] = start_server()
+  for size in SIZES_MB:
+    integrator.vars['size'] = size
+    print(f'{size:>3} MB download forwarded  buffered peak {peak_mb(integrator, "forward_buffered"):>8.1f} MB  '
+          f'streamed peak {peak_mb(integrator, "forward_streamed"):>6.1f} MB')
+  integrator.close()
+
+
+if __name__ == '__main__':
+  main()
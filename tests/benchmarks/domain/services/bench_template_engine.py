@@ -0,0 +1,64 @@
+import logging
+import re
+import timeit
+from pathlib import Path
+
+from src.domain.services.api_integrator import ApiIntegrator
+from src.domain.services.template_engine import compile_template
+from src.domain.value_objects.obj_utils import Obj
+
+CONFIGS = ['infrastructure/specs/api_integrator/cva_ai.yaml', 'infrastructure/config/reqres_in.yml']
+ROUNDS = 200
+
+
+def action_templates(integrator: ApiIntegrator) -> list:
+  templates = []
+
+  def collect(data):
+    if isinstance(data, str) and '{{' in data:
+      templates.append(data)
+    elif isinstance(data, dict):
+      [collect(value) for value in data.values()]
+    elif isinstance(data, list):
+      [collect(value) for value in data]
+
+  collect(integrator.config.actions.to_dict())
+  return templates
+
+
+def regex_render(template: str, lookup) -> str:
+  '''The pre-compilation behaviour: an uncompiled re.sub per render plus an eager debug f-string'''
+  result = re.sub(r'\{\{(.+?)\}\}', lambda m: lookup(m.group(1).strip()), template)
+  logging.debug(f'Rendered template: {template} -> {result}')
+  return result
+
+
+def compare(label: str, count: int, before, after):
+  before_time = timeit.timeit(before, number=ROUNDS)
+  after_time = timeit.timeit(after, number=ROUNDS)
+  renders = count * ROUNDS
+  print(f'{label:<32} regex {renders / before_time:>10.0f}/s  compiled {renders / after_time:>10.0f}/s  '
+        f'x{before_time / after_time:.2f}')
+
+
+def main():
+  logging.disable(logging.WARNING)
+  for config in CONFIGS:
+    integrator = ApiIntegrator(config)
+    params = Obj({**integrator.vars.to_dict(), **integrator.constants.to_dict()})
+    templates = action_templates(integrator)
+
+    lookup = lambda key: integrator.render_value(key, params)
+    constant = lambda key: key
+    name = Path(config).name
+    compare(f'{name} ({len(templates)}) engine only', len(templates),
+            lambda: [regex_render(t, constant) for t in templates],
+            lambda: [compile_template(t).render(constant) for t in templates])
+    compare(f'{name} ({len(templates)}) with lookups', len(templates),
+            lambda: [regex_render(t, lookup) for t in templates],
+            lambda: [integrator.render_template(t, params) for t in templates])
+    integrator.close()
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,46 @@
+import asyncio
+import logging
+import random
+import time
+
+from src.domain.services.workflow_scheduler import WorkflowScheduler
+
+LAYERS = 5
+WIDTH = 6
+NODE_SECONDS = (0.01, 0.05)
+CONCURRENCY = [1, 2, 4, 8, 16]
+
+
+def layered_dag(seed: int = 7) -> tuple:
+  '''Each node depends on up to three nodes of the layer above, with a random duration'''
+  rng = random.Random(seed)
+  dependencies, durations = {}, {}
+  for layer in range(LAYERS):
+    above = [f'n{layer - 1}_{i}' for i in range(WIDTH)] if layer else []
+    for i in range(WIDTH):
+      name = f'n{layer}_{i}'
+      dependencies[name] = rng.sample(above, min(len(above), rng.randint(1, 3)))
+      durations[name] = rng.uniform(*NODE_SECONDS)
+  return dependencies, durations
+
+
+def main():
+  logging.disable(logging.WARNING)
+  dependencies, durations = layered_dag()
+  seconds, path = WorkflowScheduler(dependencies).critical_path(durations)
+  print(f'{len(dependencies)} nodes, serial {sum(durations.values()):.3f}s, '
+        f'critical path {seconds:.3f}s over {len(path)} nodes')
+
+  async def run_node_async(name):
+    await asyncio.sleep(durations[name])
+
+  for concurrency in CONCURRENCY:
+    scheduler = WorkflowScheduler(dependencies, concurrency=concurrency)
+    threads = scheduler.run(lambda name: time.sleep(durations[name])).elapsed
+    tasks = asyncio.run(scheduler.run_async(run_node_async)).elapsed
+    print(f'concurrency {concurrency:>2}  threads {threads:.3f}s  tasks {tasks:.3f}s  '
+          f'x{seconds / threads:.2f} of critical path')
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,92 @@
+import json
+import timeit
+from pathlib import Path
+
+import yaml
+
+from src.domain.value_objects.obj_utils import Obj
+
+SRC = Path(__file__).parents[4] / 'src'
+SPEC = SRC / 'infrastructure/specs/oas/IngramMicro-api-6.0_07082023.json'
+CONFIG = SRC / 'infrastructure/specs/api_integrator/cva_ai.yaml'
+ROUNDS = 20
+
+
+class LegacyObj:
+  '''The pre-caching behaviour: a fresh wrapper per access'''
+
+  def __init__(self, data):
+    self._data = data
+
+  def __getattr__(self, key):
+    if key in self._data:
+      value = self._data[key]
+      if isinstance(value, dict):
+        return LegacyObj(value)
+      if isinstance(value, list):
+        return [LegacyObj(item) if isinstance(item, dict) else item for item in value]
+      return value
+    raise AttributeError(key)
+
+  def items(self):
+    return [(key, LegacyObj(value) if isinstance(value, dict) else value) for key, value in self._data.items()]
+
+  def get(self, key, default=None):
+    value = self._data
+    for k in key.replace('[', '.').replace(']', '').split('.'):
+      if not isinstance(value, dict) or k not in value:
+        return default
+      value = value[k]
+    return LegacyObj(value) if isinstance(value, dict) else value
+
+
+def traverse(spec) -> int:
+  '''Walks every operation the way the mapper and execute_perform do: attribute hops over nested dicts'''
+  visited = 0
+  for _, path_item in spec.paths.items():
+    for _, operation in path_item.items():
+      if not hasattr(operation, 'get'):
+        continue
+      for parameter in operation.get('parameters', []) or []:
+        visited += 1
+      responses = operation.get('responses')
+      for code, response in (responses.items() if responses else []):
+        visited += len(str(code))
+      visited += len(spec.components.schemas.items())
+  return visited
+
+
+def walk_performs(config) -> int:
+  '''The execute_perform/_handle_responses pattern: re-reading action.performs and perform.data'''
+  visited = 0
+  for _, action in config.actions.items():
+    for perform in action.performs if hasattr(action, 'get') and action.get('performs') else []:
+      visited += len(perform.perform.action)
+      visited += len(perform.get('responses') or [])
+  return visited
+
+
+def compare(label: str, before, after, rounds: int = ROUNDS):
+  after()
+  before_time = min(timeit.repeat(before, number=rounds, repeat=3)) / rounds
+  after_time = min(timeit.repeat(after, number=rounds, repeat=3)) / rounds
+  print(f'{label:<24} legacy {before_time * 1e6:>10.1f} us  cached {after_time * 1e6:>10.1f} us  '
+        f'x{before_time / after_time:.2f}')
+
+
+def main():
+  with open(SPEC, encoding='utf-8') as file:
+    data = json.load(file)
+  legacy, cached = LegacyObj(data), Obj(data)
+  assert traverse(legacy) == traverse(cached)
+  compare('OAS attribute traversal', lambda: traverse(legacy), lambda: traverse(cached))
+
+  with open(CONFIG, encoding='utf-8') as file:
+    config = yaml.safe_load(file)
+  legacy_config, cached_config = LegacyObj(config), Obj(config)
+  assert walk_performs(legacy_config) == walk_performs(cached_config)
+  compare('cva_ai performs walk', lambda: walk_performs(legacy_config), lambda: walk_performs(cached_config), ROUNDS * 50)
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,164 @@
+import asyncio
+import json
+import threading
+import time
+import pytest
+import requests
+from aiohttp import web
+from requests.adapters import BaseAdapter
+from src.domain.services.api_integrator import ApiIntegrator
+
+
+class SlowServer:
+    '''aiohttp supplier on its own loop: GET /items/{sku} answers after `latency`, a `flaky*` sku first with 503'''
+
+    def __init__(self, latency: float = 0.2):
+        self.latency = latency
+        self.hits = {}
+        self.url = None
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    async def item(self, request):
+        sku = request.match_info['sku']
+        self.hits[sku] = self.hits.get(sku, 0) + 1
+        await asyncio.sleep(self.latency)
+        if sku.startswith('flaky') and self.hits[sku] == 1:
+            return web.json_response({'error': 'busy'}, status=503)
+        return web.json_response({'sku': sku})
+
+    async def items(self, request):
+        sku = (await request.json())['sku']
+        self.hits[sku] = self.hits.get(sku, 0) + 1
+        return web.json_response({'sku': sku})
+
+    async def _start(self):
+        app = web.Application()
+        app.router.add_get('/items/{sku}', self.item)
+        app.router.add_post('/items', self.items)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        return site._server.sockets[0].getsockname()[1]
+
+    def start(self) -> str:
+        self.thread.start()
+        port = asyncio.run_coroutine_threadsafe(self._start(), self.loop).result()
+        self.url = f'http://127.0.0.1:{port}'
+        return self.url
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+
+class FakeAdapter(BaseAdapter):
+    '''Requests adapter answering with `reply(request)`: a JSON body, bytes, or a (status, body, headers) tuple.
+
+    Every request is kept in `sent`, its arrival in `times`, and answered after `latency` seconds; `peak` is the
+    most requests ever in flight.
+    '''
+
+    def __init__(self, reply=None, latency: float = 0):
+        super().__init__()
+        self.reply = reply or (lambda request: {})
+        self.latency = latency
+        self.sent = []
+        self.times = []
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        with self.lock:
+            self.sent.append(request)
+            self.times.append(time.perf_counter())
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        if self.latency:
+            time.sleep(self.latency)
+        answer = self.reply(request)
+        status, body, headers = answer if isinstance(answer, tuple) else (200, answer, {})
+        response = requests.Response()
+        response.status_code = status
+        response.headers.update({**({} if isinstance(body, bytes) else {'Content-Type': 'application/json'}), **headers})
+        response._content = body if isinstance(body, bytes) else json.dumps(body).encode('utf-8')
+        response.url = request.url
+        response.request = request
+        with self.lock:
+            self.active -= 1
+        return response
+
+    def close(self):
+        pass
+
+
+class LatencyAdapter(BaseAdapter):
+    '''Requests adapter echoing the last path segment as `sku` after `latency` (twice as long for `product*`).
+
+    Every request records a ('start', sku) and a ('finish', sku) event, in the order they happened.
+    '''
+
+    def __init__(self, latency: float = 0.1):
+        super().__init__()
+        self.latency = latency
+        self.events = []
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        sku = request.url.rsplit('/', 1)[-1]
+        with self.lock:
+            self.events.append(('start', sku))
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        # The first declared branch finishes last
+        time.sleep(self.latency * (2 if sku.startswith('product') else 1))
+        with self.lock:
+            self.events.append(('finish', sku))
+            self.active -= 1
+        response = requests.Response()
+        response.status_code = 200
+        response.headers['Content-Type'] = 'application/json'
+        response._content = json.dumps({'sku': sku}).encode('utf-8')
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def slow_server():
+    server = SlowServer()
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def latency_adapter():
+    return LatencyAdapter()
+
+
+@pytest.fixture
+def integrator_factory(tmp_path):
+    '''Builds integrators from a YAML config, `adapter` mounted on `url`, and closes them all on teardown'''
+    integrators = []
+
+    def build(config: str, adapter: BaseAdapter = None, url: str = 'https://api.test', **options) -> ApiIntegrator:
+        config_path = tmp_path / f'conf_{len(integrators)}.yml'
+        config_path.write_text(config)
+        integrator = ApiIntegrator(str(config_path), **options)
+        integrators.append(integrator)
+        if adapter is not None:
+            integrator.session.mount(url, adapter)
+        return integrator
+
+    yield build
+    for integrator in integrators:
+        integrator.close()
@@ -0,0 +1,57 @@
+import pytest
+from src.domain.services.action_params import ActionParams, ParamError
+from src.domain.value_objects.obj_utils import Obj
+
+
+class TestActionParams:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.params = ActionParams({
+            'user_id': {'type': 'int', 'in': 'path'},
+            'page': {'type': 'int', 'default': 1},
+            'sort': {'type': 'str', 'enum': ['asc', 'desc']},
+            'active': 'bool',
+            'tags': 'list',
+            'filter': 'dict',
+            'note': None,
+        })
+
+    def test_text_values_are_coerced(self):
+        params = self.params.validate({'user_id': '7', 'active': 'true', 'tags': 'a,b', 'filter': '{"k": 1}'})
+
+        assert params == {'user_id': 7, 'page': 1, 'active': True, 'tags': ['a', 'b'], 'filter': {'k': 1}}
+
+    def test_json_values_keep_their_type(self):
+        params = self.params.validate({'user_id': 7, 'tags': ['a'], 'note': {'any': 'thing'}})
+
+        assert params['tags'] == ['a']
+        assert params['note'] == {'any': 'thing'}
+
+    def test_every_problem_is_reported(self):
+        with pytest.raises(ParamError) as error:
+            self.params.validate({'page': 'two', 'sort': 'random', 'extra': 1, 'active': 'maybe'})
+
+        assert sorted(error.value.errors) == sorted([
+            "Unknown param 'extra'",
+            "Missing required param 'user_id'",
+            "Param 'page' must be of type int",
+            "Param 'sort' must be one of ['asc', 'desc']",
+            "Param 'active' must be of type bool",
+        ])
+
+    def test_bool_is_not_a_number(self):
+        with pytest.raises(ParamError, match="'user_id' must be of type int"):
+            self.params.validate({'user_id': True})
+
+    def test_path_params_and_declaring_actions(self):
+        actions = Obj({'get_user': {'params': {'user_id': {'type': 'int', 'in': 'path'}}, 'performs': []},
+                       'list_users': {'performs': []}})
+
+        declared = ActionParams.from_actions(actions)
+
+        assert list(declared) == ['get_user']
+        assert declared['get_user'].path_params == ['user_id']
+
+    def test_unknown_type_fails_at_load(self):
+        with pytest.raises(ValueError, match="Unknown type 'uuid'"):
+            ActionParams({'id': 'uuid'})
@@ -0,0 +1,82 @@
+import asyncio
+import time
+import pytest
+from src.domain.value_objects.obj_utils import Obj
+
+CONFIG = '''
+api_integrator: 0.0.1
+actions:
+  get_item:
+    performs:
+      - perform:
+          action: http.get
+          data:
+            path: '{{server}}/items/{{sku}}'
+            coalesce: false
+        responses:
+          - is_success:
+              code: 200
+            performs:
+              - perform:
+                  action: vars.set
+                  data:
+                    last_sku: '{{response.sku}}'
+          - is_error:
+              code: 503
+            performs:
+              - perform: this.retry
+                data:
+                  trials: 2
+                  delay: 0
+  get_pair:
+    performs:
+      - perform: action.get_item
+      - perform:
+          action: http.post
+          data:
+            type: bulk
+            path: '{{server}}/items'
+            body:
+              - sku: a
+              - sku: b
+'''
+
+
+class TestApiIntegratorAsync:
+    @pytest.fixture(autouse=True)
+    def setup(self, integrator_factory, slow_server):
+        self.server = slow_server
+        self.integrator = integrator_factory(CONFIG)
+        self.integrator.vars['server'] = slow_server.url
+
+    async def _get_item(self, sku: str) -> str:
+        await self.integrator.perform_action_async('get_item', Obj({'sku': sku}))
+        return self.integrator.latest_response.resolve('sku')
+
+    def test_perform_action_async_binds_response_and_runs_responses(self):
+        assert asyncio.run(self._get_item('A1')) == 'A1'
+        assert self.integrator.vars['last_sku'] == 'A1'
+
+    def test_concurrent_invocations_share_one_thread_and_keep_own_response(self):
+        skus = [f'sku-{i}' for i in range(20)]
+
+        async def run_all():
+            return await asyncio.gather(*(self._get_item(sku) for sku in skus))
+
+        started = time.perf_counter()
+        results = asyncio.run(run_all())
+        elapsed = time.perf_counter() - started
+
+        assert results == skus
+        assert elapsed < self.server.latency * 5
+
+    def test_this_retry_is_awaited(self):
+        assert asyncio.run(self._get_item('flaky-1')) == 'flaky-1'
+        assert self.server.hits['flaky-1'] == 2
+
+    def test_nested_actions_and_bulk_performs_run_from_the_loop(self):
+        asyncio.run(self.integrator.perform_action_async('get_pair', Obj({'sku': 'A2'})))
+
+        assert self.server.hits == {'A2': 1, 'a': 1, 'b': 1}
+        assert self.integrator.vars['bulk_responses'].succeeded == 2
+        assert self.integrator.action_depth == 0
@@ -0,0 +1,78 @@
+import pytest
+from tests.unit.domain.services.conftest import FakeAdapter
+
+CONFIG = '''
+api_integrator: 0.0.1
+supplier_servers:
+  - id: prod
+    url: https://api.test
+cache:
+  ttl: 0
+actions:
+  get_catalog_of_brands:
+    performs:
+      - perform:
+          action: http.get
+          data:
+            path: '{{supplier_server.url}}/brands'
+            cache: true
+        responses:
+          - is_success:
+              code: 200
+            performs:
+              - perform:
+                  action: vars.set
+                  data:
+                    brand: '{{response.json.brands.0}}'
+  get_product_details:
+    performs:
+      - perform:
+          action: http.get
+          data:
+            path: '{{supplier_server.url}}/products'
+            query:
+              clave: '{{clave}}'
+            cache: 300
+  create_order:
+    performs:
+      - perform:
+          action: http.post
+          data:
+            path: '{{supplier_server.url}}/orders'
+            cache: 300
+vars:
+  supplier_server:
+    id: prod
+'''
+
+
+class TestApiIntegratorCache:
+    @pytest.fixture(autouse=True)
+    def setup(self, integrator_factory):
+        self.transport = FakeAdapter(lambda request: (304, b'', {}) if request.headers.get('If-None-Match') == '"v1"'
+                                     else (200, {'brands': ['acer']}, {'ETag': '"v1"'}))
+        self.integrator = integrator_factory(CONFIG, self.transport)
+
+    def test_stale_get_is_revalidated_and_served_from_cache(self):
+        self.integrator.perform_action('get_catalog_of_brands')
+        self.integrator.vars['brand'] = None
+        self.integrator.perform_action('get_catalog_of_brands')
+
+        assert [request.headers.get('If-None-Match') for request in self.transport.sent] == [None, '"v1"']
+        assert self.integrator.latest_response.status_code == 200
+        assert self.integrator.vars.brand == 'acer'
+        assert self.integrator.cache_stats()['revalidated'] == 1
+
+    def test_ttl_per_perform_is_keyed_on_the_rendered_query(self):
+        for clave in ('A1', 'A1', 'B2', 'A1'):
+            self.integrator.perform_action('get_product_details', {'clave': clave})
+
+        assert len(self.transport.sent) == 2
+        assert self.integrator.cache_stats()['hits'] == 2
+
+    def test_only_get_performs_are_cached(self):
+        self.integrator.perform_action('create_order')
+        self.integrator.perform_action('create_order')
+
+        assert len(self.transport.sent) == 2
+        assert self.integrator.cache_stats()['misses'] == 0
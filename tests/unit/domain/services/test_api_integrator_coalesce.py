@@ -0,0 +1,79 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from tests.unit.domain.services.conftest import FakeAdapter
+
+CONFIG = '''
+api_integrator: 0.0.1
+supplier_servers:
+  - id: prod
+    url: https://api.test
+actions:
+  get_catalog_of_brands:
+    performs:
+      - perform:
+          action: http.get
+          data:
+            path: '{{supplier_server.url}}/brands'
+  get_stock:
+    performs:
+      - perform:
+          action: http.get
+          data:
+            path: '{{supplier_server.url}}/stock'
+            coalesce: false
+  lookup_prices:
+    performs:
+      - perform:
+          action: http.post
+          data:
+            type: bulk
+            coalesce: true
+            window: 6
+            path: '{{supplier_server.url}}/prices'
+            body:
+              - sku: a
+              - sku: b
+              - sku: a
+              - sku: a
+              - sku: b
+              - sku: c
+vars:
+  supplier_server:
+    id: prod
+'''
+
+
+class TestApiIntegratorCoalesce:
+    @pytest.fixture(autouse=True)
+    def setup(self, integrator_factory):
+        self.transport = FakeAdapter(lambda request: json.loads(request.body or '{"brands": ["acer"]}'), latency=0.1)
+        self.integrator = integrator_factory(CONFIG, self.transport)
+
+    def burst(self, action_name, size=6):
+        with ThreadPoolExecutor(max_workers=size) as pool:
+            list(pool.map(lambda _: self.integrator.perform_action(action_name), range(size)))
+
+    def test_concurrent_gets_share_one_upstream_call(self):
+        self.burst('get_catalog_of_brands')
+
+        assert len(self.transport.sent) == 1
+        assert self.integrator.single_flight.stats()['coalesced'] == 5
+
+    def test_coalescing_can_be_turned_off(self):
+        self.burst('get_stock', size=3)
+
+        assert len(self.transport.sent) == 3
+
+    def test_duplicate_bulk_items_are_sent_once_when_opted_in(self):
+        self.integrator.perform_action('lookup_prices')
+
+        assert sorted(json.loads(request.body)['sku'] for request in self.transport.sent) == ['a', 'b', 'c']
+        result = self.integrator.vars['bulk_responses']
+        assert (result.total, result.succeeded) == (6, 6)
+
+    def test_sequential_gets_are_not_served_stale(self):
+        self.integrator.perform_action('get_catalog_of_brands')
+        self.integrator.perform_action('get_catalog_of_brands')
+
+        assert len(self.transport.sent) == 2
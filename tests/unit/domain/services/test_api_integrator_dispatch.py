@@ -0,0 +1,89 @@
+import json
+import pytest
+from tests.unit.domain.services.conftest import FakeAdapter
+
+CONFIG = '''
+api_integrator: 0.0.1
+supplier_servers:
+  - id: prod
+    url: https://api.test
+actions:
+  get_item:
+    performs:
+      - perform:
+          action: http.get
+          data:
+            path: '{{supplier_server.url}}/items/1'
+        responses:
+          - is_success:
+              code: 200
+            performs:
+              - perform:
+                  action: vars.set
+                  data:
+                    item_name: '{{response.name}}'
+  get_item_async:
+    performs:
+      - perform:
+          action: http.get
+          data:
+            async: true
+            path: 'http://127.0.0.1:9/items/1'
+  push_items:
+    performs:
+      - perform:
+          action: http.post
+          data:
+            type: bulk
+            wrapper: item
+            path: '{{supplier_server.url}}/items'
+            body:
+              - sku: a
+              - sku: b
+              - sku: c
+vars:
+  supplier_server:
+    id: prod
+'''
+
+
+class TestApiIntegratorDispatch:
+    @pytest.fixture(autouse=True)
+    def setup(self, integrator_factory):
+        self.transport = FakeAdapter(lambda request: {'name': 'widget'})
+        self.integrator = integrator_factory(CONFIG, self.transport)
+        self.integrator.session.mount('http://127.0.0.1:9', self.transport)
+
+    def test_single_request_goes_over_the_wire_once(self):
+        self.integrator.perform_action('get_item')
+
+        assert len(self.transport.sent) == 1
+        assert self.transport.sent[0].method == 'GET'
+        assert self.transport.sent[0].url == 'https://api.test/items/1'
+
+    def test_single_request_binds_the_dispatched_response(self):
+        self.integrator.perform_action('get_item')
+
+        response = self.integrator.latest_response
+        assert response.status_code == 200
+        assert self.integrator.vars['response'] is response
+        assert self.integrator.vars.item_name == 'widget'
+
+    def test_failed_async_request_raises_without_a_sync_resend(self):
+        with pytest.raises(Exception, match='127.0.0.1'):
+            self.integrator.perform_action('get_item_async')
+
+        assert self.transport.sent == []
+
+    def test_bulk_request_sends_each_item_once(self):
+        self.integrator.perform_action('push_items')
+
+        bodies = sorted(json.loads(request.body)['item']['sku'] for request in self.transport.sent)
+        assert bodies == ['a', 'b', 'c']
+
+    def test_bulk_request_binds_the_last_item_response(self):
+        self.integrator.perform_action('push_items')
+
+        assert len(self.integrator.vars['bulk_responses']) == 3
+        assert json.loads(self.integrator.latest_response.request.body) == {'item': {'sku': 'c'}}
+        assert self.integrator.vars['response'] is self.integrator.latest_response
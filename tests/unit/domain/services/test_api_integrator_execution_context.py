@@ -0,0 +1,111 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+import pytest
+from tests.unit.domain.services.conftest import FakeAdapter
+
+CONFIG = '''
+api_integrator: 0.0.1
+as_server: true
+supplier_servers:
+  - id: prod
+    url: https://api.test
+actions:
+  get_item:
+    performs:
+      - perform:
+          action: log.info
+          data: 'Fetching {{sku}}'
+      - perform:
+          action: http.get
+          data:
+            path: '{{supplier_server.url}}/items/{{sku}}'
+        responses:
+          - is_success:
+              code: 200
+            performs:
+              - perform:
+                  action: log.info
+                  data: '{{sku}}={{response.sku}}'
+              - perform:
+                  action: vars.set
+                  data:
+                    last_sku: '{{response.sku}}'
+  get_brands:
+    performs:
+      - perform:
+          action: http.get
+          data:
+            path: '{{supplier_server.url}}/items/brands'
+  get_groups:
+    performs:
+      - perform:
+          action: http.get
+          data:
+            path: '{{supplier_server.url}}/items/groups'
+vars:
+  supplier_server:
+    id: prod
+'''
+
+
+class TestApiIntegratorExecutionContext:
+    @pytest.fixture(autouse=True)
+    def setup(self, integrator_factory):
+        adapter = FakeAdapter(lambda request: {'sku': request.url.rsplit('/', 1)[-1]}, latency=0.02)
+        self.integrator = integrator_factory(CONFIG, adapter)
+        self.logged = []
+        self.lock = threading.Lock()
+
+    def log(self, command, data, params):
+        with self.lock:
+            self.logged.append((self.integrator.render_template(data, params), self.integrator.action_number))
+
+    def invoke(self, sku):
+        self.integrator.perform_action('get_item', {'sku': sku})
+        return self.integrator.latest_response.json['sku'], self.integrator.action_depth
+
+    def test_concurrent_invocations_keep_their_own_response(self):
+        skus = [f'sku-{i}' for i in range(16)]
+        with patch.object(self.integrator, '_handle_log', side_effect=self.log):
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                results = list(pool.map(self.invoke, skus))
+
+        assert results == [(sku, 0) for sku in skus]
+        assert sorted(message for message, _ in self.logged if '=' in message) == sorted(f'{s}={s}' for s in skus)
+
+    def test_step_counters_are_per_invocation(self):
+        with patch.object(self.integrator, '_handle_log', side_effect=self.log):
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                list(pool.map(self.invoke, ['a', 'b', 'c', 'd']))
+
+        assert {step for _, step in self.logged} == {1}
+
+    def test_global_vars_are_merged_from_every_invocation(self):
+        skus = [f'sku-{i}' for i in range(16)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(self.invoke, skus))
+            list(pool.map(lambda i: self.integrator.merge_vars({f'key_{i}': i}), range(200)))
+
+        assert self.integrator.vars.last_sku in skus
+        assert all(self.integrator.vars.get(f'key_{i}') == i for i in range(200))
+
+    def test_server_answers_simultaneous_requests_with_their_own_response(self):
+        client = self.integrator.app.test_client()
+        paths = ['/get_brands', '/get_groups'] * 8
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            bodies = list(pool.map(lambda path: client.get(path).get_json(), paths))
+
+        assert [json.loads(body['response'])['sku'] for body in bodies] == [path.split('_')[1] for path in paths]
+
+    def test_context_survives_the_invocation_for_its_thread(self):
+        self.integrator.perform_action('get_brands')
+        context = self.integrator.context
+
+        self.integrator.perform_action('get_groups')
+
+        assert context.latest_response.json == {'sku': 'brands'}
+        assert self.integrator.context is not context
+        assert self.integrator.latest_response.json == {'sku': 'groups'}
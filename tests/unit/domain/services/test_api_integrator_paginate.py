@@ -0,0 +1,98 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlsplit
+import pytest
+from tests.unit.domain.services.conftest import FakeAdapter
+
+CONFIG = '''
+api_integrator: 0.0.1
+supplier_servers:
+  - id: prod
+    url: https://api.test
+actions:
+  get_all_users:
+    performs:
+      - perform:
+          action: http.get
+          data:
+            path: '{{supplier_server.url}}/users'
+            query:
+              per_page: '2'
+            paginate:
+              items: data
+              total_pages: total_pages
+              prefetch: true
+        responses:
+          - is_success:
+              code: 200
+            performs:
+              - perform:
+                  action: log.info
+                  data: 'Page {{page}} of {{response.total_pages}}'
+              - perform:
+                  action: http.post
+                  data:
+                    type: bulk_stream
+                    items: response.each
+                    wrapper: user
+                    path: '{{supplier_server.url}}/sync'
+vars:
+  supplier_server:
+    id: prod
+'''
+
+
+def users_page(users):
+    '''Reply of a users endpoint paged by `page`/`per_page`; anything else is echoed back'''
+    def reply(request):
+        if request.method != 'GET':
+            return json.loads(request.body)
+        query = {key: int(values[0]) for key, values in parse_qs(urlsplit(request.url).query).items()}
+        page, size = query['page'], query['per_page']
+        return {'page': page, 'total_pages': -(-len(users) // size), 'data': users[(page - 1) * size:][:size]}
+    return reply
+
+
+class TestApiIntegratorPaginate:
+    @pytest.fixture(autouse=True)
+    def setup(self, integrator_factory):
+        self.transport = FakeAdapter(users_page([{'id': i} for i in range(1, 6)]))
+        self.integrator = integrator_factory(CONFIG, self.transport)
+
+    def test_responses_run_once_per_page(self):
+        logged = []
+        with patch.object(self.integrator, '_handle_log',
+                          side_effect=lambda command, data, params: logged.append(
+                              self.integrator.render_template(data, params))):
+            self.integrator.perform_action('get_all_users')
+
+        assert logged == ['Page 1 of 3', 'Page 2 of 3', 'Page 3 of 3']
+
+    def test_page_items_stream_into_a_nested_bulk_push(self):
+        self.integrator.perform_action('get_all_users')
+
+        synced = [json.loads(request.body)['user']['id'] for request in self.transport.sent if request.method == 'POST']
+        assert sorted(synced) == [1, 2, 3, 4, 5]
+        assert [request.url for request in self.transport.sent if request.method == 'GET'] == \
+            [f'https://api.test/users?per_page=2&page={page}' for page in (1, 2, 3)]
+
+    def test_pages_do_not_nest_actions(self):
+        depths = []
+        handle = self.integrator._handle_responses
+        with patch.object(self.integrator, '_handle_responses',
+                          side_effect=lambda responses, params: (depths.append(self.integrator.action_depth),
+                                                                 handle(responses, params))):
+            self.integrator.perform_action('get_all_users')
+
+        assert depths == [1, 1, 1]
+
+    def test_concurrent_paginations_each_push_every_item(self):
+        self.transport.latency = 0.05
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            list(pool.map(lambda _: self.integrator.perform_action('get_all_users'), range(2)))
+
+        synced = [json.loads(request.body)['user']['id'] for request in self.transport.sent if request.method == 'POST']
+        assert sorted(synced) == sorted([1, 2, 3, 4, 5] * 2)
+        # Each run fetched its own pages instead of sharing one coalesced response
+        assert len([request for request in self.transport.sent if request.method == 'GET']) == 6
@@ -0,0 +1,127 @@
+import asyncio
+import time
+import pytest
+from src.domain.value_objects.obj_utils import Obj
+
+CONFIG = '''
+api_integrator: 0.0.1
+actions:
+  get_product:
+    performs:
+      - parallel:
+          - perform:
+              action: http.get
+              data:
+                path: '{{server}}/items/product-{{sku}}'
+            responses:
+              - is_success:
+                  code: 200
+                performs:
+                  - perform:
+                      action: vars.set
+                      data:
+                        product: '{{response.sku}}'
+                        winner: '{{response.sku}}'
+          - perform:
+              action: http.get
+              data:
+                path: '{{server}}/items/images-{{sku}}'
+            responses:
+              - is_success:
+                  code: 200
+                performs:
+                  - perform:
+                      action: vars.set
+                      data:
+                        images: '{{response.sku}}'
+                        winner: '{{response.sku}}'
+      - perform:
+          action: log.info
+          data: 'product={{product}} images={{images}} latest={{response.sku}}'
+  get_auto:
+    parallel: auto
+    performs:
+      - perform:
+          action: http.get
+          data:
+            path: '{{server}}/items/product-{{sku}}'
+      - perform:
+          action: http.get
+          data:
+            path: '{{server}}/items/images-{{sku}}'
+      - perform:
+          action: http.get
+          data:
+            path: '{{server}}/items/stock-{{sku}}'
+      - perform:
+          action: vars.set
+          data:
+            last: '{{response.sku}}'
+  get_broken:
+    performs:
+      - parallel:
+          - perform:
+              action: http.get
+              data:
+                path: '{{server}}/items/ok'
+          - perform: missing.handler
+'''
+
+
+class TestApiIntegratorParallel:
+    @pytest.fixture(autouse=True)
+    def setup(self, integrator_factory, latency_adapter):
+        self.adapter = latency_adapter
+        self.integrator = integrator_factory(CONFIG, self.adapter)
+        self.integrator.vars['server'] = 'https://api.test'
+        self.logged = []
+
+    def run(self, action: str, sku: str = 'A1') -> float:
+        started = time.perf_counter()
+        self.integrator.perform_action(action, Obj({'sku': sku}))
+        return time.perf_counter() - started
+
+    def test_group_pays_the_slowest_latency_not_the_sum(self):
+        elapsed = self.run('get_product')
+
+        assert self.adapter.peak == 2
+        assert elapsed < self.adapter.latency * 2.8
+
+    def test_group_merges_in_declaration_order_not_completion_order(self, monkeypatch):
+        monkeypatch.setattr('logging.info', lambda message, *args: self.logged.append(message))
+
+        self.run('get_product')
+
+        assert self.integrator.vars['winner'] == 'images-A1'
+        assert self.integrator.latest_response.resolve('sku') == 'images-A1'
+        assert 'product=product-A1 images=images-A1 latest=images-A1' in self.logged
+
+    def test_auto_runs_independent_performs_together(self):
+        elapsed = self.run('get_auto')
+
+        assert self.adapter.peak == 3
+        assert elapsed < self.adapter.latency * 2.8
+        assert self.integrator.parallel_plans['get_auto'] == [[0, 1, 2], [3]]
+        assert self.integrator.vars['last'] == 'stock-A1'
+
+    def test_failure_surfaces_after_the_group_merges(self):
+        with pytest.raises(ValueError, match='Unknown action: missing.handler'):
+            self.run('get_broken')
+
+        assert self.integrator.latest_response.resolve('sku') == 'ok'
+        assert self.integrator.action_depth == 0
+
+
+class TestApiIntegratorParallelAsync:
+    @pytest.fixture(autouse=True)
+    def setup(self, integrator_factory, slow_server):
+        self.server = slow_server
+        self.integrator = integrator_factory(CONFIG)
+        self.integrator.vars['server'] = slow_server.url
+
+    def test_group_runs_concurrently_on_the_loop(self):
+        started = time.perf_counter()
+        asyncio.run(self.integrator.perform_action_async('get_auto', Obj({'sku': 'B2'})))
+
+        assert time.perf_counter() - started < self.server.latency * 2
+        assert self.integrator.vars['last'] == 'stock-B2'
@@ -0,0 +1,63 @@
+from itertools import count
+import pytest
+from tests.unit.domain.services.conftest import FakeAdapter
+
+CONFIG = '''
+api_integrator: 0.0.1
+supplier_servers:
+  - id: prod
+    url: https://api.test
+    rate_limit:
+      rps: 40
+      burst: 4
+      max_concurrency: 2
+actions:
+  push_items:
+    performs:
+      - perform:
+          action: http.post
+          data:
+            type: bulk
+            window: 8
+            path: '{{supplier_server.url}}/items'
+            body: {body}
+vars:
+  supplier_server:
+    id: prod
+'''
+
+
+class TestApiIntegratorRateLimit:
+    @pytest.fixture(autouse=True)
+    def setup(self, integrator_factory):
+        self.integrator_factory = integrator_factory
+
+    def integrator(self, items, adapter):
+        return self.integrator_factory(CONFIG.replace('{body}', str([{'sku': i} for i in range(items)])), adapter)
+
+    @staticmethod
+    def quota_adapter(throttle_first=False):
+        '''With `throttle_first`, the first request is answered 429 with a Retry-After'''
+        calls = count()
+        return FakeAdapter(lambda request: (429, b'{}', {'Retry-After': '0.2'}) if throttle_first and next(calls) == 0
+                           else (200, b'{}', {}), latency=0.005)
+
+    def test_bulk_requests_stay_within_the_server_quota(self):
+        adapter = self.quota_adapter()
+        integrator = self.integrator(20, adapter)
+
+        integrator.perform_action('push_items')
+
+        assert adapter.peak <= 2
+        assert adapter.times[-1] - adapter.times[0] >= (20 - 4) / 40 * 0.9
+        assert integrator.rate_limit_stats()['https://api.test']['waited'] > 0
+
+    def test_retry_after_holds_back_the_following_requests(self):
+        adapter = self.quota_adapter(throttle_first=True)
+        integrator = self.integrator(3, adapter)
+
+        integrator.perform_action('push_items')
+
+        assert adapter.times[-1] - adapter.times[0] >= 0.18
+        assert integrator.vars['bulk_responses'].failed == 1
+        assert integrator.rate_limit_stats()['https://api.test']['throttled'] == 1
@@ -0,0 +1,64 @@
+import json
+import pytest
+from src.domain.value_objects.obj_utils import Obj
+
+CONFIG = '''
+api_integrator: 0.0.1
+supplier_servers:
+  - id: prod
+    url: https://api.test
+actions: {}
+vars:
+  supplier_server:
+    id: prod
+  price: 10.5
+  stock: 3
+  tags: [a, b]
+  dimensions:
+    width: 2
+    height: 4
+  name: Widget
+'''
+
+
+class TestApiIntegratorRenderStructure:
+    @pytest.fixture(autouse=True)
+    def setup(self, integrator_factory):
+        self.integrator = integrator_factory(CONFIG)
+        self.params = Obj({'id': 7})
+
+    def test_whole_value_placeholders_keep_native_types(self):
+        body = self.integrator.render_structure(Obj({
+            'id': '{{id}}',
+            'price': '{{price}}',
+            'stock': '{{ stock }}',
+            'tags': '{{tags}}',
+            'dimensions': '{{dimensions}}',
+        }), self.params)
+
+        assert body == {'id': 7, 'price': 10.5, 'stock': 3, 'tags': ['a', 'b'],
+                        'dimensions': {'width': 2, 'height': 4}}
+
+    def test_embedded_placeholders_render_as_text(self):
+        body = self.integrator.render_structure(Obj({'label': '{{name}} x{{stock}}', 'list': ['#{{id}}']}),
+                                                self.params)
+
+        assert body == {'label': 'Widget x3', 'list': ['#7']}
+
+    def test_nested_structures_are_walked(self):
+        body = self.integrator.render_structure(Obj({'item': {'sizes': ['{{dimensions.width}}', 1]}}), self.params)
+
+        assert body == {'item': {'sizes': [2, 1]}}
+
+    def test_missing_placeholder_is_left_visible(self):
+        assert self.integrator.render_structure('{{unknown}}', self.params) == '{{ unknown }}'
+
+    def test_json_body_is_typed(self):
+        body = self.integrator._render_body(Obj({'price': '{{price}}', 'name': '{{name}}'}), Obj({}), self.params)
+
+        assert json.loads(body) == {'price': 10.5, 'name': 'Widget'}
+
+    def test_text_render_mode_keeps_legacy_stringified_body(self):
+        body = self.integrator._render_body(Obj({'price': '{{price}}'}), Obj({'render': 'text'}), self.params)
+
+        assert json.loads(body) == {'price': '10.5'}
@@ -0,0 +1,61 @@
+import pytest
+import requests
+from tests.unit.domain.services.conftest import FakeAdapter
+
+FIELDS = [f'field_{i}' for i in range(30)]
+
+CONFIG = f'''
+api_integrator: 0.0.1
+supplier_servers:
+  - id: prod
+    url: https://api.test
+actions:
+  get_product:
+    performs:
+      - perform:
+          action: http.get
+          data:
+            path: '{{{{supplier_server.url}}}}/products/1'
+        responses:
+          - is_success:
+              code: 200
+              has_keys: [product, total]
+              is_type: dict
+            performs:
+              - perform:
+                  action: vars.set
+                  data:
+{chr(10).join(f"                    {field}: '{{{{response.product.{field}}}}}'" for field in FIELDS)}
+                    first_tag: '{{{{response.json.product.tags[0]}}}}'
+vars:
+  supplier_server:
+    id: prod
+'''
+
+
+class TestApiIntegratorResponseValues:
+    @pytest.fixture(autouse=True)
+    def setup(self, integrator_factory, monkeypatch):
+        product = {field: f'value-{i}' for i, field in enumerate(FIELDS)}
+        adapter = FakeAdapter(lambda request: {'product': {**product, 'tags': ['new']}, 'total': 1})
+        self.integrator = integrator_factory(CONFIG, adapter)
+        self.parses = 0
+        original = requests.Response.json
+
+        def counting_json(response, **kwargs):
+            self.parses += 1
+            return original(response, **kwargs)
+
+        monkeypatch.setattr(requests.Response, 'json', counting_json)
+
+    def test_wide_vars_set_parses_the_body_once(self):
+        self.integrator.perform_action('get_product')
+
+        assert [self.integrator.vars[field] for field in FIELDS] == [f'value-{i}' for i in range(30)]
+        assert self.integrator.vars.first_tag == 'new'
+        assert self.parses == 1
+
+    def test_key_and_type_conditions_use_the_parsed_body(self):
+        self.integrator.perform_action('get_product')
+
+        assert self.integrator.vars.has('field_0')
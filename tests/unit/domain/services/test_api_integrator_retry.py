@@ -0,0 +1,127 @@
+import json
+import threading
+from unittest.mock import patch
+import pytest
+from tests.unit.domain.services.conftest import FakeAdapter
+
+CONFIG = '''
+api_integrator: 0.0.1
+supplier_servers:
+  - id: prod
+    url: https://api.test
+    rate_limit:
+      rps: 1
+      burst: 10
+actions:
+  get_item:
+    performs:
+      - perform:
+          action: http.get
+          data:
+            path: '{{supplier_server.url}}/items/{{sku}}'
+            retry:
+              attempts: 3
+              backoff: 0.01
+  push_items:
+    performs:
+      - perform:
+          action: http.post
+          data:
+            type: bulk
+            window: 3
+            path: '{{supplier_server.url}}/items'
+            retry:
+              attempts: 2
+              backoff: 0.2
+              jitter: none
+            body:
+              - sku: flaky
+              - sku: ok-1
+              - sku: ok-2
+  auth:
+    performs:
+      - perform:
+          action: http.post
+          data:
+            path: '{{supplier_server.url}}/auth'
+        responses:
+          - is_error:
+              code: 503
+            performs:
+              - perform: this.retry
+                data:
+                  trials: '{{retry_trials}}'
+                  delay: 0.01
+vars:
+  retry_trials: 2
+  supplier_server:
+    id: prod
+'''
+
+
+def sku(request) -> str:
+    return json.loads(request.body or '{}').get('sku') or request.url.rsplit('/', 1)[-1]
+
+
+class TestApiIntegratorRetry:
+    @pytest.fixture(autouse=True)
+    def setup(self, integrator_factory):
+        self.integrator = integrator_factory(CONFIG)
+
+    def mount(self, **failures):
+        '''Answer 503 to the first `failures[key]` requests for each sku'''
+        lock = threading.Lock()
+
+        def reply(request):
+            with lock:
+                failing = failures.get(sku(request), 0) > 0
+                failures[sku(request)] = failures.get(sku(request), 0) - 1
+            return 503 if failing else 200, b'{}', {}
+
+        self.transport = FakeAdapter(reply)
+        self.integrator.session.mount('https://api.test', self.transport)
+
+    def test_http_perform_retries_retryable_statuses(self):
+        self.mount(A1=2)
+
+        self.integrator.perform_action('get_item', {'sku': 'A1'})
+
+        assert len(self.transport.sent) == 3
+        assert self.integrator.latest_response.status_code == 200
+
+    def test_retries_go_through_the_rate_limiter(self):
+        self.mount(A1=2)
+
+        self.integrator.perform_action('get_item', {'sku': 'A1'})
+
+        limiter = self.integrator.rate_limits.for_url('https://api.test/items/A1')
+        assert limiter.tokens < 7.5
+
+    def test_waiting_retry_does_not_stall_the_bulk_pool(self):
+        self.mount(flaky=1)
+        self.integrator.max_workers = 1
+
+        self.integrator.perform_action('push_items')
+
+        assert [sku(request) for request in self.transport.sent] == ['flaky', 'ok-1', 'ok-2', 'flaky']
+        assert self.integrator.vars['bulk_responses'].succeeded == 3
+
+    def test_this_retry_runs_the_perform_again_until_trials_run_out(self):
+        self.mount(auth=5)
+
+        with patch('src.domain.services.api_integrator.time.sleep') as sleep:
+            self.integrator.perform_action('auth')
+
+        assert len(self.transport.sent) == 3
+        assert [args for args, _ in sleep.call_args_list] == [(0.01,), (0.01,)]
+
+    def test_this_retry_stops_once_the_perform_succeeds(self):
+        self.mount(auth=1)
+
+        self.integrator.perform_action('auth')
+
+        assert len(self.transport.sent) == 2
+
+    def test_this_retry_outside_responses_is_rejected(self):
+        with pytest.raises(ValueError):
+            self.integrator._handle_this('this.retry', None, {})
@@ -8,6 +8,8 @@ class TestApiIntegrator:
     def setup(self):
         self.config_path = 'infrastructure/config/jsonplaceholder_conf.yml'
         self.integrator = ApiIntegrator(self.config_path)
+        yield
+        self.integrator.close()
 
     def test_config_loading(self):
         assert isinstance(self.integrator.config, YmlObj)
@@ -0,0 +1,83 @@
+import pytest
+from src.domain.value_objects.obj_utils import Obj
+
+CONFIG = '''
+api_integrator: 0.0.1
+actions:
+  capture:
+    performs:
+      - perform:
+          action: vars.set
+          data:
+            seen_user: '{{user}}'
+            seen_region: '{{region}}'
+            seen_empty: 'x{{empty}}'
+            seen_page: '{{page}}'
+  rotate_token:
+    performs:
+      - perform:
+          action: vars.set
+          data:
+            token: '{{next_token}}'
+      - perform:
+          action: vars.set
+          data:
+            seen_token: '{{token}}'
+  outer:
+    performs:
+      - perform:
+          action: vars.get
+          data: [user]
+      - perform: action.inner
+  inner:
+    performs:
+      - perform:
+          action: vars.set
+          data:
+            inner_user: '{{user}}'
+vars:
+  user: from-vars
+  region: from-vars
+  empty: ''
+  token: old-token
+  next_token: new-token
+constants:
+  region: from-constants
+'''
+
+
+class TestApiIntegratorScope:
+    @pytest.fixture(autouse=True)
+    def setup(self, integrator_factory):
+        self.integrator = integrator_factory(CONFIG)
+
+    def test_vars_override_passed_params(self):
+        self.integrator.perform_action('capture', Obj({'user': 'from-params'}))
+
+        assert self.integrator.vars.seen_user == 'from-vars'
+
+    def test_constants_override_vars(self):
+        self.integrator.perform_action('capture')
+
+        assert self.integrator.vars.seen_region == 'from-constants'
+
+    def test_passed_params_fill_keys_missing_elsewhere(self):
+        self.integrator.perform_action('capture', Obj({'page': 4}))
+
+        assert self.integrator.vars.seen_page == '4'
+
+    def test_falsy_values_fall_through_to_placeholder(self):
+        self.integrator.perform_action('capture')
+
+        assert self.integrator.get_value('empty', Obj({'empty': ''})) == '{{ empty }}'
+        assert self.integrator.vars.seen_empty == 'x'
+
+    def test_vars_set_earlier_in_the_action_are_visible(self):
+        self.integrator.perform_action('rotate_token')
+
+        assert self.integrator.vars.seen_token == 'new-token'
+
+    def test_nested_actions_see_caller_scope(self):
+        self.integrator.perform_action('outer')
+
+        assert self.integrator.vars.inner_user == 'from-vars'
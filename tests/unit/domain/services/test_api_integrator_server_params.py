@@ -0,0 +1,126 @@
+import json
+import time
+import pytest
+from tests.unit.domain.services.conftest import FakeAdapter
+
+LATENCY = 0.1
+
+CONFIG = '''
+api_integrator: 0.0.1
+as_server: true
+supplier_servers:
+  - id: prod
+    url: https://api.test
+actions:
+  get_user:
+    params:
+      user_id:
+        type: int
+        in: path
+      fields:
+        type: str
+        default: name
+    performs:
+      - perform:
+          action: http.get
+          data:
+            path: '{{supplier_server.url}}/users/{{user_id}}'
+            query:
+              fields: '{{fields}}'
+  search:
+    params:
+      q:
+        type: str
+        required: true
+      limit:
+        type: int
+        default: 10
+    performs:
+      - perform:
+          action: http.get
+          data:
+            path: '{{supplier_server.url}}/search'
+            query:
+              q: '{{q}}'
+              limit: '{{limit}}'
+  create_item:
+    performs:
+      - perform:
+          action: http.post
+          data:
+            path: '{{supplier_server.url}}/items'
+            body:
+              sku: '{{sku}}'
+              qty: '{{qty}}'
+vars:
+  supplier_server:
+    id: prod
+'''
+
+
+class TestApiIntegratorServerParams:
+    @pytest.fixture(autouse=True)
+    def setup(self, integrator_factory):
+        adapter = FakeAdapter(lambda request: {'url': request.url, 'body': request.body.decode()
+                                               if isinstance(request.body, bytes) else request.body}, LATENCY)
+        self.integrator = integrator_factory(CONFIG, adapter, max_workers=8)
+        self.client = self.integrator.app.test_client()
+
+    def echo(self, response) -> dict:
+        return json.loads(response.get_json()['response'])
+
+    def test_path_and_query_params_are_validated_into_scope(self):
+        response = self.client.get('/get_user/42?fields=email')
+
+        assert response.status_code == 200
+        assert self.echo(response)['url'] == 'https://api.test/users/42?fields=email'
+
+    def test_defaults_fill_missing_params(self):
+        assert self.echo(self.client.get('/search?q=shoes'))['url'] == 'https://api.test/search?q=shoes&limit=10'
+
+    def test_request_params_take_precedence_over_vars(self):
+        self.integrator.vars['q'] = 'from_vars'
+
+        assert self.echo(self.client.get('/search?q=shoes'))['url'] == 'https://api.test/search?q=shoes&limit=10'
+        assert self.integrator.vars['q'] == 'from_vars'
+
+    def test_json_body_params(self):
+        response = self.client.post('/create_item', json={'sku': 'A1', 'qty': 3})
+
+        assert json.loads(self.echo(response)['body']) == {'sku': 'A1', 'qty': 3}
+
+    def test_invalid_params_are_rejected_before_running(self):
+        response = self.client.get('/search?limit=many&extra=1')
+
+        assert response.status_code == 400
+        assert sorted(response.get_json()['errors']) == sorted([
+            "Unknown param 'extra'", "Missing required param 'q'", "Param 'limit' must be of type int"])
+        assert self.client.get('/get_user/me').status_code == 400
+
+    def test_malformed_body_is_rejected(self):
+        response = self.client.post('/create_item', data='[1, 2]', content_type='application/json')
+
+        assert response.status_code == 400
+        assert response.get_json()['error'] == 'JSON body must be an object'
+
+    def test_batch_runs_param_sets_concurrently_as_ndjson(self):
+        items = [{'q': f'item-{i}'} for i in range(8)] + [{'limit': 'x'}]
+
+        started = time.perf_counter()
+        response = self.client.post('/search/batch?limit=5', json=items)
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        elapsed = time.perf_counter() - started
+
+        assert response.mimetype == 'application/x-ndjson'
+        assert elapsed < LATENCY * 4
+        assert sorted(line['index'] for line in lines) == list(range(9))
+        results = {line['index']: line for line in lines}
+        assert all(json.loads(results[i]['response'])['url'] == f'https://api.test/search?q=item-{i}&limit=5'
+                   for i in range(8))
+        assert results[8]['status'] == 'error'
+        assert "Missing required param 'q'" in results[8]['errors']
+
+    def test_batch_body_must_be_a_list(self):
+        response = self.client.post('/search/batch', json={'q': 'shoes'})
+
+        assert response.status_code == 400
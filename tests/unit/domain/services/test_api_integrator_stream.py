@@ -0,0 +1,114 @@
+import asyncio
+import threading
+import pytest
+from aiohttp import web
+
+EXPORT_SIZE = 3 * 1024 * 1024
+
+CONFIG = '''
+api_integrator: 0.0.1
+actions:
+  forward_export:
+    performs:
+      - perform:
+          action: http.get
+          data:
+            path: '{{server}}/export'
+            stream: true
+      - perform:
+          action: http.post
+          data:
+            path: '{{server}}/upload'
+            body: '{{response.stream}}'
+  spool_export:
+    performs:
+      - perform:
+          action: http.get
+          data:
+            path: '{{server}}/export'
+            stream:
+              chunk_size: 8192
+              spool: 1024
+  async_export:
+    performs:
+      - perform:
+          action: http.get
+          data:
+            path: '{{server}}/export'
+            async: true
+            stream:
+              spool: 1024
+'''
+
+
+class ExportServer:
+    def __init__(self):
+        self.uploads = []
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    async def export(self, request):
+        response = web.StreamResponse(headers={'Content-Type': 'application/octet-stream'})
+        await response.prepare(request)
+        for offset in range(0, EXPORT_SIZE, 64 * 1024):
+            await response.write(bytes([offset // (64 * 1024) % 256]) * (64 * 1024))
+        await response.write_eof()
+        return response
+
+    async def upload(self, request):
+        size = 0
+        async for chunk in request.content.iter_any():
+            size += len(chunk)
+        self.uploads.append((size, request.headers.get('Transfer-Encoding')))
+        return web.json_response({'received': size})
+
+    async def _start(self):
+        app = web.Application(client_max_size=EXPORT_SIZE * 2)
+        app.router.add_get('/export', self.export)
+        app.router.add_post('/upload', self.upload)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        return site._server.sockets[0].getsockname()[1]
+
+    def start(self) -> str:
+        self.thread.start()
+        port = asyncio.run_coroutine_threadsafe(self._start(), self.loop).result()
+        return f'http://127.0.0.1:{port}'
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+
+class TestApiIntegratorStream:
+    @pytest.fixture(autouse=True)
+    def setup(self, integrator_factory):
+        self.server = ExportServer()
+        self.integrator = integrator_factory(CONFIG)
+        self.integrator.vars['server'] = self.server.start()
+        yield
+        self.server.stop()
+
+    def test_streamed_body_is_forwarded_without_buffering(self):
+        self.integrator.perform_action('forward_export')
+
+        assert self.server.uploads == [(EXPORT_SIZE, 'chunked')]
+        assert self.integrator.latest_response.json == {'received': EXPORT_SIZE}
+
+    def test_spooled_body_rolls_over_to_disk(self):
+        self.integrator.perform_action('spool_export')
+
+        stream = self.integrator.latest_response.stream
+        assert stream.spooled and stream.file._rolled
+        assert sum(len(chunk) for chunk in stream) == EXPORT_SIZE
+        assert self.integrator.latest_response.response._content is False
+
+    def test_async_stream_is_spooled_on_the_transport_loop(self):
+        self.integrator.perform_action('async_export')
+
+        response = self.integrator.latest_response
+        assert response.stream.spooled and response.stream.file._rolled
+        assert len(response.body) == EXPORT_SIZE
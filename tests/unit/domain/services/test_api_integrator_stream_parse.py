@@ -0,0 +1,100 @@
+import asyncio
+import json
+import threading
+import time
+import pytest
+from aiohttp import web
+
+ITEMS = 12
+
+CONFIG = '''
+api_integrator: 0.0.1
+actions:
+  relay_catalogue:
+    performs:
+      - perform:
+          action: http.get
+          data:
+            path: '{{server}}/catalogue'
+            parse: data[]
+      - perform:
+          action: http.post
+          data:
+            type: bulk_stream
+            items: response.each
+            window: 2
+            wrapper: item
+            path: '{{server}}/items'
+            body:
+              sku: '{{item.sku}}'
+'''
+
+
+class CatalogueServer:
+    def __init__(self):
+        self.uploads = []
+        self.catalogue_done = None
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    async def catalogue(self, request):
+        response = web.StreamResponse(headers={'Content-Type': 'application/json'})
+        await response.prepare(request)
+        await response.write(b'{"total": %d, "data": [' % ITEMS)
+        for i in range(ITEMS):
+            await response.write((',' if i else '').encode() + json.dumps({'sku': f'sku-{i}'}).encode())
+            await asyncio.sleep(0.02)
+        await response.write(b']}')
+        self.catalogue_done = time.perf_counter()
+        await response.write_eof()
+        return response
+
+    async def items(self, request):
+        self.uploads.append((time.perf_counter(), (await request.json())['item']['sku']))
+        return web.json_response({'ok': True})
+
+    async def _start(self):
+        app = web.Application()
+        app.router.add_get('/catalogue', self.catalogue)
+        app.router.add_post('/items', self.items)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        return site._server.sockets[0].getsockname()[1]
+
+    def start(self) -> str:
+        self.thread.start()
+        port = asyncio.run_coroutine_threadsafe(self._start(), self.loop).result()
+        return f'http://127.0.0.1:{port}'
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+
+class TestApiIntegratorStreamParse:
+    @pytest.fixture(autouse=True)
+    def setup(self, integrator_factory):
+        self.server = CatalogueServer()
+        self.integrator = integrator_factory(CONFIG)
+        self.integrator.vars['server'] = self.server.start()
+        yield
+        self.server.stop()
+
+    def test_parsed_items_are_pushed_while_the_fetch_is_still_streaming(self):
+        self.integrator.perform_action('relay_catalogue')
+
+        assert sorted(sku for _, sku in self.server.uploads) == sorted(f'sku-{i}' for i in range(ITEMS))
+        assert self.server.uploads[0][0] < self.server.catalogue_done
+        assert self.integrator.vars['bulk_responses'].succeeded == ITEMS
+
+    def test_fetched_body_is_never_loaded_whole(self):
+        responses = []
+        bind = self.integrator._bind_response
+        self.integrator._bind_response = lambda response, params: (responses.append(response), bind(response, params))
+
+        self.integrator.perform_action('relay_catalogue')
+
+        assert responses[0].response._content is False
@@ -0,0 +1,108 @@
+import asyncio
+import pytest
+
+CONFIG = '''
+api_integrator: 0.0.1
+workflow:
+  concurrency: 3
+  state_path: '{state_path}'
+actions:
+  get_token:
+    performs:
+      - perform:
+          action: http.get
+          data:
+            path: '{{{{server}}}}/items/token'
+        responses:
+          - is_success:
+              code: 200
+            performs:
+              - perform:
+                  action: vars.set
+                  data:
+                    token: '{{{{response.sku}}}}'
+  get_prices:
+    depends_on: get_token
+    performs:
+      - perform:
+          action: http.get
+          data:
+            path: '{{{{server}}}}/items/prices-{{{{token}}}}'
+  get_stock:
+    depends_on: [get_token]
+    performs:
+      - perform:
+          action: http.get
+          data:
+            path: '{{{{server}}}}/items/stock-{{{{token}}}}'
+  get_images:
+    performs:
+      - perform:
+          action: http.get
+          data:
+            path: '{{{{server}}}}/items/images'
+  publish:
+    depends_on: [get_prices, get_stock]
+    performs:
+      - perform: missing.handler
+'''
+
+
+class TestApiIntegratorWorkflow:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path, integrator_factory, latency_adapter):
+        self.state_path = tmp_path / 'workflow.json'
+        self.adapter = latency_adapter
+        self.integrator = integrator_factory(CONFIG.format(state_path=self.state_path), self.adapter)
+        self.integrator.vars['server'] = 'https://api.test'
+
+    def test_actions_run_once_their_dependencies_succeeded(self):
+        result = self.integrator.run_workflow(['get_prices', 'get_stock', 'get_images'])
+        events = self.adapter.events
+
+        assert result.succeeded
+        assert self.integrator.vars['token'] == 'token'
+        assert events.index(('finish', 'token')) < events.index(('start', 'prices-token'))
+        assert events.index(('finish', 'token')) < events.index(('start', 'stock-token'))
+        # Independent chains overlap: images starts before the token is back
+        assert events.index(('start', 'images')) < events.index(('finish', 'token'))
+        assert max(result.durations.values()) < result.elapsed < sum(result.durations.values())
+
+    def test_workflow_block_configures_the_scheduler(self):
+        scheduler = self.integrator.workflow()
+
+        assert scheduler.concurrency == 3
+        assert scheduler.state_path == self.state_path
+        assert scheduler.dependencies['publish'] == ['get_prices', 'get_stock']
+
+    def test_failed_action_is_reported_and_resumable(self):
+        result = self.integrator.run_workflow()
+
+        assert result.statuses['publish'] == 'failed'
+        assert result.names('succeeded') == ['get_token', 'get_prices', 'get_stock', 'get_images']
+        with pytest.raises(ValueError, match='Unknown action: missing.handler'):
+            result.raise_for_failures()
+
+        resumed = self.integrator.run_workflow(resume=True)
+
+        assert resumed.names('resumed') == ['get_token', 'get_prices', 'get_stock', 'get_images']
+        assert resumed.statuses['publish'] == 'failed'
+
+    def test_unknown_dependency_is_rejected(self):
+        with pytest.raises(ValueError, match="'missing' not found"):
+            self.integrator.run_workflow(['missing'])
+
+
+class TestApiIntegratorWorkflowAsync:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path, integrator_factory, slow_server):
+        self.server = slow_server
+        self.integrator = integrator_factory(CONFIG.format(state_path=tmp_path / 'workflow.json'))
+        self.integrator.vars['server'] = slow_server.url
+
+    def test_workflow_runs_as_tasks_on_the_loop(self):
+        result = asyncio.run(self.integrator.run_workflow_async(['get_prices', 'get_stock', 'get_images']))
+
+        assert result.succeeded
+        assert result.elapsed < sum(result.durations.values())
+        assert self.server.hits == {'token': 1, 'images': 1, 'prices-token': 1, 'stock-token': 1}
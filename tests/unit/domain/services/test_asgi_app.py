@@ -0,0 +1,197 @@
+import asyncio
+import json
+import threading
+import time
+import pytest
+import requests
+from aiohttp import web
+from src.domain.services.asgi_app import AsgiApp
+
+CONFIG = '''
+api_integrator: 0.0.1
+as_server: true
+server_mode: asgi
+actions:
+  get_item:
+    performs:
+      - perform:
+          action: http.get
+          data:
+            path: '{{server}}/items/A1'
+            coalesce: false
+  get_sku:
+    params:
+      sku:
+        type: str
+        in: path
+    performs:
+      - perform:
+          action: http.get
+          data:
+            path: '{{server}}/items/{{sku}}'
+            coalesce: false
+  create_item:
+    performs:
+      - perform:
+          action: http.post
+          data:
+            path: '{{server}}/items/missing/nested'
+'''
+
+
+async def call(app, method: str, path: str, body: bytes = b'', query_string: bytes = b'', sent: list = None) -> tuple:
+    sent = [] if sent is None else sent
+    chunks = [body[:1], body[1:]]
+
+    async def receive():
+        return {'type': 'http.request', 'body': chunks.pop(0), 'more_body': bool(chunks)}
+
+    async def send(message):
+        sent.append(message)
+
+    await app({'type': 'http', 'method': method, 'path': path, 'query_string': query_string, 'headers': []},
+              receive, send)
+    body = b''.join(message.get('body', b'') for message in sent[1:])
+    if dict(sent[0]['headers'])[b'content-type'] == b'application/x-ndjson':
+        return sent[0]['status'], [json.loads(line) for line in body.splitlines()]
+    return sent[0]['status'], json.loads(body)
+
+
+class TestAsgiApp:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.app = AsgiApp()
+
+        async def view(endpoint_request):
+            return {'ok': True, **endpoint_request.path_params}, 200
+
+        self.app.add_url_rule('/ping', 'ping', view, methods=['GET'])
+
+    def test_routes_to_view(self):
+        assert asyncio.run(call(self.app, 'GET', '/ping')) == (200, {'ok': True})
+
+    def test_path_segments_and_request_data_reach_the_view(self):
+        async def view(endpoint_request):
+            return {'query': endpoint_request.query_params(), 'body': endpoint_request.json(),
+                    'path': endpoint_request.path_params}, 200
+
+        self.app.add_url_rule('/users/<user_id>', 'users', view, methods=['POST'])
+
+        status, payload = asyncio.run(call(self.app, 'POST', '/users/7', b'{"a": 1}', b'page=2'))
+
+        assert payload == {'query': {'page': '2'}, 'body': {'a': 1}, 'path': {'user_id': '7'}}
+
+    def test_async_iterator_payload_is_streamed(self):
+        async def lines():
+            for i in range(3):
+                yield json.dumps({'index': i}) + '\n'
+
+        async def view(endpoint_request):
+            return lines(), 200
+
+        self.app.add_url_rule('/lines', 'lines', view, methods=['POST'])
+        sent = []
+
+        status, payload = asyncio.run(call(self.app, 'POST', '/lines', sent=sent))
+
+        assert payload == [{'index': 0}, {'index': 1}, {'index': 2}]
+        assert [message.get('more_body', False) for message in sent[1:]] == [True, True, True, False]
+
+    def test_unknown_path_and_method(self):
+        assert asyncio.run(call(self.app, 'GET', '/missing'))[0] == 404
+        assert asyncio.run(call(self.app, 'POST', '/ping'))[0] == 405
+
+    def test_lifespan_completes(self):
+        messages = [{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message['type'])
+
+        asyncio.run(self.app({'type': 'lifespan'}, receive, send))
+
+        assert sent == ['lifespan.startup.complete', 'lifespan.shutdown.complete']
+
+
+class TestApiIntegratorAsgiMode:
+    @pytest.fixture(autouse=True)
+    def setup(self, integrator_factory, slow_server):
+        self.server = slow_server
+        self.integrator = integrator_factory(CONFIG)
+        self.integrator.vars['server'] = slow_server.url
+
+    def test_server_mode_registers_action_routes(self):
+        assert isinstance(self.integrator.app, AsgiApp)
+        assert self.integrator.app.routes['/get_item'][0] == ['GET']
+        assert self.integrator.app.routes['/create_item'][0] == ['POST']
+
+    def test_concurrent_requests_are_served_without_a_thread_each(self):
+        async def run_all():
+            return await asyncio.gather(*(call(self.integrator.app, 'GET', '/get_item') for _ in range(10)))
+
+        threads = threading.active_count()
+        started = time.perf_counter()
+        results = asyncio.run(run_all())
+
+        assert time.perf_counter() - started < self.server.latency * 4
+        assert threading.active_count() <= threads + 1
+        assert all(result == (200, {'status': 'success', 'action': 'get_item', 'response': '{"sku": "A1"}'})
+                   for result in results)
+
+    def test_path_params_are_validated_into_scope(self):
+        status, payload = asyncio.run(call(self.integrator.app, 'GET', '/get_sku/B7'))
+
+        assert json.loads(payload['response']) == {'sku': 'B7'}
+        assert asyncio.run(call(self.integrator.app, 'GET', '/get_sku/B7', query_string=b'x=1'))[0] == 400
+
+    def test_batch_streams_concurrent_results(self):
+        body = json.dumps([{'sku': f's{i}'} for i in range(10)]).encode()
+
+        started = time.perf_counter()
+        status, lines = asyncio.run(call(self.integrator.app, 'POST', '/get_sku/batch', body))
+
+        assert time.perf_counter() - started < self.server.latency * 3
+        assert sorted(line['index'] for line in lines) == list(range(10))
+        assert all(json.loads(line['response']) == {'sku': f"s{line['index']}"} for line in lines)
+
+    def test_failed_action_reports_error(self):
+        self.integrator.vars['server'] = 'http://127.0.0.1:1'
+
+        status, payload = asyncio.run(call(self.integrator.app, 'GET', '/get_item'))
+
+        assert status == 500
+        assert payload['status'] == 'error'
+
+    def test_served_through_aiohttp(self):
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+
+        async def start():
+            runner = web.AppRunner(self.integrator.app.to_aiohttp())
+            await runner.setup()
+            site = web.TCPSite(runner, '127.0.0.1', 0)
+            await site.start()
+            return runner, site._server.sockets[0].getsockname()[1]
+
+        runner, port = asyncio.run_coroutine_threadsafe(start(), loop).result()
+        try:
+            response = requests.get(f'http://127.0.0.1:{port}/get_item')
+            missing = requests.get(f'http://127.0.0.1:{port}/nope')
+            batch = requests.post(f'http://127.0.0.1:{port}/get_sku/batch', json=[{'sku': 'a'}, {'sku': 'b'}],
+                                  stream=True)
+            lines = [json.loads(line) for line in batch.iter_lines()]
+        finally:
+            asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+
+        assert response.status_code == 200
+        assert response.headers['Content-Type'] == 'application/json'
+        assert json.loads(response.json()['response']) == {'sku': 'A1'}
+        assert missing.status_code == 404
+        assert batch.headers['Content-Type'] == 'application/x-ndjson'
+        assert sorted(line['index'] for line in lines) == [0, 1]
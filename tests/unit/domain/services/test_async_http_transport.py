@@ -0,0 +1,109 @@
+import asyncio
+import threading
+import aiohttp
+import pytest
+from aiohttp import web
+from src.domain.services.async_http_transport import AsyncHttpTransport
+
+
+class LocalServer:
+    def __init__(self):
+        self.peers = []
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    async def handle(self, request):
+        self.peers.append(request.transport.get_extra_info('peername'))
+        return web.json_response({'path': request.path})
+
+    async def _start(self):
+        app = web.Application()
+        app.router.add_route('*', '/{tail:.*}', self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        return site._server.sockets[0].getsockname()[1]
+
+    def start(self) -> str:
+        self.thread.start()
+        port = asyncio.run_coroutine_threadsafe(self._start(), self.loop).result()
+        return f'http://127.0.0.1:{port}'
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+
+class TestAsyncHttpTransport:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.server = LocalServer()
+        self.base_url = self.server.start()
+        self.transport = AsyncHttpTransport(limit_per_host=2)
+        yield
+        self.transport.close()
+        self.server.stop()
+
+    def test_request_returns_api_response(self):
+        response = self.transport.run(self.transport.request('GET', f'{self.base_url}/items'))
+
+        assert response.status_code == 200
+        assert response.json == {'path': '/items'}
+        assert response.headers['content-type'].startswith('application/json')
+
+    def test_session_default_timeout_applies_unless_one_is_configured(self, monkeypatch):
+        sent = []
+        request = aiohttp.ClientSession.request
+        monkeypatch.setattr(aiohttp.ClientSession, 'request',
+                            lambda session, *args, **kwargs: sent.append(kwargs) or request(session, *args, **kwargs))
+
+        self.transport.run(self.transport.request('GET', f'{self.base_url}/items'))
+        self.transport.run(self.transport.request('GET', f'{self.base_url}/items', timeout=(5, 30)))
+
+        assert 'timeout' not in sent[0]
+        assert (sent[1]['timeout'].sock_connect, sent[1]['timeout'].sock_read) == (5, 30)
+
+    def test_sequential_requests_reuse_connection(self):
+        for _ in range(5):
+            self.transport.run(self.transport.request('GET', f'{self.base_url}/items'))
+
+        assert len(self.server.peers) == 5
+        assert len(set(self.server.peers)) == 1
+
+    def test_concurrent_requests_share_one_session(self):
+        async def burst():
+            return await asyncio.gather(*(self.transport.request('GET', f'{self.base_url}/{i}') for i in range(10)))
+
+        responses = self.transport.run(burst())
+
+        assert [r.json['path'] for r in responses] == [f'/{i}' for i in range(10)]
+        assert len(set(self.server.peers)) <= 2
+
+    def test_close_releases_loop_and_session(self):
+        self.transport.run(self.transport.request('GET', f'{self.base_url}/items'))
+        self.transport.close()
+
+        assert self.transport._loop is None
+        assert self.transport._session is None
+
+    def test_from_config_ignores_unknown_keys(self):
+        transport = AsyncHttpTransport.from_config({'limit_per_host': 4, 'unknown': 1})
+
+        assert transport.connector_options['limit_per_host'] == 4
+
+    def test_run_async_awaits_on_transport_loop_from_another_loop(self):
+        async def caller():
+            return await self.transport.run_async(self.transport.request('GET', f'{self.base_url}/items'))
+
+        response = asyncio.run(caller())
+
+        assert response.json == {'path': '/items'}
+
+    def test_run_from_transport_loop_raises_instead_of_deadlocking(self):
+        async def blocking():
+            return self.transport.run(self.transport.request('GET', f'{self.base_url}/items'))
+
+        with pytest.raises(RuntimeError, match='run_async'):
+            self.transport.run(blocking())
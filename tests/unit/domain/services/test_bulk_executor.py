@@ -0,0 +1,182 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import patch
+import pytest
+from src.domain.services.bulk_executor import BulkExecutor
+from tests.unit.domain.services.conftest import FakeAdapter
+
+CONFIG = '''
+api_integrator: 0.0.1
+supplier_servers:
+  - id: prod
+    url: https://api.test
+actions:
+  push_catalogue:
+    performs:
+      - perform:
+          action: http.post
+          data:
+            type: bulk_stream
+            window: 3
+            items: catalogue
+            wrapper: item
+            path: '{{supplier_server.url}}/items'
+            body:
+              sku: '{{item.sku}}'
+        responses:
+          - is_success:
+              code: 200
+            performs:
+              - perform:
+                  action: log.info
+                  data: 'Pushed {{item.sku}}'
+  push_batches:
+    performs:
+      - perform:
+          action: http.post
+          data:
+            type: bulk
+            batch_size: 3
+            items: catalogue
+            item_id: sku
+            wrapper: item
+            path: '{{supplier_server.url}}/batch'
+vars:
+  supplier_server:
+    id: prod
+'''
+
+
+class TestBulkExecutor:
+    @pytest.fixture(autouse=True)
+    def setup(self, integrator_factory):
+        self.delays = None
+        self.batches = []
+        self.batch_echo = True
+        self.transport = FakeAdapter(self.reply)
+        self.integrator = integrator_factory(CONFIG, self.transport)
+        self.pulled = 0
+
+    def reply(self, request):
+        '''Items answer after their delay (500 for `bad`); a batch echoes a status per item, or one for the batch'''
+        item = json.loads(request.body)['item']
+        if request.url.endswith('/batch'):
+            self.batches.append(item)
+            echo = [{'sku': entry['sku'], 'status': 422 if entry['sku'] == 'bad' else 201} for entry in item]
+            return (207, echo, {}) if self.batch_echo else {'accepted': True}
+        sku = item['sku']
+        time.sleep(self.delays[int(sku.split('-')[-1]) if '-' in sku else 2] if self.delays else 0.01)
+        return 500 if sku == 'bad' else 200, f'{{"sku": "{sku}"}}'.encode('utf-8'), {}
+
+    def catalogue(self, size, bad=()):
+        for i in range(size):
+            self.pulled += 1
+            yield {'sku': 'bad' if i in bad else f'sku-{i}'}
+
+    def slow_response(self):
+        time.sleep(0.005)
+        return SimpleNamespace(status_code=200, body='')
+
+    def test_executor_keeps_window_bounded(self):
+        in_flight = []
+        completed = []
+
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            def submit(item):
+                in_flight.append(self.pulled - len(completed))
+                return executor.submit(self.slow_response)
+
+            result = BulkExecutor(window=2).run(self.catalogue(20), submit,
+                                                lambda index, item, response: completed.append(index))
+
+        assert max(in_flight) == 2
+        assert result.succeeded == 20
+
+    def test_executor_records_exceptions_as_failures(self):
+        def fail(item):
+            raise RuntimeError(f"boom {item['sku']}")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            result = BulkExecutor(window=2).run(self.catalogue(3), lambda item: executor.submit(fail, item),
+                                                lambda *args: None)
+
+        assert result.failed == 3
+        assert result.failures[1] == {'error': 'boom sku-1'}
+
+    def test_bulk_stream_consumes_lazy_items_with_bounded_window(self):
+        self.integrator.vars['catalogue'] = self.catalogue(30)
+
+        self.integrator.perform_action('push_catalogue')
+
+        assert len(self.transport.sent) == 30
+        assert self.transport.peak <= 3
+        assert self.integrator.vars['bulk_responses'].total == 30
+
+    def test_bulk_stream_runs_responses_as_each_item_completes(self):
+        self.integrator.vars['catalogue'] = self.catalogue(5)
+
+        seen = []
+        with patch.object(self.integrator, '_handle_log',
+                          side_effect=lambda command, data, params: seen.append(params['item']['sku'])):
+            self.integrator.perform_action('push_catalogue')
+
+        assert sorted(seen) == [f'sku-{i}' for i in range(5)]
+
+    def test_bulk_stream_keeps_only_counts_and_failures(self):
+        self.integrator.vars['catalogue'] = self.catalogue(6, bad={2, 4})
+
+        self.integrator.perform_action('push_catalogue')
+
+        result = self.integrator.vars['bulk_responses']
+        assert (result.total, result.succeeded, result.failed) == (6, 4, 2)
+        assert set(result.failures) == {2, 4}
+        assert result.failures[2] == {'status_code': 500, 'body': '{"sku": "bad"}'}
+
+    def test_bulk_results_follow_item_order(self):
+        delays = [0.05, 0.0, 0.03, 0.01]
+        self.delays = delays
+        self.integrator.vars['catalogue'] = self.catalogue(4, bad={2})
+
+        self.integrator.perform_action('push_catalogue')
+
+        result = self.integrator.vars['bulk_responses']
+        assert list(result.status_codes) == [200, 200, 500, 200]
+        assert all(result.latencies[i] >= delays[i] for i in range(4))
+
+    def test_bulk_stream_rejects_non_iterable_items(self):
+        self.integrator.vars['catalogue'] = 'not items'
+
+        with pytest.raises(ValueError):
+            self.integrator.perform_action('push_catalogue')
+
+    def test_batch_size_chunks_items_under_wrapper(self):
+        self.integrator.vars['catalogue'] = self.catalogue(7)
+
+        self.integrator.perform_action('push_batches')
+
+        assert len(self.transport.sent) == 3
+        assert sorted(len(batch) for batch in self.batches) == [1, 3, 3]
+        assert sorted(item['sku'] for batch in self.batches for item in batch) == \
+            sorted(f'sku-{i}' for i in range(7))
+
+    def test_batch_results_are_split_back_per_item(self):
+        self.integrator.vars['catalogue'] = self.catalogue(5, bad={3})
+
+        self.integrator.perform_action('push_batches')
+
+        result = self.integrator.vars['bulk_responses']
+        assert list(result.status_codes) == [201, 201, 201, 422, 201]
+        assert result.by_id('bad')['failure'] == {'status_code': 422, 'body': '{"sku": "bad", "status": 422}',
+                                                  'id': 'bad'}
+
+    def test_batch_without_array_response_applies_batch_status_to_items(self):
+        self.batch_echo = False
+        self.integrator.vars['catalogue'] = self.catalogue(4)
+
+        self.integrator.perform_action('push_batches')
+
+        result = self.integrator.vars['bulk_responses']
+        assert list(result.status_codes) == [200, 200, 200, 200]
+        assert result.ids == ['sku-0', 'sku-1', 'sku-2', 'sku-3']
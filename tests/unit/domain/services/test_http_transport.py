@@ -0,0 +1,94 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+from src.domain.services.http_transport import HttpTransport
+from src.domain.value_objects.obj_utils import Obj
+
+CONFIG = '''
+api_integrator: 0.0.1
+supplier_servers:
+  - id: prod
+    url: https://api.supplier.test
+  - id: slow
+    url: https://slow.supplier.test/
+    transport:
+      pool_maxsize: 4
+      read_timeout: 120
+transport:
+  pool_maxsize: 32
+  connect_timeout: 5
+actions: {}
+'''
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.path == '/slow':
+            time.sleep(0.2)
+        body = b'ok'
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestHttpTransport:
+    @pytest.fixture(autouse=True)
+    def setup(self, integrator_factory):
+        self.integrator = integrator_factory(CONFIG)
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), SlowHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f'http://127.0.0.1:{self.server.server_port}'
+        yield
+        self.server.shutdown()
+
+    def test_connector_config_provides_defaults(self, integrator_factory):
+        integrator = integrator_factory('api_integrator: 0.0.1\nactions: {}\n')
+
+        assert integrator.max_workers == 10
+        assert integrator.http_transport.timeout_for('https://any.host/x') == (30, 30)
+
+    def test_top_level_transport_overrides_defaults(self):
+        assert self.integrator.http_transport.adapters['https://'].pool_maxsize == 32
+        assert self.integrator.http_transport.timeout_for('https://api.supplier.test/items') == (5, 30)
+
+    def test_supplier_server_transport_overrides_top_level(self):
+        adapter = self.integrator.http_transport.adapters['https://slow.supplier.test']
+
+        assert adapter.pool_maxsize == 4
+        assert self.integrator.session.get_adapter('https://slow.supplier.test/items') is adapter
+        assert self.integrator.http_transport.timeout_for('https://slow.supplier.test/items') == (5, 120)
+
+    def test_stats_count_connection_reuse(self):
+        for _ in range(3):
+            self.integrator.http_transport.request('GET', f'{self.base_url}/fast')
+
+        stats = self.integrator.transport_stats()['http://']
+        assert stats['requests'] == 3
+        assert stats['connections'] == 1
+        assert stats['reused'] == 2
+
+    def test_stats_count_pool_saturation(self):
+        transport = HttpTransport(requests.Session(), {'pool_maxsize': 1, 'pool_block': True})
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            list(executor.map(lambda _: transport.request('GET', f'{self.base_url}/slow'), range(3)))
+
+        stats = transport.stats()['http://']
+        assert stats['peak_in_flight'] == 3
+        assert stats['saturated'] == 2
+        assert stats['connections'] == 1
+
+    def test_server_without_transport_uses_shared_adapter(self):
+        transport = HttpTransport(requests.Session(), {}, [Obj({'id': 'prod', 'url': 'https://a.test'})])
+
+        assert set(transport.adapters) == {'http://', 'https://'}
+        assert transport.timeout_for('https://a.test') is None
@@ -0,0 +1,107 @@
+import pytest
+from src.domain.services.oas_to_ais_mapper import OasToApiIntegratorSpecificationMapper
+from src.domain.value_objects.obj_utils import Obj
+
+SPEC = '''
+openapi: 3.0.0
+info:
+  title: Catalogue
+  version: 1.0.0
+paths:
+  /products:
+    get:
+      summary: List products
+      responses:
+        '200':
+          description: Products
+          content:
+            application/json:
+              schema:
+                type: array
+                items:
+                  type: object
+                  properties:
+                    sku: {type: string}
+        '404':
+          description: Missing
+  /prices:
+    get:
+      summary: Price list
+      responses:
+        '200':
+          description: Prices
+          content:
+            application/xml:
+              schema:
+                type: array
+                items:
+                  type: object
+                  xml: {name: Producto}
+                  properties:
+                    clave: {type: string}
+  /status:
+    get:
+      summary: Status
+      responses:
+        '200':
+          description: Status
+          content:
+            application/json:
+              schema:
+                type: object
+                properties:
+                  ok: {type: boolean}
+'''
+
+
+class TestOasToAisMapper:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        spec_path = tmp_path / 'catalogue.yml'
+        spec_path.write_text(SPEC)
+        self.mapper = OasToApiIntegratorSpecificationMapper(str(spec_path))
+        self.actions = self.mapper._map_actions()
+
+    def test_array_sample_response_is_pushed_as_a_bulk_stream(self):
+        schema = Obj({'type': 'array', 'items': {'type': 'object', 'properties': {'sku': {}, 'name': {}}}})
+
+        push = self.mapper._create_sample_response_performs(schema, 'json')[-1]['perform']
+
+        assert push['action'] == 'http.post'
+        assert push['data']['type'] == 'bulk_stream'
+        assert push['data']['items'] == 'response.each'
+        assert push['data']['body'] == {'sku': '{{item.sku}}', 'name': '{{item.name}}'}
+
+    def test_object_sample_response_is_pushed_once(self):
+        schema = Obj({'type': 'object', 'properties': {'sku': {}}})
+
+        push = self.mapper._create_sample_response_performs(schema, 'xml')[-1]['perform']
+
+        assert 'type' not in push['data']
+        assert push['data']['body'] == {'sku': '{{response.xml.sku}}'}
+
+    def test_array_response_is_parsed_by_the_fetch_and_pushed_on_success_only(self):
+        fetch, = self.actions['list_products']['performs']
+        success, missing = fetch['responses']
+        _, log, push = success['performs']
+
+        assert fetch['perform']['data']['parse'] == 'json[]'
+        assert success['is_success'] == {'code': 200}
+        assert push['perform']['data']['items'] == 'response.each'
+        assert log['perform']['action'] == 'log.info'
+        assert [perform['perform']['action'] for perform in missing['performs']] == ['log.error']
+
+    def test_streamed_success_response_leaves_the_body_unread(self):
+        success, missing = self.actions['list_products']['performs'][0]['responses']
+
+        assert success['performs'][0] == {'perform': {'action': 'log.info', 'data': 'Response: 200'}}
+        assert missing['performs'][0]['perform']['data'] == 'Response: {{response.body}}'
+
+    def test_xml_array_is_parsed_by_its_item_tag(self):
+        assert self.actions['price_list']['performs'][0]['perform']['data']['parse'] == 'Producto'
+
+    def test_object_response_is_not_parsed(self):
+        performs = self.actions['status']['performs']
+
+        assert len(performs) == 1
+        assert 'parse' not in performs[0]['perform']['data']
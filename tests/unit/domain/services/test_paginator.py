@@ -0,0 +1,118 @@
+import json
+import threading
+import time
+import pytest
+import requests
+from src.domain.services.paginator import Paginator
+from src.domain.value_objects.api_response import ApiResponse
+
+USERS = [{'id': i} for i in range(1, 8)]
+
+
+def api_response(payload, status_code=200, url='https://api.test/users', link=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers['Content-Type'] = 'application/json'
+    if link:
+        response.headers['Link'] = f'<{link}>; rel="next"'
+    response._content = json.dumps(payload).encode('utf-8')
+    response.url = url
+    return ApiResponse(response)
+
+
+class TestPaginator:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.requests = []
+
+    def fetch(self, serve):
+        def record(url, query):
+            self.requests.append((url, dict(query)))
+            return serve(url, query)
+        return record
+
+    def pages(self, options, serve, query=None):
+        return list(Paginator(options, self.fetch(serve)).pages('https://api.test/users', query or {}))
+
+    def test_page_style_stops_at_total_pages(self):
+        serve = lambda url, query: api_response({'total_pages': 3, 'data': USERS[(query['page'] - 1) * 3:][:3]})
+
+        pages = self.pages({'items': 'data', 'total_pages': 'total_pages', 'size_param': 'per_page', 'size': 3}, serve)
+
+        assert [page.json['data'][0]['id'] for page in pages] == [1, 4, 7]
+        assert [query for _, query in self.requests] == [{'per_page': 3, 'page': page} for page in (1, 2, 3)]
+
+    def test_page_style_drops_the_empty_page_that_ends_the_listing(self):
+        serve = lambda url, query: api_response({'data': USERS[(query['page'] - 1) * 4:][:4]})
+
+        pages = self.pages({'items': 'data'}, serve)
+
+        assert len(pages) == 2
+        assert len(self.requests) == 3
+
+    def test_short_page_is_the_last_one(self):
+        serve = lambda url, query: api_response(USERS[query['offset']:][:5])
+
+        pages = self.pages({'style': 'offset', 'items': 'json', 'size': 5}, serve)
+
+        assert [len(page.json) for page in pages] == [5, 2]
+        assert [query['offset'] for _, query in self.requests] == [0, 5]
+
+    def test_cursor_style_follows_the_response_cursor(self):
+        cursors = {None: ('b', USERS[:3]), 'b': ('c', USERS[3:6]), 'c': (None, USERS[6:])}
+        serve = lambda url, query: api_response({'meta': {'next': cursors[query.get('cursor')][0]},
+                                                 'data': cursors[query.get('cursor')][1]})
+
+        pages = self.pages({'style': 'cursor', 'next': 'meta.next'}, serve, {'limit': '3'})
+
+        assert len(pages) == 3
+        assert self.requests[1][1] == {'limit': '3', 'cursor': 'b'}
+
+    def test_link_style_follows_relative_next_links(self):
+        links = {'https://api.test/users': '/users?page=2', 'https://api.test/users?page=2': None}
+        serve = lambda url, query: api_response([], url=url, link=links[url])
+
+        pages = self.pages({'style': 'link'}, serve, {'active': 'true'})
+
+        assert [url for url, _ in self.requests] == ['https://api.test/users', 'https://api.test/users?page=2']
+        assert self.requests[1][1] == {}
+        assert len(pages) == 2
+
+    def test_error_status_ends_the_walk_after_handing_it_out(self):
+        serve = lambda url, query: api_response({'data': [1]}, status_code=503 if query['page'] == 2 else 200)
+
+        pages = self.pages({'items': 'data', 'max_pages': 10}, serve)
+
+        assert [page.status_code for page in pages] == [200, 503]
+
+    def test_prefetch_downloads_the_next_page_while_one_is_handled(self):
+        fetched = threading.Event()
+
+        def serve(url, query):
+            if query['page'] == 2:
+                fetched.set()
+            return api_response({'data': [query['page']]})
+
+        paginator = Paginator({'items': 'data', 'max_pages': 2, 'prefetch': True}, self.fetch(serve))
+        pages = paginator.pages('https://api.test/users', {})
+        next(pages)
+
+        assert fetched.wait(1)
+        assert len(list(pages)) == 1
+
+    def test_without_prefetch_pages_are_fetched_on_demand(self):
+        serve = lambda url, query: api_response({'data': [query['page']]})
+        pages = Paginator({'items': 'data', 'max_pages': 3}, self.fetch(serve)).pages('https://api.test/users', {})
+
+        next(pages)
+        time.sleep(0.05)
+
+        assert len(self.requests) == 1
+
+    def test_unbounded_walks_are_rejected(self):
+        with pytest.raises(ValueError):
+            Paginator({'style': 'page'}, self.fetch(None))
+        with pytest.raises(ValueError):
+            Paginator({'style': 'offset', 'max_pages': 3}, self.fetch(None))
+        with pytest.raises(ValueError):
+            Paginator({'style': 'scroll'}, self.fetch(None))
@@ -0,0 +1,95 @@
+import pytest
+import yaml
+from src.domain.services.perform_planner import footprint, plan_waves
+from src.domain.value_objects.obj_utils import Obj
+
+ACTIONS = '''
+get_product:
+  performs:
+    - perform:
+        action: http.get
+        data:
+          path: '{{server}}/products/{{sku}}'
+      responses:
+        - is_success:
+            code: 200
+          performs:
+            - perform:
+                action: vars.set
+                data:
+                  product_name: '{{response.name}}'
+    - perform:
+        action: http.get
+        data:
+          path: '{{server}}/products/{{sku}}/images'
+    - perform:
+        action: http.get
+        data:
+          path: '{{server}}/stock/{{sku}}'
+    - perform:
+        action: http.post
+        data:
+          path: '{{server}}/summary'
+          body:
+            name: '{{product_name}}'
+            images: '{{response.count}}'
+    - perform:
+        action: log.info
+        data: 'Done {{sku}}'
+notify:
+  performs:
+    - perform: log.info
+      data: 'notified'
+'''
+
+
+class TestPerformPlanner:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.actions = Obj(yaml.safe_load(ACTIONS))
+        self.performs = self.actions.get_product.performs
+
+    def test_footprint_reads_templates_and_writes_bound_and_set_keys(self):
+        product = footprint(self.performs[0], self.actions)
+
+        assert product.reads == {'server', 'sku'}
+        assert {'response', 'product_name'} <= product.writes
+        assert not product.barrier
+
+    def test_independent_fetches_share_a_wave(self):
+        assert plan_waves(self.performs, self.actions) == [[0, 1, 2], [3], [4]]
+
+    def test_writes_before_reads_keep_order(self):
+        performs = [Obj({'perform': 'vars.set', 'data': {'sku': 'A1'}}),
+                    Obj({'perform': {'action': 'http.get', 'data': {'path': '/p/{{sku}}'}}}),
+                    Obj({'perform': {'action': 'http.get', 'data': {'path': '/q'}}})]
+
+        assert plan_waves(performs, self.actions) == [[0, 2], [1]]
+
+    def test_reads_before_overwrites_keep_order(self):
+        performs = [Obj({'perform': {'action': 'http.get', 'data': {'path': '/a'}}}),
+                    Obj({'perform': {'action': 'vars.set', 'data': {'seen': '{{response.id}}'}}}),
+                    Obj({'perform': {'action': 'http.get', 'data': {'path': '/b'}}})]
+
+        assert plan_waves(performs, self.actions) == [[0], [1], [2]]
+
+    def test_action_calls_and_logs_are_barriers(self):
+        performs = [Obj({'perform': {'action': 'http.get', 'data': {'path': '/a'}}}),
+                    Obj({'perform': 'notify'}),
+                    Obj({'perform': {'action': 'http.get', 'data': {'path': '/b'}}}),
+                    Obj({'perform': {'action': 'http.get', 'data': {'path': '/c'}}})]
+
+        assert plan_waves(performs, self.actions) == [[0], [1], [2, 3]]
+
+    def test_loop_keys_of_bulk_bodies_are_not_reads(self):
+        bulk = Obj({'perform': {'action': 'http.post', 'data': {'type': 'bulk', 'items': 'skus',
+                                                                  'body': {'sku': '{{item.sku}}'}}}})
+
+        assert footprint(bulk, self.actions).reads == {'skus'}
+
+    def test_bare_items_key_waits_for_the_perform_setting_it(self):
+        performs = [Obj({'perform': {'action': 'vars.set', 'data': {'products': '{{catalog}}'}}}),
+                    Obj({'perform': {'action': 'http.post', 'data': {'type': 'bulk', 'items': 'products',
+                                                                     'path': '/products'}}})]
+
+        assert plan_waves(performs, self.actions) == [[0], [1]]
@@ -0,0 +1,131 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+import pytest
+from src.domain.services.rate_limiter import RateLimiter, RateLimits, retry_after_seconds
+from src.domain.value_objects.obj_utils import Obj
+
+
+class TestRateLimiter:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def hold(self, seconds=0.02):
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(seconds)
+        with self.lock:
+            self.in_flight -= 1
+
+    def test_burst_goes_through_then_requests_are_paced(self):
+        limiter = RateLimiter(rps=50, burst=5)
+        started = time.perf_counter()
+        for _ in range(15):
+            limiter.acquire()
+            limiter.release()
+
+        assert 0.18 <= time.perf_counter() - started < 0.5
+        assert limiter.stats()['waited'] > 0
+
+    def test_bucket_is_shared_between_threads(self):
+        limiter = RateLimiter(rps=100, burst=1)
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: limiter.acquire(), range(21)))
+
+        assert time.perf_counter() - started >= 0.19
+
+    def test_concurrency_is_capped_across_threads(self):
+        limiter = RateLimiter(max_concurrency=3)
+
+        def call(_):
+            with limiter:
+                self.hold()
+
+        with ThreadPoolExecutor(max_workers=10) as pool:
+            list(pool.map(call, range(20)))
+
+        assert self.peak == 3
+        assert limiter.in_flight == 0
+
+    def test_concurrency_is_shared_with_the_async_path(self):
+        limiter = RateLimiter(max_concurrency=2)
+
+        async def call():
+            await limiter.acquire_async()
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, self.hold)
+            finally:
+                limiter.release()
+
+        def threaded():
+            with limiter:
+                self.hold()
+
+        async def burst():
+            await asyncio.gather(*(call() for _ in range(6)))
+
+        thread = threading.Thread(target=lambda: [threaded() for _ in range(6)])
+        thread.start()
+        asyncio.run(burst())
+        thread.join()
+
+        assert self.peak == 2
+        assert limiter.in_flight == 0
+
+    def test_cancelled_async_waiter_gives_its_slot_back(self):
+        limiter = RateLimiter(max_concurrency=1)
+
+        async def scenario():
+            await limiter.acquire_async()
+            waiting = asyncio.ensure_future(limiter.acquire_async())
+            await asyncio.sleep(0)
+            waiting.cancel()
+            await asyncio.gather(waiting, return_exceptions=True)
+            limiter.release()
+
+        asyncio.run(scenario())
+
+        assert limiter.in_flight == 0
+
+    def test_retry_after_pauses_every_caller(self):
+        limiter = RateLimiter(rps=1000, burst=10)
+        limiter.observe(429, {'Retry-After': '0.1'})
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            list(pool.map(lambda _: limiter.acquire(), range(3)))
+
+        assert time.perf_counter() - started >= 0.09
+        assert limiter.stats()['throttled'] == 1
+
+    def test_unthrottled_responses_do_not_pause(self):
+        limiter = RateLimiter(rps=10)
+        limiter.observe(200, {'Retry-After': '5'})
+        limiter.observe(503, {})
+
+        assert limiter.blocked_until == 0.0
+
+    def test_retry_after_formats(self):
+        assert retry_after_seconds('3') == 3.0
+        assert 1 < retry_after_seconds(formatdate(time.time() + 3, usegmt=True)) <= 3
+        assert retry_after_seconds('soon') is None
+        assert retry_after_seconds(None) is None
+
+    def test_limits_are_matched_by_server_url(self):
+        limits = RateLimits.from_servers([
+            Obj({'id': 'cva', 'url': 'https://www.grupocva.com/', 'rate_limit': {'rps': 5}}),
+            Obj({'id': 'cva_orders', 'url': 'https://www.grupocva.com/pedidos_web', 'rate_limit': {'rps': 1}}),
+            Obj({'id': 'free', 'url': 'https://free.test'}),
+        ])
+
+        assert limits.for_url('https://www.grupocva.com/pedidos_web/pedidos_ws_cva.php').rps == 1
+        assert limits.for_url('https://WWW.grupocva.com/catalogo_clientes_xml').rps == 5
+        assert limits.for_url('https://free.test/items') is None
@@ -0,0 +1,130 @@
+import json
+import time
+from datetime import timedelta
+import pytest
+import requests
+from src.domain.services.response_cache import CachedResponse, ResponseCache
+
+
+def raw_response(content=b'{"brands": []}', status_code=200, headers=None, elapsed=0.25):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update({'Content-Type': 'application/json', **(headers or {})})
+    response._content = content
+    response.url = 'https://api.test/brands'
+    response.elapsed = timedelta(seconds=elapsed)
+    return response
+
+
+class TestResponseCache:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.cache = ResponseCache(max_bytes=1024, ttl=60)
+        self.sent = []
+
+    def send(self, response):
+        def record(validators):
+            self.sent.append(validators)
+            return response
+        return record
+
+    def fetch(self, response, cache=None, query=None, headers=None, options=None):
+        return (cache or self.cache).fetch('GET', 'https://api.test/brands', query or {}, headers or {}, options or {},
+                                           self.send(response))
+
+    def test_fresh_entry_is_served_without_a_request(self):
+        self.fetch(raw_response())
+        cached = self.fetch(raw_response(b'changed'))
+
+        assert cached.content == b'{"brands": []}'
+        assert cached.headers['X-Cache'] == 'HIT'
+        assert len(self.sent) == 1
+        assert self.cache.stats()['hits'] == 1
+        assert self.cache.stats()['saved_seconds'] == 0.25
+
+    def test_key_covers_query_and_vary_headers_only(self):
+        self.fetch(raw_response(), query={'page': '1'}, headers={'Accept-Language': 'es', 'X-Trace': 'a'},
+                   options={'vary': ['Accept-Language']})
+        self.fetch(raw_response(), query={'page': '1'}, headers={'Accept-Language': 'es', 'X-Trace': 'b'},
+                   options={'vary': ['Accept-Language']})
+        self.fetch(raw_response(), query={'page': '1'}, headers={'Accept-Language': 'en'},
+                   options={'vary': ['Accept-Language']})
+        self.fetch(raw_response(), query={'page': '2'})
+
+        assert len(self.sent) == 3
+
+    def test_requests_with_different_credentials_do_not_share_an_entry(self, tmp_path):
+        cache = ResponseCache(path=str(tmp_path))
+        self.fetch(raw_response(b'{"user": "ana"}'), cache, headers={'Authorization': 'Bearer ana'})
+        other = self.fetch(raw_response(b'{"user": "bob"}'), cache, headers={'Authorization': 'Bearer bob'})
+        cookie = self.fetch(raw_response(b'{"user": "eve"}'), cache, headers={'Cookie': 'session=eve'})
+        warm = self.fetch(raw_response(b'changed'), ResponseCache(path=str(tmp_path)),
+                          headers={'authorization': 'Bearer ana'})
+
+        assert [other.content, cookie.content] == [b'{"user": "bob"}', b'{"user": "eve"}']
+        assert warm.content == b'{"user": "ana"}'
+        assert len(self.sent) == 3
+
+    def test_stale_entry_is_revalidated_with_its_validators(self):
+        self.fetch(raw_response(headers={'ETag': '"v1"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}),
+                   options={'ttl': 0})
+        revalidated = self.fetch(raw_response(b'', status_code=304), options={'ttl': 60})
+
+        assert self.sent[1] == {'If-None-Match': '"v1"', 'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'}
+        assert revalidated.status_code == 200
+        assert revalidated.content == b'{"brands": []}'
+        assert revalidated.headers['X-Cache'] == 'REVALIDATED'
+        assert self.fetch(raw_response(b'unused')).headers['X-Cache'] == 'HIT'
+
+    def test_changed_resource_replaces_the_stale_entry(self):
+        self.fetch(raw_response(headers={'ETag': '"v1"'}), options={'ttl': 0})
+        fresh = self.fetch(raw_response(b'{"brands": [1]}', headers={'ETag': '"v2"'}))
+
+        assert fresh.content == b'{"brands": [1]}'
+        assert self.fetch(raw_response(b'unused')).content == b'{"brands": [1]}'
+
+    def test_errors_and_no_store_responses_are_not_kept(self):
+        self.fetch(raw_response(status_code=500))
+        self.fetch(raw_response(headers={'Cache-Control': 'no-store'}))
+
+        assert self.cache.stats()['entries'] == 0
+
+    def test_lru_stays_under_the_byte_cap(self):
+        for page in range(5):
+            self.fetch(raw_response(b'x' * 400), query={'page': page})
+        self.fetch(raw_response(b'x' * 400), query={'page': 3})
+
+        assert self.cache.bytes <= 1024
+        assert self.cache.stats()['evictions'] == 3
+        assert self.sent[-1] == {}
+        assert len(self.sent) == 5
+
+    def test_entries_persist_to_disk(self, tmp_path):
+        self.fetch(raw_response(), cache=ResponseCache(path=str(tmp_path)))
+        warm = ResponseCache(path=str(tmp_path))
+
+        assert self.fetch(raw_response(b'unused'), cache=warm).headers['X-Cache'] == 'HIT'
+        assert len(self.sent) == 1
+
+    def test_entries_are_stored_as_json_with_a_base64_body(self, tmp_path):
+        self.fetch(raw_response(b'\x00\xffbinary', headers={'ETag': '"v1"'}), cache=ResponseCache(path=str(tmp_path)))
+        [stored] = tmp_path.glob('*.json')
+        data = json.loads(stored.read_text())
+        entry = CachedResponse.from_dict(data)
+
+        assert data['content'] == 'AP9iaW5hcnk='
+        assert entry.content == b'\x00\xffbinary'
+        assert entry.validators() == {'If-None-Match': '"v1"'}
+
+    def test_unreadable_entries_are_misses(self, tmp_path):
+        cache = ResponseCache(path=str(tmp_path))
+        (tmp_path / f"{cache.key('GET', 'https://api.test/brands', {}, {})}.json").write_text('{"status_code": 200')
+
+        assert 'X-Cache' not in self.fetch(raw_response(), cache=cache).headers
+        assert len(self.sent) == 1
+
+    def test_cached_response_expiry(self):
+        entry = CachedResponse(raw_response(), ttl=0.01)
+        time.sleep(0.02)
+
+        assert not entry.is_fresh()
@@ -0,0 +1,78 @@
+import pytest
+from src.domain.services.response_matcher import compile_matcher, matcher_for, precompile_matchers, resolve_type
+from src.domain.services import response_matcher
+from src.domain.value_objects.obj_utils import Obj
+from src.domain.value_objects.response_document import ResponseDocument
+
+
+class StubResponse:
+    def __init__(self, status_code, body='', data=None):
+        self.status_code = status_code
+        self._body = body
+        self.document = ResponseDocument(data)
+        self.body_reads = 0
+
+    @property
+    def body(self):
+        self.body_reads += 1
+        return self._body
+
+
+class TestResponseMatcher:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.response = StubResponse(200, '{"id": 7, "items": []}', {'id': 7, 'items': []})
+
+    def test_status_code_decides_without_reading_the_body(self):
+        matcher = compile_matcher(Obj({'contains': 'id', 'matches': 'i.', 'code': 404}))
+        matched = matcher.matches(self.response)
+
+        assert matched is False
+        assert self.response.body_reads == 0
+
+    def test_checks_run_cheapest_first(self):
+        matcher = compile_matcher({'has_key': 'id', 'matches': r'"id": \d+', 'length_gt': 5, 'code': 200})
+
+        assert matcher.matches(self.response)
+        assert matcher.checks[0](StubResponse(200)) is True
+        assert matcher.checks[0](StubResponse(500)) is False
+
+    def test_conditions_keep_their_semantics(self):
+        assert compile_matcher({'has_keys': ['id', 'items'], 'is_null': False, 'is_empty': False}).matches(self.response)
+        assert not compile_matcher({'has_key': 'missing'}).matches(self.response)
+        assert compile_matcher({'is_null': True}).matches(StubResponse(200, 'null'))
+        assert not compile_matcher({'unknown_condition': 1}).matches(self.response)
+
+    def test_equal_blocks_share_one_compiled_matcher(self):
+        conditions = {'code': 200, 'has_keys': ['id', 'items']}
+
+        assert compile_matcher(conditions) is compile_matcher(Obj(dict(conditions)))
+
+    def test_is_type_resolves_builtin_types_without_eval(self):
+        assert resolve_type('dict') is dict
+        assert resolve_type(['int', 'float']) == (int, float)
+        assert resolve_type('None') is type(None)
+        with pytest.raises(ValueError):
+            resolve_type("__import__('os')")
+
+    def test_is_type_matches_the_parsed_document(self):
+        assert compile_matcher({'is_type': 'dict'}).matches(self.response)
+        assert not compile_matcher({'is_type': 'list'}).matches(self.response)
+
+    def test_precompile_compiles_nested_response_blocks(self):
+        config = {'actions': {'a': {'performs': [{'responses': [
+            {'is_success': {'code': 201, 'matches': 'created-precompiled'},
+             'performs': [{'responses': [{'is_error': {'is_type': 'no_such_type'}}]}]}]}]}}}
+
+        with pytest.raises(ValueError):
+            precompile_matchers(config)
+
+    def test_precompiled_blocks_match_without_being_frozen_again(self, monkeypatch):
+        config = Obj({'actions': {'a': {'performs': [{'responses': [{'is_success': {'code': 200}}]}]}}})
+        precompile_matchers(config)
+        block = dict(iter(config.actions.a.performs[0].responses[0]))['is_success']
+        monkeypatch.setattr(response_matcher, '_freeze', lambda value: pytest.fail('matched block was frozen'))
+
+        assert matcher_for(block).matches(self.response)
+        assert config.to_dict()['actions']['a']['performs'][0]['responses'][0]['is_success'] == {'code': 200}
+        assert type(config.to_dict()['actions']['a']['performs'][0]['responses'][0]['is_success']) is dict
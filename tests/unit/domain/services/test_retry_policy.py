@@ -0,0 +1,126 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+import pytest
+import requests
+from src.domain.services.retry_policy import RetryBudget, RetryPolicy
+
+
+def response(status_code, retry_after=None):
+    return SimpleNamespace(status_code=status_code, headers={'Retry-After': retry_after} if retry_after else {},
+                           stream=None)
+
+
+class TestRetryPolicy:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.policy = RetryPolicy(attempts=4, backoff=0.01, jitter='none')
+        self.outcomes = []
+
+    def flaky(self, *outcomes):
+        self.outcomes = list(outcomes)
+
+        def call():
+            outcome = self.outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return response(outcome)
+        return call
+
+    def test_backoff_grows_and_is_capped(self):
+        policy = RetryPolicy(backoff=1, multiplier=3, max_delay=5, jitter='none')
+
+        assert [policy.delay(attempt) for attempt in range(4)] == [1, 3, 5, 5]
+
+    def test_jitter_stays_within_the_backoff(self):
+        full, equal = RetryPolicy(backoff=1, jitter='full'), RetryPolicy(backoff=1, jitter='equal')
+
+        assert all(0 <= full.delay(0) <= 1 and 0.5 <= equal.delay(0) <= 1 for _ in range(50))
+
+    def test_retry_after_wins_when_longer(self):
+        assert self.policy.delay(0, response(503, '2')) == 2
+
+    def test_retries_retryable_statuses_until_success(self):
+        result = self.policy.run(self.flaky(503, 429, 200))
+
+        assert result.status_code == 200
+        assert self.outcomes == []
+
+    def test_client_errors_are_not_retried(self):
+        assert self.policy.run(self.flaky(404, 200)).status_code == 404
+
+    def test_last_outcome_is_returned_when_attempts_run_out(self):
+        assert self.policy.run(self.flaky(503, 503, 503, 502)).status_code == 502
+
+    def test_configured_exception_classes_are_retried(self):
+        result = self.policy.run(self.flaky(requests.ConnectionError('reset'), requests.Timeout('slow'), 200))
+
+        assert result.status_code == 200
+        with pytest.raises(ValueError):
+            self.policy.run(self.flaky(ValueError('bad payload'), 200))
+
+    def test_budget_limits_retries_to_a_share_of_requests(self):
+        budget = RetryBudget(ratio=0.5, minimum=1)
+        for _ in range(4):
+            budget.deposit()
+
+        assert [budget.withdraw() for _ in range(4)] == [True, True, True, False]
+
+    def test_exhausted_budget_stops_retrying(self):
+        policy = RetryPolicy(attempts=5, backoff=0, budget=0)
+        policy.budget.minimum = 1
+
+        assert policy.run(self.flaky(503, 503, 200)).status_code == 503
+
+    def test_async_retries_do_not_block_the_loop(self):
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.005)
+
+        async def scenario():
+            self.outcomes = [503, 503, 200]
+            return await asyncio.gather(self.policy.run_async(lambda: asyncio.sleep(0, response(self.outcomes.pop(0)))),
+                                        ticker())
+
+        result, _ = asyncio.run(scenario())
+
+        assert result.status_code == 200
+        assert len(ticks) == 5
+
+    def test_submitted_retries_free_the_worker_while_waiting(self):
+        policy = RetryPolicy(attempts=2, backoff=0.2, jitter='none')
+        finished = {}
+
+        def send(name, statuses):
+            status = statuses.pop(0)
+            finished[name] = time.perf_counter()
+            return response(status)
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            started = time.perf_counter()
+            flaky = policy.submit(lambda statuses=[503, 200]: pool.submit(send, 'flaky', statuses))
+            healthy = pool.submit(send, 'healthy', [200])
+
+            assert healthy.result().status_code == 200
+            assert finished['healthy'] - started < 0.1
+            assert flaky.result().status_code == 200
+            assert finished['flaky'] - started >= 0.2
+
+    def test_delay_is_a_fixed_wait_unless_growth_or_jitter_are_given(self):
+        fixed = RetryPolicy.from_config({'trials': 3, 'delay': 10})
+        growing = RetryPolicy.from_config({'delay': 1, 'multiplier': 2, 'jitter': 'none'})
+
+        assert [fixed.delay(attempt) for attempt in range(3)] == [10, 10, 10]
+        assert [growing.delay(attempt) for attempt in range(3)] == [1, 2, 4]
+
+    def test_from_config_reads_trials_and_delay(self):
+        policy = RetryPolicy.from_config({'trials': '3', 'delay': '10', 'jitter': 'none'})
+
+        assert (policy.attempts, policy.delay(0)) == (4, 10)
+        assert RetryPolicy.from_config(5).attempts == 5
+        with pytest.raises(ValueError):
+            RetryPolicy.from_config({'on_exception': ['weather']})
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from src.domain.services.single_flight import SingleFlight, flight_key
+
+
+class TestSingleFlight:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.flight = SingleFlight()
+        self.calls = 0
+        self.release = threading.Event()
+
+    def slow_call(self):
+        self.calls += 1
+        self.release.wait(1)
+        return {'call': self.calls}
+
+    def test_concurrent_threads_share_one_call(self):
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            futures = [pool.submit(self.flight.do, 'key', self.slow_call) for _ in range(5)]
+            while self.flight.coalesced < 4:
+                threading.Event().wait(0.001)
+            self.release.set()
+            results = [future.result() for future in futures]
+
+        assert self.calls == 1
+        assert all(result is results[0] for result in results)
+        assert self.flight.stats() == {'calls': 1, 'coalesced': 4, 'in_flight': 0}
+
+    def test_completed_calls_are_not_reused(self):
+        self.release.set()
+
+        assert self.flight.do('key', self.slow_call) == {'call': 1}
+        assert self.flight.do('key', self.slow_call) == {'call': 2}
+
+    def test_waiters_receive_the_leader_exception(self):
+        def fail():
+            self.release.wait(1)
+            raise ConnectionError('upstream down')
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            futures = [pool.submit(self.flight.do, 'key', fail) for _ in range(3)]
+            while self.flight.coalesced < 2:
+                threading.Event().wait(0.001)
+            self.release.set()
+
+        assert all(isinstance(future.exception(), ConnectionError) for future in futures)
+
+    def test_no_key_means_no_coalescing(self):
+        self.release.set()
+        self.flight.do(None, self.slow_call)
+        self.flight.do(None, self.slow_call)
+
+        assert self.calls == 2
+        assert self.flight.stats()['calls'] == 0
+
+    def test_concurrent_coroutines_share_one_call(self):
+        async def fetch():
+            self.calls += 1
+            await asyncio.sleep(0.01)
+            return object()
+
+        async def burst():
+            return await asyncio.gather(*(self.flight.do_async(('GET', '/brands'), fetch) for _ in range(4)),
+                                        self.flight.do_async(('GET', '/groups'), fetch))
+
+        results = asyncio.run(burst())
+
+        assert self.calls == 2
+        assert results[0] is results[3] and results[0] is not results[4]
+
+    def test_cancelled_waiter_does_not_cancel_the_call(self):
+        async def fetch():
+            await asyncio.sleep(0.02)
+            return 'done'
+
+        async def scenario():
+            first = asyncio.ensure_future(self.flight.do_async('key', fetch))
+            second = asyncio.ensure_future(self.flight.do_async('key', fetch))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second
+
+        assert asyncio.run(scenario()) == 'done'
+
+    def test_flight_key_ignores_order_and_skips_file_bodies(self):
+        first = flight_key('get', 'https://api.test', {'b': 1, 'a': 2}, {'X': 'y'})
+        second = flight_key('GET', 'https://api.test', {'a': 2, 'b': 1}, {'X': 'y'})
+
+        assert first == second
+        with open(__file__, 'rb') as body:
+            assert flight_key('POST', 'https://api.test', body=body) is None
@@ -0,0 +1,57 @@
+import json
+import pytest
+from src.domain.services.stream_parser import iter_items, iter_json_items, iter_xml_elements
+
+DOC = {
+    'meta': {'items': [9], 'note': 'not "an" [array]'},
+    'data': {'items': [{'sku': f'sku-{i}', 'name': 'café' * i, 'stock': 1234567} for i in range(40)] + [7654321, None]},
+}
+XML = (b'<?xml version="1.0" encoding="ISO-8859-1"?><lista xmlns:c="urn:cva"><c:Producto id="1"><clave>A1</clave>'
+       b'</c:Producto><resumen total="2"/><c:Producto id="2"><clave>B\xe92</clave></c:Producto></lista>')
+
+
+def chunked(data: bytes, size: int) -> list:
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class TestStreamParser:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.raw = json.dumps(DOC, ensure_ascii=False).encode('utf-8')
+
+    @pytest.mark.parametrize('size', [1, 5, 64, 1 << 20])
+    def test_json_array_elements_survive_any_chunking(self, size):
+        assert list(iter_json_items(chunked(self.raw, size), 'json.data.items[]')) == DOC['data']['items']
+
+    @pytest.mark.parametrize('split', range(1, 24))
+    def test_json_numbers_split_between_chunks(self, split):
+        raw = b'{"data":[12.5, 3e10, -7]}'
+
+        assert list(iter_json_items([raw[:split], raw[split:]], 'data[]')) == [12.5, 3e10, -7]
+
+    def test_json_path_selects_the_array(self):
+        assert list(iter_items([self.raw], 'meta.items[]')) == [9]
+        assert list(iter_items([self.raw], 'missing[]')) == []
+        assert list(iter_items([b'[1, 22, 333]'], 'json[]')) == [1, 22, 333]
+
+    def test_json_elements_are_yielded_before_the_body_ends(self):
+        def chunks():
+            yield b'{"data": [{"id": 1}, '
+            raise RuntimeError('body still downloading')
+
+        items = iter_json_items(chunks(), 'data[]')
+
+        assert next(items) == {'id': 1}
+
+    def test_unterminated_json_array_raises(self):
+        with pytest.raises(ValueError):
+            list(iter_json_items([b'{"data": [1, 2'], 'data[]'))
+
+    @pytest.mark.parametrize('size', [3, 1 << 20])
+    def test_xml_elements_by_tag(self, size):
+        items = list(iter_xml_elements(chunked(XML, size), 'Producto'))
+
+        assert items == [{'@id': '1', 'clave': 'A1'}, {'@id': '2', 'clave': 'Bé2'}]
+
+    def test_xml_selector_prefix_is_optional(self):
+        assert [item['@id'] for item in iter_items([XML], 'xml.c:Producto')] == ['1', '2']
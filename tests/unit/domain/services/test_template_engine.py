@@ -0,0 +1,54 @@
+import re
+from pathlib import Path
+import pytest
+from src.domain.services.template_engine import CompiledTemplate, compile_template, precompile_templates
+from src.domain.value_objects.obj_utils import Obj
+
+SRC = Path(__file__).resolve().parents[4] / 'src'
+
+
+def template_strings(data):
+    if isinstance(data, str):
+        yield data
+    elif isinstance(data, dict):
+        for value in data.values():
+            yield from template_strings(value)
+    elif isinstance(data, list):
+        for value in data:
+            yield from template_strings(value)
+
+
+class TestTemplateEngine:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.lookup = lambda key: f'<{key}>'
+
+    def test_template_is_split_into_literals_and_keys(self):
+        template = CompiledTemplate('Bearer {{ token }} for {{user.id}}!')
+
+        assert template.literals == ('Bearer ', ' for ', '!')
+        assert template.keys == ('token', 'user.id')
+        assert template.render(self.lookup) == 'Bearer <token> for <user.id>!'
+
+    def test_static_template_skips_lookups(self):
+        template = CompiledTemplate('no placeholders')
+
+        assert template.render(lambda key: pytest.fail('lookup called')) == 'no placeholders'
+
+    def test_compiled_templates_are_memoised(self):
+        assert compile_template('{{a}}-{{b}}') is compile_template('{{a}}-{{b}}')
+
+    def test_precompile_warms_cache_for_config_templates(self):
+        compile_template.cache_clear()
+        precompile_templates(Obj({'actions': {'a': {'path': '{{url}}/x', 'list': ['{{y}}', 'plain']}}}))
+
+        assert compile_template.cache_info().currsize == 2
+
+    @pytest.mark.parametrize('config', ['infrastructure/specs/api_integrator/cva_ai.yaml',
+                                        'infrastructure/config/reqres_in.yml'])
+    def test_render_matches_regex_substitution(self, config):
+        strings = list(template_strings(Obj.from_yaml(SRC / config).to_dict()))
+
+        for source in strings:
+            expected = re.sub(r'\{\{(.+?)\}\}', lambda m: self.lookup(m.group(1).strip()), source)
+            assert compile_template(source).render(self.lookup) == expected
@@ -0,0 +1,151 @@
+import asyncio
+import threading
+import time
+import pytest
+import yaml
+from src.domain.services.workflow_scheduler import WorkflowScheduler
+from src.domain.value_objects.obj_utils import Obj
+
+STEP = 0.05
+
+# catalog -> (prices, stock) -> publish; images is independent
+DAG = {
+    'catalog': [],
+    'prices': ['catalog'],
+    'stock': ['catalog'],
+    'images': [],
+    'publish': ['prices', 'stock'],
+}
+
+
+class Recorder:
+    def __init__(self, failing=(), durations=None):
+        self.failing = set(failing)
+        self.durations = durations or {}
+        self.started = []
+        self.finished = []
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, name: str):
+        with self.lock:
+            self.started.append(name)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.durations.get(name, STEP))
+        with self.lock:
+            self.active -= 1
+            self.finished.append(name)
+        if name in self.failing:
+            raise RuntimeError(f'{name} failed')
+
+
+class TestWorkflowScheduler:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        self.state_path = tmp_path / 'state' / 'workflow.json'
+        self.scheduler = WorkflowScheduler(DAG, concurrency=4, state_path=str(self.state_path))
+
+    def test_nodes_start_after_their_dependencies(self):
+        recorder = Recorder()
+
+        result = self.scheduler.run(recorder)
+
+        assert result.succeeded
+        assert recorder.finished.index('catalog') < recorder.started.index('prices')
+        assert recorder.finished.index('stock') < recorder.started.index('publish')
+        assert recorder.peak == 2
+
+    def test_wall_clock_tracks_the_critical_path(self):
+        result = self.scheduler.run(Recorder())
+        seconds, path = self.scheduler.critical_path(result.durations)
+
+        assert path in (['catalog', 'prices', 'publish'], ['catalog', 'stock', 'publish'])
+        assert result.elapsed < seconds + STEP * 1.5
+        assert result.elapsed < sum(result.durations.values()) * 0.75
+
+    def test_concurrency_limit_prefers_the_longest_chain(self):
+        recorder = Recorder()
+
+        WorkflowScheduler(DAG, concurrency=1).run(recorder)
+
+        assert recorder.peak == 1
+        assert recorder.started[0] == 'catalog'
+
+    def test_failure_skips_dependents_and_keeps_independent_branches(self):
+        result = self.scheduler.run(Recorder(failing={'prices'}))
+
+        assert result.statuses == {'catalog': 'succeeded', 'prices': 'failed', 'stock': 'succeeded',
+                                   'images': 'succeeded', 'publish': 'skipped'}
+        with pytest.raises(RuntimeError, match='prices failed'):
+            result.raise_for_failures()
+
+    def test_fail_fast_cancels_nodes_not_started(self):
+        scheduler = WorkflowScheduler(DAG, concurrency=1, fail_fast=True)
+
+        result = scheduler.run(Recorder(failing={'catalog'}))
+
+        assert result.statuses['catalog'] == 'failed'
+        assert result.statuses['images'] == 'cancelled'
+        assert result.statuses['publish'] == 'skipped'
+
+    def test_resume_runs_only_what_did_not_complete(self):
+        self.scheduler.run(Recorder(failing={'publish'}))
+        assert self.state_path.exists()
+
+        recorder = Recorder()
+        result = self.scheduler.run(recorder, resume=True)
+
+        assert recorder.started == ['publish']
+        assert result.names('resumed') == ['catalog', 'prices', 'stock', 'images']
+        assert result.succeeded
+        assert not self.state_path.exists()
+
+    def test_run_async_and_cancellation(self):
+        started = []
+
+        async def run_node(name):
+            started.append(name)
+            await asyncio.sleep(STEP if name != 'images' else 10)
+
+        async def run_and_cancel():
+            task = asyncio.ensure_future(self.scheduler.run_async(run_node))
+            await asyncio.sleep(STEP * 1.5)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(run_and_cancel())
+
+        assert set(started) == {'catalog', 'images', 'prices', 'stock'}
+        assert 'publish' not in started
+
+    def test_run_async_completes_the_dag(self):
+        async def run_node(name):
+            await asyncio.sleep(STEP)
+
+        result = asyncio.run(self.scheduler.run_async(run_node))
+
+        assert result.succeeded
+        assert result.elapsed < STEP * 4
+
+    def test_invalid_graphs_are_rejected(self):
+        with pytest.raises(ValueError, match='cycle'):
+            WorkflowScheduler({'a': ['b'], 'b': ['a']})
+        with pytest.raises(ValueError, match="unknown 'missing'"):
+            WorkflowScheduler({'a': ['missing']})
+
+    def test_from_actions_follows_depends_on(self):
+        actions = Obj(yaml.safe_load('''
+            publish: {depends_on: [prices, stock], performs: []}
+            prices: {depends_on: catalog, performs: []}
+            stock: {depends_on: [catalog], performs: []}
+            catalog: {performs: []}
+            unrelated: {performs: []}
+        '''))
+
+        scheduler = WorkflowScheduler.from_actions(actions, ['publish'])
+
+        assert scheduler.dependencies == {'publish': ['prices', 'stock'], 'prices': ['catalog'],
+                                          'stock': ['catalog'], 'catalog': []}
@@ -0,0 +1,85 @@
+import xml.etree.ElementTree as ET
+from unittest.mock import patch
+import pytest
+import requests
+from src.domain.value_objects.api_response import ApiResponse
+
+XML_BODY = (b'<?xml version="1.0" encoding="ISO-8859-1"?><articulos><item id="1"><clave>A1</clave>'
+            b'<precio moneda="MXN">10.5</precio><desc>caf\xe9</desc></item><item id="2"><clave>B2</clave>'
+            b'<empty/></item></articulos>')
+
+
+class CountingResponse(requests.Response):
+    def __init__(self, content: bytes, content_type: str):
+        super().__init__()
+        self.status_code = 200
+        self.headers['Content-Type'] = content_type
+        self._content = content
+        self.text_reads = 0
+        self.json_calls = 0
+
+    @property
+    def text(self):
+        self.text_reads += 1
+        return super().text
+
+    def json(self, **kwargs):
+        self.json_calls += 1
+        return super().json(**kwargs)
+
+
+class TestApiResponseParsing:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.json_response = CountingResponse(b'{"items": [{"sku": "a"}]}', 'application/json')
+        self.xml_response = CountingResponse(XML_BODY, 'application/xml')
+
+    def test_construction_does_not_decode_or_parse(self):
+        with patch('src.domain.value_objects.api_response.ET.fromstring') as fromstring:
+            response = ApiResponse(self.xml_response)
+
+            assert response.status_code == 200
+        assert self.xml_response.text_reads == 0
+        fromstring.assert_not_called()
+
+    def test_body_and_json_are_cached(self):
+        response = ApiResponse(self.json_response)
+
+        assert response.json is response.json
+        assert response.body == response.body == '{"items": [{"sku": "a"}]}'
+        assert (self.json_response.json_calls, self.json_response.text_reads) == (1, 1)
+
+    def test_xml_is_parsed_once_for_both_views(self):
+        response = ApiResponse(self.xml_response)
+
+        with patch('src.domain.value_objects.api_response.ET.fromstring', wraps=ET.fromstring) as fromstring:
+            assert response.xml.find('item/clave').text == 'A1'
+            assert response.json['articulos']['item'][1]['clave'] == 'B2'
+            assert response.xml is response.xml
+        fromstring.assert_called_once()
+        assert self.xml_response.text_reads == 0
+
+    def test_xml_json_view_matches_xmltodict(self):
+        xmltodict = pytest.importorskip('xmltodict')
+
+        assert ApiResponse(self.xml_response).json == xmltodict.parse(XML_BODY)
+
+    def test_invalid_bodies_parse_to_none(self):
+        response = ApiResponse(CountingResponse(b'{not json', 'application/json'))
+        broken_xml = ApiResponse(CountingResponse(b'<open>', 'text/xml'))
+
+        assert response.json is None
+        assert (broken_xml.xml, broken_xml.json) == (None, None)
+
+    def test_preview_reads_only_the_head_of_the_body(self):
+        response = ApiResponse(CountingResponse(b'x' * 1000, 'text/plain'))
+
+        assert response.preview(10) == 'x' * 10
+        assert response.json is None
+        assert response.response.text_reads == 0
+
+    def test_unknown_attributes_fall_back_to_the_response(self):
+        response = ApiResponse(self.json_response)
+
+        assert response.content == self.json_response.content
+        assert response.reason is None
@@ -0,0 +1,26 @@
+from types import SimpleNamespace
+import pytest
+from src.domain.value_objects.batch_item_response import BatchItemResponse
+
+
+class TestBatchItemResponse:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.batch = SimpleNamespace(status_code=207, json=None, headers={'X-Batch': '1'})
+
+    def test_echoed_http_status_is_the_item_status(self):
+        assert BatchItemResponse(self.batch, {'sku': 'a', 'status': 422}).status_code == 422
+        assert BatchItemResponse(self.batch, {'sku': 'a', 'status_code': 201}).status_code == 201
+
+    @pytest.mark.parametrize('status', [1, 0, 99, 600, 70000, -5, True, '404', None])
+    def test_other_status_fields_fall_back_to_the_batch_status(self, status):
+        assert BatchItemResponse(self.batch, {'sku': 'a', 'status': status}).status_code == 207
+
+    def test_split_pairs_elements_with_items(self):
+        self.batch.json = {'items': [{'sku': 'a'}, {'sku': 'b', 'status': 1}]}
+
+        first, second = BatchItemResponse.split(self.batch, 2, 'items')
+
+        assert first.resolve('sku') == 'a'
+        assert second.status_code == 207
+        assert second.headers == {'X-Batch': '1'}
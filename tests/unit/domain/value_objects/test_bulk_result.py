@@ -0,0 +1,55 @@
+import math
+from datetime import timedelta
+from types import SimpleNamespace
+import pytest
+from src.domain.value_objects.bulk_result import BulkResult
+
+
+class TestBulkResult:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.result = BulkResult(id_field='sku')
+
+    def response(self, status_code, body='', seconds=0.1):
+        return SimpleNamespace(status_code=status_code, body=body, elapsed=timedelta(seconds=seconds))
+
+    def test_results_are_indexed_by_item_position(self):
+        self.result.record(2, {'sku': 'c'}, self.response(201, seconds=0.3))
+        self.result.record(0, {'sku': 'a'}, self.response(200, seconds=0.1))
+        self.result.record(1, {'sku': 'b'}, self.response(404, 'missing', seconds=0.2))
+
+        assert list(self.result.status_codes) == [200, 404, 201]
+        assert list(self.result.latencies) == [0.1, 0.2, 0.3]
+        assert self.result.ids == ['a', 'b', 'c']
+
+    def test_only_failures_keep_a_body(self):
+        self.result.record(0, {'sku': 'a'}, self.response(200, 'ok'))
+        self.result.record(1, {'sku': 'b'}, self.response(500, 'boom'))
+        self.result.record(2, {'sku': 'c'}, error=TimeoutError('slow'))
+
+        assert self.result.failures == {
+            1: {'status_code': 500, 'body': 'boom', 'id': 'b'},
+            2: {'error': 'slow', 'id': 'c'},
+        }
+        assert (self.result.total, self.result.succeeded, self.result.failed) == (3, 1, 2)
+
+    def test_errored_items_have_no_status_or_latency(self):
+        self.result.record(0, {'sku': 'a'}, error=ConnectionError('down'))
+
+        assert self.result[0]['status_code'] == 0
+        assert math.isnan(self.result[0]['latency'])
+
+    def test_lookup_by_item_id(self):
+        self.result.record(1, {'sku': 'b'}, self.response(500, 'boom'))
+        self.result.record(0, {'sku': 'a'}, self.response(200))
+
+        assert self.result.by_id('b') == {'index': 1, 'id': 'b', 'status_code': 500, 'latency': 0.1,
+                                          'failure': {'status_code': 500, 'body': 'boom', 'id': 'b'}}
+        assert self.result.by_id('z') is None
+
+    def test_ids_are_skipped_without_id_field(self):
+        result = BulkResult()
+        result.record(0, {'sku': 'a'}, self.response(500, 'boom'))
+
+        assert result.ids == []
+        assert result.failures[0] == {'status_code': 500, 'body': 'boom'}
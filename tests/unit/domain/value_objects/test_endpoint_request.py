@@ -0,0 +1,20 @@
+import pytest
+from src.domain.value_objects.endpoint_request import EndpointRequest
+
+
+class TestEndpointRequest:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.request = EndpointRequest.from_query_string(b'page=2&tag=a&tag=b&name=J%C3%BCrgen&empty=',
+                                                         b'{"sku": "A1"}', {'user_id': '7'})
+
+    def test_query_params_flatten_single_values(self):
+        assert self.request.query_params() == {'page': '2', 'tag': ['a', 'b'], 'name': 'Jürgen', 'empty': ''}
+
+    def test_json_body(self):
+        assert self.request.json() == {'sku': 'A1'}
+        assert EndpointRequest(body=b'  ').json() is None
+
+    def test_invalid_json_raises_value_error(self):
+        with pytest.raises(ValueError):
+            EndpointRequest(body=b'{nope').json()
@@ -0,0 +1,87 @@
+import pytest
+from src.domain.value_objects.obj_utils import Obj
+
+
+class TestObj:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.data = {
+            'info': {'title': 'Catalog', 'contact': {'name': 'ops'}},
+            'performs': [{'perform': {'action': 'http.get'}}, 'log.info'],
+        }
+        self.obj = Obj(self.data)
+
+    def test_child_wrappers_are_identity_stable(self):
+        assert self.obj.info is self.obj.info
+        assert self.obj.info is self.obj['info'] is self.obj.get('info')
+        assert self.obj.get('info.contact') is self.obj.info.contact
+        assert dict(self.obj.items())['info'] is self.obj.info
+
+    def test_list_attributes_reuse_wrapped_items(self):
+        performs = self.obj.performs
+
+        assert performs is self.obj.performs
+        assert performs[0].perform.action == 'http.get'
+        assert performs[1] == 'log.info'
+
+    def test_replaced_values_are_rewrapped(self):
+        info = self.obj.info
+        self.obj['info'] = {'title': 'Pricing'}
+        self.data['performs'].append({'perform': {'action': 'vars.set'}})
+
+        assert self.obj.info is not info
+        assert self.obj.info.title == 'Pricing'
+        assert self.obj.performs[2].perform.action == 'vars.set'
+
+    def test_list_items_replaced_in_place_are_rewrapped(self):
+        performs = self.obj.performs
+        self.data['performs'][0] = {'perform': {'action': 'http.post'}}
+        self.data['performs'][1] = 'log.error'
+
+        assert self.obj.performs is not performs
+        assert self.obj.performs[0].perform.action == 'http.post'
+        assert self.obj.performs[1] == 'log.error'
+
+    def test_children_see_mutations_of_the_shared_data(self):
+        self.data['info']['title'] = 'Changed'
+
+        assert self.obj.info.title == 'Changed'
+
+    def test_to_dict_returns_a_copy(self):
+        plain = self.obj.to_dict()
+        plain['info']['title'] = 'Changed'
+        plain['performs'].append('log.debug')
+
+        assert plain == {**self.data, 'info': {**self.data['info'], 'title': 'Changed'},
+                         'performs': [*self.data['performs'], 'log.debug']}
+        assert self.obj.info.title == 'Catalog'
+        assert len(self.obj.performs) == 2
+
+    def test_to_dict_unwraps_nested_obj_values(self):
+        self.obj.info['owner'] = Obj({'id': 7})
+
+        assert self.obj.to_dict()['info']['owner'] == {'id': 7}
+
+    def test_to_dict_unwraps_obj_stored_in_a_child_wrapped_earlier(self):
+        contact = self.obj.info.contact
+        self.obj.to_dict()
+        contact['team'] = Obj({'name': 'pricing'})
+
+        assert self.obj.to_dict()['info']['contact']['team'] == {'name': 'pricing'}
+
+    def test_to_dict_unwraps_obj_values_given_at_construction(self):
+        obj = Obj({'server': Obj({'url': 'https://api.test'})})
+
+        assert obj.to_dict() == {'server': {'url': 'https://api.test'}}
+
+    def test_update_invalidates_cached_children(self):
+        info = self.obj.info
+        self.obj.update({'info': {'title': 'Updated'}})
+
+        assert self.obj.info is not info
+        assert self.obj.info.title == 'Updated'
+
+    def test_slots_reject_unknown_attributes(self):
+        with pytest.raises(AttributeError):
+            self.obj.missing
+        assert not hasattr(self.obj, '__dict__')
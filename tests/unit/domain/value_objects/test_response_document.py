@@ -0,0 +1,30 @@
+import pytest
+from src.domain.value_objects.response_document import ResponseDocument
+
+
+class TestResponseDocument:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.data = {'users': [{'name': 'ana', 'tags': ['a', 'b']}], 'total': 1, 'json': 'literal'}
+        self.document = ResponseDocument(self.data)
+
+    def test_resolves_nested_paths(self):
+        assert self.document.resolve('users.0.name') == 'ana'
+        assert self.document.resolve('users[0].tags[1]') == 'b'
+        assert self.document.resolve('body.total') == 1
+
+    def test_json_and_xml_prefixes_address_the_root(self):
+        assert ResponseDocument({'id': 7}).resolve('json.id') == 7
+        assert ResponseDocument({'id': 7}).resolve('xml.id') == 7
+        assert self.document.resolve('json') == 'literal'
+
+    def test_missing_paths_resolve_to_none(self):
+        assert self.document.resolve('users.3.name') is None
+        assert self.document.resolve('total.value') is None
+        assert ResponseDocument(None).resolve('anything') is None
+
+    def test_lookups_are_memoised(self):
+        first = self.document.resolve('users.0')
+        self.data['users'][0] = {'name': 'changed'}
+
+        assert self.document.resolve('users.0') is first
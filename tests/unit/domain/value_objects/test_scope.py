@@ -0,0 +1,61 @@
+import pytest
+from src.domain.value_objects.obj_utils import Obj
+from src.domain.value_objects.scope import Scope
+
+
+class TestScope:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.constants = Obj({'api_version': 'v2', 'shared': 'constant'})
+        self.vars = Obj({'users': [{'name': 'ana'}], 'shared': 'var', 'server': {'id': 'prod'}})
+        self.params = Obj({'shared': 'param', 'server': {'url': 'https://caller.test'}, 'page': 1})
+        self.scope = Scope(self.constants, self.vars, self.params)
+
+    def test_layers_keep_merge_precedence(self):
+        assert self.scope.get('shared') == 'constant'
+        assert self.scope.get('page') == 1
+        assert self.scope.get('missing', 'default') == 'default'
+
+    def test_first_segment_picks_the_layer(self):
+        assert self.scope.get('server.id') == 'prod'
+        assert self.scope.get('server.url') is None
+        assert self.scope.get('users[0].name') == 'ana'
+
+    def test_lookups_do_not_copy_layers(self):
+        assert self.scope.get('server') is self.vars.server
+        assert self.scope['users'] is self.vars.get('users')
+
+    def test_vars_are_read_live(self):
+        self.vars['shared_later'] = 'new'
+
+        assert self.scope.get('shared_later') == 'new'
+
+    def test_assignments_stay_in_locals(self):
+        self.scope['shared'] = 'local'
+
+        assert self.scope.get('shared') == 'local'
+        assert self.vars.shared == 'var'
+        assert 'shared' in self.scope.locals
+
+    def test_nested_scope_sees_caller_locals_without_leaking_back(self):
+        self.scope['response'] = 'outer'
+        nested = Scope(self.constants, self.vars, self.scope)
+        nested['item'] = 'inner'
+
+        assert nested.get('response') == 'outer'
+        assert nested.get('shared') == 'constant'
+        assert 'item' not in self.scope
+
+    def test_to_dict_flattens_layers(self):
+        self.scope['page'] = 2
+
+        assert self.scope.to_dict() == {
+            'shared': 'constant', 'server': {'id': 'prod'}, 'page': 2,
+            'users': [{'name': 'ana'}], 'api_version': 'v2'}
+
+    def test_accepts_plain_dict_params(self):
+        scope = Scope(self.constants, self.vars, {'page': 3})
+
+        assert scope.get('page') == 3
+        with pytest.raises(KeyError):
+            scope['missing']
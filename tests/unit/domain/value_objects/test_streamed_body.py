@@ -0,0 +1,55 @@
+import io
+import pytest
+import requests
+from src.domain.value_objects.api_response import ApiResponse
+from src.domain.value_objects.streamed_body import StreamedBody
+
+
+class TestStreamedBody:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.chunks = [b'abc', b'', b'defg', b'hi']
+        self.closed = []
+        self.body = StreamedBody(iter(self.chunks), chunk_size=4, on_close=lambda: self.closed.append(True))
+
+    def test_iterates_chunks_once(self):
+        assert list(self.body) == [b'abc', b'defg', b'hi']
+        assert list(self.body) == []
+
+    def test_reads_like_a_file(self):
+        assert self.body.read(2) == b'ab'
+        assert self.body.read(4) == b'cdef'
+        assert self.body.read() == b'ghi'
+
+    def test_spool_rolls_over_to_disk_and_releases_the_connection(self):
+        self.body.spool(threshold=5)
+
+        assert self.body.spooled
+        assert self.body.file._rolled
+        assert self.closed == [True]
+        assert self.body.getvalue() == b'abcdefghi'
+        assert self.body.read(3) == b'abc'
+        self.body.rewind()
+        assert b''.join(self.body) == b'abcdefghi'
+
+    def test_live_stream_cannot_rewind(self):
+        with pytest.raises(ValueError):
+            self.body.rewind()
+
+    def test_copy_to_streams_into_a_file(self):
+        target = io.BytesIO()
+        self.body.copy_to(target)
+
+        assert target.getvalue() == b'abcdefghi'
+
+    def test_api_response_keeps_the_stream_unread_until_asked(self):
+        raw = requests.Response()
+        raw.status_code = 200
+        raw.headers['Content-Type'] = 'application/json'
+        raw._content = False
+        response = ApiResponse(raw, StreamedBody(iter([b'{"total"', b': 2}'])))
+
+        assert response.preview() == 'StreamedBody(spooled=False)'
+        assert raw._content is False
+        assert response.json == {'total': 2}
+        assert response.body == '{"total": 2}'
@@ -0,0 +1,36 @@
+import pytest
+from src.domain.value_objects.workflow_result import WorkflowResult
+
+
+class TestWorkflowResult:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.result = WorkflowResult(['catalog', 'prices', 'publish'])
+
+    def test_statuses_keep_declaration_order(self):
+        self.result.record('publish', 'skipped')
+        self.result.record('catalog', 'resumed')
+        self.result.record('prices', 'failed', 0.2, RuntimeError('prices'))
+
+        assert list(self.result.statuses) == ['catalog', 'prices', 'publish']
+        assert self.result.names('resumed') == ['catalog']
+        assert self.result.durations == {'prices': 0.2}
+        assert not self.result.succeeded
+        assert repr(self.result) == "WorkflowResult({'resumed': 1, 'failed': 1, 'skipped': 1}, elapsed=0.000s)"
+
+    def test_succeeded_once_every_node_completed(self):
+        assert not self.result.succeeded
+
+        for name in ('catalog', 'prices'):
+            self.result.record(name, 'succeeded', 0.1)
+        self.result.record('publish', 'resumed')
+
+        assert self.result.succeeded
+        self.result.raise_for_failures()
+
+    def test_raise_for_failures_raises_the_first_declared_failure(self):
+        self.result.record('publish', 'failed', error=ValueError('publish'))
+        self.result.record('prices', 'failed', error=RuntimeError('prices'))
+
+        with pytest.raises(RuntimeError, match='prices'):
+            self.result.raise_for_failures()